@@ -3,13 +3,20 @@
 """
 音声変換モジュール
 動画ファイルからMP3音声を抽出
+無音・音楽区間を除いた発話のみの音声（+ 元の時刻への対応表）を作成
 """
 
+import collections
+import itertools
 import os
 import sys
+import stat
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, List, BinaryIO, Iterable, Iterator, Tuple
+
+import numpy as np
 
 # Windows環境での文字化け対策
 if sys.platform == 'win32':
@@ -25,6 +32,297 @@ if sys.platform == 'win32':
         pass
 
 
+# 発話区間検出の解析用サンプルレート・フレームレート（10msフレーム）
+ANALYSIS_SAMPLE_RATE = 16000
+FRAME_RATE = 100
+
+# ストリーム入力（標準入力・名前付きパイプ）で直接受け取れる生PCMの形式（ffmpeg の -f の名前）
+PCM_FORMATS = {'s16le': np.int16, 'f32le': np.float32}
+STREAM_HEAD_BYTES = 64
+STREAM_READ_BYTES = 65536
+STDERR_TAIL_LINES = 20     # ffmpeg のエラー表示に残す stderr の末尾行数
+
+
+# ---------------------------------------------------------------------------
+# ストリーム入力（標準入力・名前付きパイプ）
+# ---------------------------------------------------------------------------
+def is_stream_source(path: str) -> bool:
+    """標準入力（-）または名前付きパイプか（シークできないため先頭から順に読むしかない入力）"""
+    if path == '-':
+        return True
+    if sys.platform == 'win32' and path.replace('/', '\\').lower().startswith('\\\\.\\pipe\\'):
+        return True
+    try:
+        return stat.S_ISFIFO(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def is_encoded_audio(head: bytes) -> bool:
+    """
+    先頭バイトがコンテナ・圧縮音声のものか（生PCMと区別する）
+
+    WAV / MP3 / AAC(ADTS) / Ogg / FLAC / MP4 / WebM・MKV / AIFF / CAF / AMR を判別する。
+    """
+    if head.startswith((b'RIFF', b'RF64', b'ID3', b'OggS', b'fLaC', b'\x1a\x45\xdf\xa3', b'FORM', b'caff', b'#!AMR')):
+        return True
+    if head[4:8] == b'ftyp':
+        return True
+    if len(head) >= 3 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+        if head[1] & 0x06 == 0:
+            return head[1] & 0xF6 == 0xF0          # ADTS（layer = 0）
+        # MPEGオーディオのフレームヘッダー（無効なビットレート・サンプルレートは除く。-1 が続く生PCMと区別）
+        return head[1] & 0x18 != 0x08 and head[2] & 0xF0 != 0xF0 and head[2] & 0x0C != 0x0C
+    return False
+
+
+def _iter_raw_pcm(
+    source: BinaryIO,
+    head: bytes,
+    pcm_format: str,
+    channels: int,
+    chunk_samples: int,
+) -> Iterator[np.ndarray]:
+    """生PCMのバイト列を float32 モノラルのチャンクに変換（複数チャンネルは平均してモノラルにする）"""
+    dtype = np.dtype(PCM_FORMATS[pcm_format]).newbyteorder('<')
+    frame_bytes = dtype.itemsize * channels
+    chunk_bytes = chunk_samples * frame_bytes
+    read = getattr(source, 'read1', source.read)  # 届いた分だけ読む（パイプの書き手を待ちすぎない）
+    pending = bytearray(head)
+    eof = False
+    while not eof:
+        while len(pending) < chunk_bytes:
+            data = read(STREAM_READ_BYTES)
+            if not data:
+                eof = True  # 端数のバイトは捨てる
+                break
+            pending += data
+        n = min(len(pending), chunk_bytes) // frame_bytes * frame_bytes
+        if n:
+            pcm = np.frombuffer(bytes(pending[:n]), dtype=dtype).reshape(-1, channels).mean(axis=1, dtype=np.float32)
+            del pending[:n]
+            if dtype.kind == 'i':
+                pcm /= 32768.0
+            yield pcm
+
+
+def iter_pcm_stream(
+    source: BinaryIO,
+    input_format: str = "auto",
+    source_rate: int = ANALYSIS_SAMPLE_RATE,
+    channels: int = 1,
+    sample_rate: int = ANALYSIS_SAMPLE_RATE,
+    chunk_seconds: float = 1.0,
+    converter: Optional["AudioConverter"] = None,
+) -> Iterator[np.ndarray]:
+    """
+    標準入力・名前付きパイプから音声を読みながら float32 モノラルPCMのチャンクを返す
+
+    入力を一時ファイルに保存せず、読んだ分だけを順にデコードするため、終わりのない入力
+    （ffmpeg や録音ソフトのパイプ）でもメモリ使用量は一定。
+
+    Args:
+        source: バイナリモードのファイルオブジェクト（sys.stdin.buffer など）
+        input_format: "auto"（先頭バイトで判別し、不明なら s16le）、PCM_FORMATS のキー、
+            "encoded"（WAV / MP3 などを ffmpeg でデコード）
+        source_rate: 生PCMのサンプルレート
+        channels: 生PCMのチャンネル数
+        sample_rate: 出力のサンプルレート
+        chunk_seconds: 1チャンクの長さ（秒）
+        converter: ffmpeg でデコードする場合に使う AudioConverter（Noneの場合は必要になったら作成）
+    """
+    head = source.read(STREAM_HEAD_BYTES)
+    if input_format == "auto":
+        input_format = "encoded" if is_encoded_audio(head) else "s16le"
+    if input_format != "encoded" and input_format not in PCM_FORMATS:
+        raise ValueError(f"不明な入力形式: {input_format}  (選択肢: auto, encoded, {', '.join(PCM_FORMATS)})")
+
+    chunk_samples = int(chunk_seconds * sample_rate)
+    if input_format in PCM_FORMATS and source_rate == sample_rate:
+        # そのまま使える生PCMは ffmpeg を通さない
+        yield from _iter_raw_pcm(source, head, input_format, channels, chunk_samples)
+        return
+
+    input_options = []
+    if input_format in PCM_FORMATS:
+        input_options = ["-f", input_format, "-ar", str(source_rate), "-ac", str(channels)]
+    feed = itertools.chain([head], iter(lambda: source.read(STREAM_READ_BYTES), b''))
+    converter = converter or AudioConverter()
+    yield from converter.iter_pcm("pipe:0", sample_rate, chunk_seconds, input_options, feed=feed)
+
+
+# ---------------------------------------------------------------------------
+# 発話区間検出（無音・音楽の除去）
+# ---------------------------------------------------------------------------
+def frame_energy_db(chunks: Iterable[np.ndarray], sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """PCMチャンク列から10msフレームごとのエネルギー（dBFS）を計算"""
+    frame = sample_rate // FRAME_RATE
+    leftover = np.zeros(0, dtype=np.float32)
+    energies = []
+    for chunk in chunks:
+        if leftover.size:
+            chunk = np.concatenate([leftover, chunk])
+        n = len(chunk) // frame * frame
+        frames = chunk[:n].reshape(-1, frame)
+        energies.append(10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10))
+        leftover = chunk[n:]
+    return np.concatenate(energies) if energies else np.zeros(0)
+
+
+def detect_speech_regions(
+    energy_db: np.ndarray,
+    min_gap: float = 3.0,
+    padding: float = 0.5,
+    min_speech: float = 0.3,
+    silence_db: float = -50.0,
+    min_depth_db: float = 6.0,
+    min_modulation: float = 0.25,
+    max_regions: int = 500,
+) -> List[Tuple[float, float]]:
+    """
+    フレームエネルギーから発話区間を検出
+
+    発話は音節のリズム（約4Hz）でエネルギーが大きく上下するのに対し、
+    BGM・待機画面の音楽や環境音は包絡が平坦になることを利用する。
+    2秒窓（0.5秒ステップ）ごとに包絡の変動幅と 2〜8Hz 変調成分の比率を求め、
+    無音でなく、かつ両方が閾値以上のフレームを発話とみなす。
+
+    Args:
+        energy_db: frame_energy_db() の出力（10msフレーム）
+        min_gap: これより短い非発話区間は除去せずに残す（秒）
+        padding: 発話区間の前後に残す余白（秒）
+        min_speech: これより短い発話区間はノイズとして除外（秒）
+        silence_db: 無音とみなすエネルギー（dBFS）
+        min_depth_db: 発話とみなす包絡の変動幅（dB、90/10パーセンタイル差）
+        min_modulation: 発話とみなす 2〜8Hz 変調成分の比率
+        max_regions: 区間数の上限（超える場合は短い非発話区間から順に残す）
+
+    Returns:
+        [(開始秒, 終了秒), ...]
+    """
+    n = len(energy_db)
+    if n == 0:
+        return []
+
+    floor = float(np.percentile(energy_db, 10))
+    active = energy_db > max(floor + 6.0, silence_db)
+
+    # 包絡の変調解析（2秒窓、0.5秒ステップ）
+    window = 2 * FRAME_RATE
+    step = FRAME_RATE // 2
+    envelope = np.maximum(energy_db, floor)
+    if n < window:
+        envelope = np.pad(envelope, (0, window - n), constant_values=floor)
+    windows = np.lib.stride_tricks.sliding_window_view(envelope, window)[::step]
+    depth = np.percentile(windows, 90, axis=1) - np.percentile(windows, 10, axis=1)
+    centered = windows - windows.mean(axis=1, keepdims=True)
+    spectrum = np.abs(np.fft.rfft(centered * np.hanning(window), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(window, d=1.0 / FRAME_RATE)
+    band = (freqs >= 2.0) & (freqs <= 8.0)
+    modulation = spectrum[:, band].sum(axis=1) / (spectrum[:, 1:].sum(axis=1) + 1e-10)
+    speech_window = (depth >= min_depth_db) & (modulation >= min_modulation)
+
+    # 各フレームに最も近い窓の判定を割り当て
+    nearest = np.clip(np.round((np.arange(n) - window // 2) / step).astype(int), 0, len(windows) - 1)
+    speech = active & speech_window[nearest]
+
+    edges = np.diff(np.concatenate([[0], speech.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if not len(starts):
+        return []
+
+    pad = int(padding * FRAME_RATE)
+    starts = np.maximum(0, starts - pad)
+    ends = np.minimum(n, ends + pad)
+
+    # 短い非発話区間は残す（区間数が多すぎる場合は閾値を上げる）
+    gaps = starts[1:] - ends[:-1]
+    threshold = min_gap * FRAME_RATE
+    if np.count_nonzero(gaps >= threshold) >= max_regions:
+        threshold = np.sort(gaps)[-(max_regions - 1)]
+    split = np.flatnonzero(gaps >= threshold)
+    starts = np.concatenate([starts[:1], starts[split + 1]])
+    ends = np.concatenate([ends[split], ends[-1:]])
+
+    keep = (ends - starts) >= min_speech * FRAME_RATE
+    return [(s / FRAME_RATE, e / FRAME_RATE) for s, e in zip(starts[keep].tolist(), ends[keep].tolist())]
+
+
+def subtract_regions(
+    regions: List[Tuple[float, float]],
+    exclude: Iterable[Tuple[float, float]],
+    min_length: float = 0.3,
+) -> List[Tuple[float, float]]:
+    """区間のリストから除外区間を取り除く（どちらも昇順、結果が min_length 秒未満の区間は捨てる）"""
+    result = []
+    exclude = sorted(exclude)
+    for start, end in regions:
+        for ex_start, ex_end in exclude:
+            if ex_end <= start or ex_start >= end:
+                continue
+            if ex_start - start >= min_length:
+                result.append((start, ex_start))
+            start = max(start, ex_end)
+        if end - start >= min_length:
+            result.append((start, end))
+    return result
+
+
+class SpeechTimeline:
+    """
+    発話区間だけを連結した音声の時刻 ↔ 元の音声の時刻の対応表
+
+    圧縮後の音声で得たセグメント（文字起こし・話者分離）の時刻を元の時刻に戻す。
+    """
+
+    def __init__(self, regions: List[Tuple[float, float]], original_duration: float):
+        """
+        Args:
+            regions: 元の音声での発話区間 [(開始秒, 終了秒), ...]（昇順・重複なし）
+            original_duration: 元の音声の長さ（秒）
+        """
+        self.starts = np.array([r[0] for r in regions], dtype=np.float64)
+        self.ends = np.array([r[1] for r in regions], dtype=np.float64)
+        # 各区間の圧縮後の開始時刻
+        self.offsets = np.concatenate([[0.0], np.cumsum(self.ends - self.starts)])
+        self.original_duration = original_duration
+
+    @property
+    def compact_duration(self) -> float:
+        return float(self.offsets[-1])
+
+    @property
+    def regions(self) -> List[Tuple[float, float]]:
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def to_original(self, t, is_end: bool = False):
+        """
+        圧縮後の時刻を元の時刻に変換（配列も可）
+
+        区間のつなぎ目の時刻は、開始時刻なら後の区間の先頭、
+        終了時刻（is_end=True）なら前の区間の末尾に対応させる。
+        """
+        t = np.asarray(t, dtype=np.float64)
+        idx = np.searchsorted(self.offsets, t, side='left' if is_end else 'right') - 1
+        idx = np.clip(idx, 0, len(self.starts) - 1)
+        original = np.minimum(self.starts[idx] + (t - self.offsets[idx]), self.ends[idx])
+        return float(original) if original.ndim == 0 else original
+
+    def remap_segment(self, seg: Dict) -> Dict:
+        """セグメント（単語タイムスタンプを含む）の時刻を元の時刻に変換"""
+        remapped = dict(seg, start=self.to_original(seg['start']), end=self.to_original(seg['end'], is_end=True))
+        if seg.get('words'):
+            remapped['words'] = [
+                dict(w, start=self.to_original(w['start']), end=self.to_original(w['end'], is_end=True))
+                for w in seg['words']
+            ]
+        return remapped
+
+    def remap_segments(self, segments: Iterable[Dict]) -> List[Dict]:
+        return [self.remap_segment(seg) for seg in segments]
+
+
 class AudioConverter:
     """動画から音声を抽出してMP3に変換するクラス"""
 
@@ -250,6 +548,299 @@ class AudioConverter:
             print(f"[ERROR] 予期しないエラー: {e}")
             return None
 
+    def _iter_pcm16(
+        self,
+        input_file: str,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
+        chunk_seconds: float = 30.0,
+        input_options: Optional[List[str]] = None,
+        feed: Optional[Iterable[bytes]] = None,
+        extra_output: Optional[List[str]] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        音声を16bitモノラルPCMとして少しずつデコード（全体をメモリに載せない）
+
+        input_options は -i の前に渡すffmpegのオプション（HTTPヘッダー・再接続設定など）。
+        ライブ配信のURLも渡せる（配信が終わるまでチャンクを返し続ける）。
+        feed を渡した場合は input_file に "pipe:0" を指定し、feed のバイト列をスレッドから ffmpeg の stdin に流し込む。
+        extra_output はPCMと同時に書き出す出力ファイルのオプション（出力ファイル名まで含める）。
+        stderr はスレッドで読み続けて末尾だけ残す（長時間のライブ配信でパイプが詰まって ffmpeg が止まらないように）。
+        """
+        cmd = [
+            self.ffmpeg_path,
+            *(["-nostdin"] if feed is None else []),
+            "-v", "error",
+            *(input_options or []),
+            "-i", input_file,
+            *(extra_output or []),
+            "-vn",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "-f", "s16le",
+            "pipe:1",
+        ]
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE if feed is not None else None,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        stderr_tail = collections.deque(maxlen=STDERR_TAIL_LINES)
+        stderr_reader = threading.Thread(
+            target=self._drain, args=(process.stderr, stderr_tail), name="ffmpeg-stderr", daemon=True)
+        stderr_reader.start()
+        if feed is not None:
+            threading.Thread(target=self._pump, args=(feed, process.stdin), name="ffmpeg-feed", daemon=True).start()
+        chunk_bytes = int(chunk_seconds * sample_rate) * 2
+        try:
+            while True:
+                data = process.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                yield np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16)
+            process.wait()
+            if process.returncode != 0:
+                stderr_reader.join(timeout=5)
+                error = "\n".join(stderr_tail).strip()
+                raise RuntimeError(f"ffmpegデコードエラー: {error}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            stderr_reader.join(timeout=5)
+            process.stdout.close()
+            process.stderr.close()
+
+    @staticmethod
+    def _drain(pipe, tail: "collections.deque[str]"):
+        """ffmpeg の stderr を最後まで読み、末尾の行だけ tail に残す"""
+        try:
+            for line in pipe:
+                tail.append(line.decode('utf-8', errors='replace').rstrip())
+        except (OSError, ValueError):
+            pass  # パイプが閉じられた
+
+    @staticmethod
+    def _pump(feed: Iterable[bytes], pipe):
+        """feed のバイト列を ffmpeg の stdin に書き込む（ffmpeg が終了したらやめる）"""
+        try:
+            for data in feed:
+                pipe.write(data)
+        except (OSError, ValueError):
+            pass  # ffmpeg が先に終了した
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def iter_pcm(
+        self,
+        input_file: str,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
+        chunk_seconds: float = 30.0,
+        input_options: Optional[List[str]] = None,
+        feed: Optional[Iterable[bytes]] = None,
+    ) -> Iterator[np.ndarray]:
+        """音声を -1.0〜1.0 の float32 モノラルPCMとしてチャンクごとにデコード"""
+        for chunk in self._iter_pcm16(input_file, sample_rate, chunk_seconds, input_options, feed):
+            yield chunk.astype(np.float32) / 32768.0
+
+    def iter_pcm_with_mp3(
+        self,
+        input_file: str,
+        output_file: str,
+        bitrate: str = "192k",
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
+        chunk_seconds: float = 1.0,
+        input_options: Optional[List[str]] = None,
+        feed: Optional[Iterable[bytes]] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        音声をMP3に書き出しながら、同じ入力を float32 モノラルPCMとしてチャンクごとに返す
+
+        入力（HLSのURLなど）は1つの ffmpeg で1回だけ読む。PCMは読めた分から順に返すため、
+        ダウンロードが終わる前から文字起こしを始められる（MP3は全て読み終えた時点で完成する）。
+        """
+        extra_output = ["-vn", "-acodec", "libmp3lame", "-b:a", bitrate, "-y", output_file]
+        for chunk in self._iter_pcm16(input_file, sample_rate, chunk_seconds, input_options, feed, extra_output):
+            yield chunk.astype(np.float32) / 32768.0
+
+    def decode_pcm(self, input_file: str, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+        """音声全体を float32 モノラルPCMとしてデコード"""
+        chunks = list(self.iter_pcm(input_file, sample_rate))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    def trim_to_speech(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        min_gap: float = 3.0,
+        padding: float = 0.5,
+        min_saving: float = 0.05,
+        exclude: Optional[List[Tuple[float, float]]] = None,
+        detect_silence: bool = True,
+    ) -> Optional[Tuple[str, SpeechTimeline]]:
+        """
+        無音・音楽区間を除いた発話のみの音声を作成
+
+        解析と書き出しはどちらもPCMをチャンクごとに処理するため、長時間の音声でも
+        メモリ使用量は一定。書き出しはサンプル単位で切り出すので、対応表の時刻はずれない。
+
+        Args:
+            input_file: 入力音声ファイル
+            output_file: 出力ファイル（Noneの場合は <stem>_speech.mp3）
+            min_gap: これより短い非発話区間は残す（秒）
+            padding: 発話区間の前後に残す余白（秒）
+            min_saving: 除去できる割合がこれ未満ならトリミングしない
+            exclude: 追加で取り除く区間 [(開始秒, 終了秒), ...]（番組の定番イントロ等）
+            detect_silence: False の場合は無音・音楽区間を検出せず、exclude だけを取り除く
+
+        Returns:
+            (発話のみの音声ファイル, 時刻の対応表)、トリミング不要・失敗時はNone
+        """
+        try:
+            if detect_silence:
+                print("[INFO] 無音・音楽区間を検出中...", flush=True)
+                energy = frame_energy_db(self.iter_pcm(input_file), ANALYSIS_SAMPLE_RATE)
+                duration = len(energy) / FRAME_RATE
+                regions = detect_speech_regions(energy, min_gap=min_gap, padding=padding)
+            else:
+                duration = self._get_duration(input_file) or 0.0
+                regions = [(0.0, duration)] if duration else []
+            if exclude:
+                regions = subtract_regions(regions, exclude)
+            if not regions:
+                print("[WARNING] 発話区間が見つかりません。トリミングせずに処理します", flush=True)
+                return None
+
+            # サンプル単位に丸めた区間で対応表を作る
+            bounds = [
+                (int(round(s * ANALYSIS_SAMPLE_RATE)), int(round(e * ANALYSIS_SAMPLE_RATE)))
+                for s, e in regions
+            ]
+            timeline = SpeechTimeline(
+                [(s / ANALYSIS_SAMPLE_RATE, e / ANALYSIS_SAMPLE_RATE) for s, e in bounds],
+                duration,
+            )
+            saving = 1.0 - timeline.compact_duration / duration if duration else 0.0
+            if saving < min_saving:
+                print(f"[INFO] 除去できる区間が少ないためトリミングしません ({saving * 100:.1f}%)", flush=True)
+                return None
+
+            if output_file is None:
+                input_path = Path(input_file)
+                output_file = str(input_path.with_name(f"{input_path.stem}_speech.mp3"))
+
+            self._write_pcm_regions(input_file, bounds, output_file)
+            label = "無音・音楽区間" if detect_silence else "繰り返し区間"
+            print(f"[OK] {label}を除去: {duration:.0f}秒 → {timeline.compact_duration:.0f}秒 "
+                  f"({saving * 100:.0f}%削減, {len(bounds)}区間)", flush=True)
+            return output_file, timeline
+
+        except Exception as e:
+            print(f"[WARNING] 無音・音楽区間の除去に失敗（元の音声で処理を続行）: {e}", flush=True)
+            return None
+
+    def _write_pcm_regions(self, input_file: str, bounds: List[Tuple[int, int]], output_file: str):
+        """元の音声から指定サンプル区間だけを連結してエンコード"""
+        cmd = [
+            self.ffmpeg_path,
+            "-v", "error",
+            "-f", "s16le",
+            "-ar", str(ANALYSIS_SAMPLE_RATE),
+            "-ac", "1",
+            "-i", "pipe:0",
+            "-c:a", "libmp3lame",
+            "-b:a", "64k",
+            "-y",
+            output_file,
+        ]
+        encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            position = 0
+            region = 0
+            for chunk in self._iter_pcm16(input_file):
+                chunk_end = position + len(chunk)
+                while region < len(bounds) and bounds[region][0] < chunk_end:
+                    start, end = bounds[region]
+                    encoder.stdin.write(chunk[max(start, position) - position:min(end, chunk_end) - position].tobytes())
+                    if end > chunk_end:
+                        break  # 区間の続きは次のチャンク
+                    region += 1
+                position = chunk_end
+            encoder.stdin.close()
+            encoder.wait()
+            if encoder.returncode != 0:
+                error = encoder.stderr.read().decode('utf-8', errors='replace').strip()
+                raise RuntimeError(f"ffmpegエンコードエラー: {error}")
+        finally:
+            if encoder.poll() is None:
+                encoder.kill()
+                encoder.wait()
+            encoder.stderr.close()
+
+    def open_pcm_encoder(
+        self,
+        output_file: str,
+        sample_rate: int = ANALYSIS_SAMPLE_RATE,
+        codec: str = "libopus",
+        bitrate: str = "32k",
+    ) -> subprocess.Popen:
+        """
+        16bitモノラルPCMを stdin から受け取ってエンコードする ffmpeg を起動
+
+        呼び出し側が stdin に書き込み、閉じてから wait() する。
+        """
+        cmd = [
+            self.ffmpeg_path,
+            "-v", "error",
+            "-f", "s16le",
+            "-ar", str(sample_rate),
+            "-ac", "1",
+            "-i", "pipe:0",
+            "-c:a", codec,
+            "-b:a", bitrate,
+            *(["-application", "voip"] if codec == "libopus" else []),
+            "-y",
+            output_file,
+        ]
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def concat_audio(self, input_files: List[str], output_file: str, bitrate: str = "64k") -> Optional[str]:
+        """
+        複数の音声ファイルを順に連結して1つのMP3にする
+
+        Returns:
+            出力ファイルのパス、失敗時はNone
+        """
+        import tempfile
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            for input_file in input_files:
+                escaped = str(Path(input_file).resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+            list_file = f.name
+        try:
+            cmd = [
+                self.ffmpeg_path,
+                "-v", "error",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", list_file,
+                "-vn",
+                "-c:a", "libmp3lame",
+                "-b:a", bitrate,
+                "-y",
+                output_file,
+            ]
+            result = subprocess.run(cmd, capture_output=True, encoding='utf-8', errors='replace')
+            if result.returncode != 0:
+                print(f"[ERROR] 音声の連結に失敗: {result.stderr.strip()}", flush=True)
+                return None
+            print(f"[OK] 音声を連結: {output_file} ({len(input_files)}ファイル)", flush=True)
+            return output_file
+        finally:
+            os.unlink(list_file)
+
     def get_audio_info(self, audio_file: str) -> Optional[dict]:
         """
         音声ファイルの情報を取得
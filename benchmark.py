@@ -0,0 +1,696 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こし性能ベンチマーク
+エンジン設定ごとの実時間係数（RTF = 処理時間 / 音声長）と誤り率を計測し、
+誤り率の許容範囲内で最速の設定を選択する
+ライブ文字起こしは確定までの遅延（パーセンタイル）とオフラインに対する計算量を計測する
+"""
+
+import os
+import sys
+import re
+import time
+import functools
+import itertools
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Any, Tuple
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    try:
+        if hasattr(sys.stdout, 'buffer') and sys.stdout.encoding.lower() != 'utf-8':
+            import io
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+        if hasattr(sys.stderr, 'buffer') and sys.stderr.encoding.lower() != 'utf-8':
+            import io
+            sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+    except (AttributeError, OSError):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# 評価指標
+# ---------------------------------------------------------------------------
+def normalize_text(text: str) -> str:
+    """比較用にテキストを正規化（NFKC、空白・句読点・記号を除去）"""
+    text = unicodedata.normalize('NFKC', text or '')
+    return ''.join(
+        ch for ch in text
+        if not ch.isspace() and not unicodedata.category(ch).startswith(('P', 'S'))
+    )
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    文字誤り率（CER）を計算
+
+    日本語は単語区切りがないため、WERの代わりに正規化後の文字単位の
+    編集距離を参照テキスト長で割った値を使用する。
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (r != h),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def get_audio_duration(audio_path: str) -> Optional[float]:
+    """音声ファイルの長さ（秒）を取得"""
+    from audio_converter import AudioConverter
+
+    info = AudioConverter().get_audio_info(audio_path)
+    if info and info.get('duration'):
+        return float(info['duration'])
+    return None
+
+
+def measure(run: Callable[[], Any], duration: float):
+    """
+    処理を実行して経過時間とRTFを計測
+
+    Returns:
+        (戻り値, 経過秒数, RTF)
+    """
+    started = time.perf_counter()
+    value = run()
+    elapsed = time.perf_counter() - started
+    rtf = elapsed / duration if duration else float('inf')
+    return value, elapsed, rtf
+
+
+def select_fastest(results: List[Dict], tolerance: float, baseline_error: float) -> Optional[Dict]:
+    """誤り率が baseline_error + tolerance 以内の設定のうち、RTFが最小のものを返す"""
+    candidates = [
+        r for r in results
+        if r.get('error_rate') is not None and r['error_rate'] <= baseline_error + tolerance
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda r: r['rtf'])
+
+
+def print_results(results: List[Dict], keys: List[str]):
+    """計測結果を表形式で表示"""
+    header = " | ".join(f"{k:>12}" for k in keys) + " | " + f"{'RTF':>8} | {'CER':>8}"
+    print(header, flush=True)
+    print("-" * len(header), flush=True)
+    for r in results:
+        cer = f"{r['error_rate']:.4f}" if r.get('error_rate') is not None else "-"
+        row = " | ".join(f"{str(r['config'].get(k)):>12}" for k in keys)
+        print(f"{row} | {r['rtf']:>8.3f} | {cer:>8}", flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Kotoba-Whisper (transformers pipeline)
+# ---------------------------------------------------------------------------
+def benchmark_kotoba(
+    audio_path: str,
+    reference_text: Optional[str] = None,
+    batch_sizes: List[int] = (1, 4, 8),
+    attn_implementations: List[str] = ("eager", "sdpa"),
+    quantize_options: List[bool] = (False, True),
+    tolerance: float = 0.01,
+    save: bool = True,
+) -> Optional[Dict]:
+    """
+    KotobaWhisperTranscriber の設定（batch_size / attention / int8量子化）を総当たりで計測
+
+    参照テキストがない場合は最も保守的な設定（先頭の組み合わせ）の出力を参照とする。
+    誤り率が許容範囲内で最速の設定を ~/.cache/transcription-tool/kotoba_profile.json に保存し、
+    以降の KotobaWhisperTranscriber が自動的に使用する。
+
+    Returns:
+        選択された設定の計測結果、該当なしの場合はNone
+    """
+    from transcriber import KotobaWhisperTranscriber, _load_json_cache, _save_json_cache
+    from model_pool import get_model_pool
+
+    duration = get_audio_duration(audio_path)
+    if not duration:
+        print(f"[ERROR] 音声の長さを取得できません: {audio_path}", flush=True)
+        return None
+
+    results: List[Dict] = []
+    device = None
+    for batch_size, attn, quantize in itertools.product(batch_sizes, attn_implementations, quantize_options):
+        config = {'batch_size': batch_size, 'attn_implementation': attn, 'quantize': quantize}
+        if quantize and device not in (None, "cpu"):
+            continue
+        print(f"\n[INFO] 計測中: {config}", flush=True)
+        try:
+            transcriber = KotobaWhisperTranscriber(
+                batch_size=batch_size,
+                attn_implementation=attn,
+                quantize=quantize,
+            )
+        except Exception as e:
+            print(f"[WARNING] 設定をスキップ: {e}", flush=True)
+            continue
+        device = transcriber.device
+        pool_key = transcriber._pool_key
+        if quantize and not transcriber.quantize:
+            # GPU/MPS または量子化失敗
+            transcriber.close()
+            continue
+        # 実際に使われたattention実装を記録（フォールバック時）
+        config['attn_implementation'] = transcriber.attn_implementation
+
+        result, elapsed, rtf = measure(lambda: transcriber._run_transcription(audio_path), duration)
+        transcriber.close()
+        # 次の設定の計測前にメモリを空ける（同じキーの後続設定があれば再読み込みされる）
+        get_model_pool().evict(pool_key)
+        if result is None:
+            print("[WARNING] 文字起こしに失敗したため除外します", flush=True)
+            continue
+
+        results.append({'config': config, 'rtf': rtf, 'elapsed': elapsed, 'text': result['text']})
+        print(f"[OK] RTF={rtf:.3f} ({elapsed:.1f}秒 / 音声{duration:.1f}秒)", flush=True)
+
+    if not results:
+        print("[ERROR] 計測できた設定がありません", flush=True)
+        return None
+
+    reference = reference_text if reference_text is not None else results[0]['text']
+    for r in results:
+        r['error_rate'] = character_error_rate(reference, r['text'])
+    baseline_error = results[0]['error_rate']
+
+    print("\n=== Kotoba-Whisper ベンチマーク結果 ===", flush=True)
+    print(f"デバイス: {device} / 音声長: {duration:.1f}秒", flush=True)
+    print_results(results, ['batch_size', 'attn_implementation', 'quantize'])
+
+    best = select_fastest(results, tolerance, baseline_error)
+    if not best:
+        print("[WARNING] 許容範囲内の設定がありません", flush=True)
+        return None
+
+    print(f"\n[OK] 最速設定: {best['config']} (RTF={best['rtf']:.3f}, CER={best['error_rate']:.4f})", flush=True)
+
+    if save:
+        profile = _load_json_cache(KotobaWhisperTranscriber.PROFILE_CACHE_FILE)
+        profile[device] = dict(best['config'], rtf=round(best['rtf'], 4), error_rate=round(best['error_rate'], 4))
+        _save_json_cache(KotobaWhisperTranscriber.PROFILE_CACHE_FILE, profile)
+        print(f"[OK] 設定を保存しました: {KotobaWhisperTranscriber.PROFILE_CACHE_FILE} ({device})", flush=True)
+
+    return best
+
+
+# ---------------------------------------------------------------------------
+# faster-whisper (CTranslate2) のスレッド数・計算精度チューニング
+# ---------------------------------------------------------------------------
+SAMPLE_RATE = 16000
+
+
+# 精度の参照にする計算精度（そのデバイスで最も正確なもの）
+REFERENCE_COMPUTE_TYPES = {"cpu": "float32", "cuda": "float16"}
+
+
+def _default_thread_counts() -> List[int]:
+    cpus = os.cpu_count() or 4
+    return sorted({max(1, cpus // 4), max(1, cpus // 2), cpus})
+
+
+def _supported_compute_types(device: str) -> List[str]:
+    """このデバイスで使える計算精度（速度に効くものだけ）"""
+    preferred = {
+        "cpu": ["int8", "int8_float32", "float32"],
+        "cuda": ["float16", "int8_float16", "int8"],
+    }[device]
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types(device)
+        return [c for c in preferred if c in supported]
+    except Exception:
+        return preferred[:1]
+
+
+def _decode_text(model, audio) -> str:
+    segments, _ = model.transcribe(audio, language="ja", beam_size=5, vad_filter=True)
+    return "".join(seg.text for seg in segments)
+
+
+def _decode_parallel(model, audio, num_workers: int) -> str:
+    """同じ音声を num_workers 本並列に文字起こしし、最初の結果を返す"""
+    texts = [None] * num_workers
+    threads = [
+        threading.Thread(target=lambda i=i: texts.__setitem__(i, _decode_text(model, audio)))
+        for i in range(num_workers)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return texts[0]
+
+
+def tune_faster_whisper(
+    audio_path: str,
+    model_name: Optional[str] = None,
+    clip_seconds: float = 60.0,
+    compute_types: Optional[List[str]] = None,
+    thread_counts: Optional[List[int]] = None,
+    worker_counts: List[int] = (1, 2),
+    tolerance: float = 0.01,
+    reference_text: Optional[str] = None,
+    save: bool = True,
+) -> Optional[Dict]:
+    """
+    キャリブレーション音声で compute_type × cpu_threads × num_workers を総当たりし、
+    最速の組み合わせをホスト・モデルごとに保存する
+
+    最も正確な計算精度（REFERENCE_COMPUTE_TYPES: CPU は float32、CUDA は float16）の出力と比べて
+    CERの増加が tolerance 以内の設定だけを選ぶ（int8 などで精度が落ちる設定を既定にしないため）。
+    参照の計算精度が比較対象に含まれていなくても計測する。reference_text を指定した場合は
+    それに対するCERで比べる。
+
+    num_workers > 1 の場合は同数の文字起こしを並列に実行し、スループット換算のRTFで比較する。
+    保存した設定は FasterWhisperTranscriber._load_model が自動的に使用する。
+
+    Returns:
+        選択された設定の計測結果、失敗時はNone
+    """
+    from faster_whisper import WhisperModel, decode_audio
+    from transcriber import FasterWhisperTranscriber
+
+    model_name = model_name or FasterWhisperTranscriber.DEFAULT_MODEL
+    device, _ = FasterWhisperTranscriber.detect_device()
+
+    # モデルのパス解決（Kotoba系はCTranslate2版をダウンロード）にだけインスタンスを使う
+    resolver = FasterWhisperTranscriber.__new__(FasterWhisperTranscriber)
+    resolver.model_name = model_name
+    model_cache_dir = resolver.model_cache_dir()
+    model_path = resolver._resolve_model_path(model_cache_dir)
+
+    audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)[:int(clip_seconds * SAMPLE_RATE)]
+    duration = len(audio) / SAMPLE_RATE
+    if duration <= 0:
+        print(f"[ERROR] キャリブレーション音声が空です: {audio_path}", flush=True)
+        return None
+
+    compute_types = compute_types or _supported_compute_types(device)
+    thread_counts = thread_counts or (_default_thread_counts() if device == "cpu" else [0])
+    print(f"[INFO] チューニング開始: {model_name} (device={device}, 音声{duration:.1f}秒)", flush=True)
+    print(f"[INFO] compute_type={compute_types}, cpu_threads={thread_counts}, num_workers={list(worker_counts)}", flush=True)
+
+    def load(compute_type: str, cpu_threads: int, num_workers: int):
+        return WhisperModel(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            download_root=str(model_cache_dir),
+        )
+
+    results: List[Dict] = []
+    for compute_type, cpu_threads, num_workers in itertools.product(compute_types, thread_counts, worker_counts):
+        config = {'compute_type': compute_type, 'cpu_threads': cpu_threads, 'num_workers': num_workers}
+        print(f"\n[INFO] 計測中: {config}", flush=True)
+        try:
+            model = load(compute_type, cpu_threads, num_workers)
+        except Exception as e:
+            print(f"[WARNING] 設定をスキップ: {e}", flush=True)
+            continue
+
+        # 初回のみ発生する初期化コストを除外するためのウォームアップ
+        list(model.transcribe(audio[:5 * SAMPLE_RATE], language="ja")[0])
+
+        text, elapsed, _ = measure(functools.partial(_decode_parallel, model, audio, num_workers), duration)
+        rtf = elapsed / (duration * num_workers)
+        del model
+        results.append({'config': config, 'rtf': rtf, 'elapsed': elapsed, 'text': text or ''})
+        print(f"[OK] RTF={rtf:.3f} ({elapsed:.1f}秒 / 音声{duration:.1f}秒 x {num_workers})", flush=True)
+
+    if not results:
+        print("[ERROR] 計測できた設定がありません", flush=True)
+        return None
+
+    # 最も正確な計算精度の出力（比較対象にない場合は別に計測）
+    reference_compute_type = REFERENCE_COMPUTE_TYPES[device]
+    reference_output = next(
+        (r['text'] for r in results if r['config']['compute_type'] == reference_compute_type), None)
+    if reference_output is None:
+        print(f"\n[INFO] 参照の出力を計測中: compute_type={reference_compute_type}", flush=True)
+        try:
+            model = load(reference_compute_type, 0, 1)
+            reference_output = _decode_text(model, audio)
+            del model
+        except Exception as e:
+            print(f"[WARNING] 参照の計算精度で文字起こしできません: {e}", flush=True)
+
+    if reference_text is not None:
+        reference = reference_text
+        if reference_output is not None:
+            baseline_error = character_error_rate(reference, reference_output)
+        else:
+            baseline_error = min(character_error_rate(reference, r['text']) for r in results)
+    elif reference_output is not None:
+        reference, baseline_error = reference_output, 0.0
+    else:
+        print("[ERROR] 精度の参照がありません（--reference で参照テキストを指定してください）", flush=True)
+        return None
+
+    for r in results:
+        r['error_rate'] = character_error_rate(reference, r['text'])
+
+    print(f"\n=== faster-whisper チューニング結果 ({FasterWhisperTranscriber.host_key()}) ===", flush=True)
+    print(f"精度の参照: {'参照テキスト' if reference_text is not None else reference_compute_type}"
+          f"（参照の計算精度のCER {baseline_error:.4f}）", flush=True)
+    print_results(results, ['compute_type', 'cpu_threads', 'num_workers'])
+
+    best = select_fastest(results, tolerance, baseline_error)
+    if not best:
+        print("[WARNING] 許容範囲内の設定がありません", flush=True)
+        return None
+    print(f"\n[OK] 最速設定: {best['config']} (RTF={best['rtf']:.3f}, CER={best['error_rate']:.4f})", flush=True)
+
+    if save:
+        settings = dict(
+            best['config'],
+            rtf=round(best['rtf'], 4),
+            error_rate=round(best['error_rate'], 4),
+            tuned_at=datetime.now().isoformat(timespec='seconds'),
+        )
+        FasterWhisperTranscriber.save_profile(model_name, device, settings)
+        print(f"[OK] 設定を保存しました: {FasterWhisperTranscriber.PROFILE_CACHE_FILE}", flush=True)
+
+    return best
+
+
+# ---------------------------------------------------------------------------
+# faster-whisper のデコード速度プリセット比較
+# ---------------------------------------------------------------------------
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.opus', '.mp4', '.webm'}
+
+
+def find_reference_clips(paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    音声ファイル/ディレクトリから (音声, 参照テキスト) の組を集める
+
+    参照テキストは音声と同じ名前の .txt ファイル（例: clip01.mp3 → clip01.txt）。
+    参照テキストのない音声は除外する。
+    """
+    audio_files: List[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            audio_files.extend(sorted(f for f in p.iterdir() if f.suffix.lower() in AUDIO_EXTENSIONS))
+        else:
+            audio_files.append(p)
+
+    clips = []
+    for audio in audio_files:
+        reference = audio.with_suffix('.txt')
+        if reference.is_file():
+            clips.append((str(audio), reference.read_text(encoding='utf-8')))
+        else:
+            print(f"[WARNING] 参照テキストがないため除外します: {audio}", flush=True)
+    return clips
+
+
+def benchmark_speed_profiles(
+    clips: List[Tuple[str, str]],
+    model_name: Optional[str] = None,
+    profiles: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    速度プリセット（fast / balanced / accurate）ごとに参照クリップ全体のRTFとCERを計測
+
+    RTFは全クリップの合計処理時間 / 合計音声長、CERは参照テキストの文字数で重み付けした値。
+    モデルはプリセット間で共有される（モデルプール）ため、読み込み時間は計測に含まれない。
+
+    Returns:
+        プリセットごとの計測結果
+    """
+    import numpy as np
+    from transcriber import FasterWhisperTranscriber
+
+    profiles = profiles or list(FasterWhisperTranscriber.SPEED_PROFILES)
+    durations = {audio: get_audio_duration(audio) for audio, _ in clips}
+    clips = [(audio, ref) for audio, ref in clips if durations[audio]]
+    if not clips:
+        print("[ERROR] 計測できるクリップがありません", flush=True)
+        return []
+
+    results: List[Dict] = []
+    warmed_up = False
+    for profile in profiles:
+        print(f"\n[INFO] 計測中: {profile}", flush=True)
+        transcriber = FasterWhisperTranscriber(model_name, speed_profile=profile)
+        if not warmed_up:
+            # 初回のみ発生する初期化コストを除外するためのウォームアップ
+            list(transcriber.model.transcribe(np.zeros(5 * SAMPLE_RATE, dtype=np.float32), language="ja")[0])
+            warmed_up = True
+
+        total_elapsed = total_duration = errors = 0.0
+        reference_chars = 0
+        for audio, reference in clips:
+            result, elapsed, rtf = measure(lambda: transcriber._run_transcription(audio), durations[audio])
+            if result is None:
+                print(f"[WARNING] 文字起こしに失敗: {audio}", flush=True)
+                continue
+            cer = character_error_rate(reference, result['text'])
+            chars = len(normalize_text(reference))
+            total_elapsed += elapsed
+            total_duration += durations[audio]
+            errors += cer * chars
+            reference_chars += chars
+            print(f"  {Path(audio).name}: RTF={rtf:.3f}, CER={cer:.4f}", flush=True)
+        transcriber.close()
+
+        if not total_duration:
+            continue
+        results.append({
+            'config': {'profile': profile},
+            'rtf': total_elapsed / total_duration,
+            'elapsed': total_elapsed,
+            'error_rate': errors / reference_chars if reference_chars else None,
+        })
+
+    print(f"\n=== 速度プリセット比較 ({len(clips)}クリップ) ===", flush=True)
+    print_results(results, ['profile'])
+    return results
+
+
+# ---------------------------------------------------------------------------
+# ライブ文字起こし（確定までの遅延と計算量）
+# ---------------------------------------------------------------------------
+def _percentile(values: List[float], q: float) -> float:
+    import numpy as np
+    return float(np.percentile(values, q)) if values else float('nan')
+
+
+def benchmark_live(
+    audio_path: str,
+    model_name: Optional[str] = None,
+    policies: Optional[List[str]] = None,
+    speed_profile: str = "fast",
+    reference_text: Optional[str] = None,
+) -> List[Dict]:
+    """
+    ライブ文字起こしの確定方式ごとに、確定までの遅延と計算量をオフライン文字起こしと比較
+
+    音声を実時間で受信したものとしてチャンクごとに渡し、デコードが追いつかない場合は遅れが蓄積する。
+    遅延は「単語（単語タイムスタンプがなければセグメント）の発話終了から確定して出力されるまで」の秒数。
+    計算量はストリーミング中のデコード時間の合計 / 同じ音声のオフライン文字起こしの時間。
+    CERは参照テキスト（省略時はオフライン文字起こしの結果）に対する値。
+
+    Returns:
+        確定方式ごとの計測結果
+    """
+    from faster_whisper import decode_audio
+    from transcriber import FasterWhisperTranscriber
+    import live_transcriber
+
+    policies = policies or list(live_transcriber.POLICIES)
+    audio = decode_audio(audio_path, sampling_rate=live_transcriber.SAMPLE_RATE)
+    duration = len(audio) / live_transcriber.SAMPLE_RATE
+    if duration <= 0:
+        print(f"[ERROR] 音声が空です: {audio_path}", flush=True)
+        return []
+
+    transcriber = FasterWhisperTranscriber(model_name, speed_profile=speed_profile)
+    try:
+        # 初回のみ発生する初期化コストを除外するためのウォームアップ
+        list(transcriber.model.transcribe(audio[:5 * live_transcriber.SAMPLE_RATE], language="ja")[0])
+
+        print("\n[INFO] 計測中: offline", flush=True)
+        offline_text, offline_elapsed, offline_rtf = measure(
+            lambda: "".join(
+                seg.text for seg in transcriber.model.transcribe(
+                    audio, language=transcriber.language, **transcriber._decode_options(),
+                )[0]
+            ),
+            duration,
+        )
+        reference = reference_text or offline_text
+        print(f"  RTF={offline_rtf:.3f}", flush=True)
+
+        chunk = int(live_transcriber.CHUNK_SECONDS * live_transcriber.SAMPLE_RATE)
+        results: List[Dict] = []
+        for policy in policies:
+            print(f"\n[INFO] 計測中: {policy}", flush=True)
+            live = live_transcriber.POLICIES[policy](transcriber)
+            latencies: List[float] = []
+            texts: List[str] = []
+            clock = 0.0  # 実時間で受信した場合の現在時刻（配信開始からの秒数）
+
+            def record(segments: List[Dict], emitted_at: float):
+                for seg in segments:
+                    texts.append(seg['text'])
+                    for word in seg.get('words') or [seg]:
+                        latencies.append(max(0.0, emitted_at - word['end']))
+
+            for i in range(0, len(audio), chunk):
+                started = time.perf_counter()
+                segments = live.feed(audio[i:i + chunk])
+                clock = max(clock, live.received_seconds) + time.perf_counter() - started
+                record(segments, clock)
+            started = time.perf_counter()
+            segments = live.finish()
+            record(segments, max(clock, live.received_seconds) + time.perf_counter() - started)
+
+            result = {
+                'config': {'policy': policy},
+                'rtf': live.decode_seconds / duration,
+                'elapsed': live.decode_seconds,
+                'error_rate': character_error_rate(reference, "".join(texts)),
+                'latency': {q: _percentile(latencies, q) for q in (50, 90, 99)},
+                'overhead': live.decode_seconds / offline_elapsed if offline_elapsed else float('inf'),
+                'decodes': live.decode_count,
+            }
+            results.append(result)
+            print(f"  RTF={result['rtf']:.3f}, デコード回数={live.decode_count}, "
+                  f"遅延 p50={result['latency'][50]:.2f}s p90={result['latency'][90]:.2f}s "
+                  f"p99={result['latency'][99]:.2f}s", flush=True)
+    finally:
+        transcriber.close()
+
+    print(f"\n=== ライブ文字起こし比較 ({duration:.0f}秒, オフライン RTF={offline_rtf:.3f}) ===", flush=True)
+    header = f"{'policy':>12} | {'RTF':>8} | {'overhead':>8} | {'p50':>6} | {'p90':>6} | {'p99':>6} | {'CER':>8}"
+    print(header, flush=True)
+    print("-" * len(header), flush=True)
+    for r in results:
+        latency = r['latency']
+        print(f"{r['config']['policy']:>12} | {r['rtf']:>8.3f} | {r['overhead']:>7.2f}x | "
+              f"{latency[50]:>6.2f} | {latency[90]:>6.2f} | {latency[99]:>6.2f} | {r['error_rate']:>8.4f}", flush=True)
+    if reference_text is None:
+        print("※ CERはオフライン文字起こしの結果に対する値", flush=True)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def _parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in re.split(r'[,\s]+', value.strip()) if v]
+
+
+def _read_reference(path: Optional[str]) -> Optional[str]:
+    if not path:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def main():
+    """ベンチマークCLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文字起こし性能ベンチマーク")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    kotoba = subparsers.add_parser("kotoba", help="Kotoba-Whisper の batch_size / attention / int8量子化 を比較")
+    kotoba.add_argument("audio", help="計測用の音声ファイル")
+    kotoba.add_argument("-r", "--reference", help="参照テキストファイル（省略時は最も保守的な設定の出力）", default=None)
+    kotoba.add_argument("--batch-sizes", type=_parse_int_list, default=[1, 4, 8], help="比較するbatch_size（例: 1,4,8）")
+    kotoba.add_argument("--tolerance", type=float, default=0.01, help="許容するCERの増加量（デフォルト: 0.01）")
+    kotoba.add_argument("--no-save", action="store_true", help="選択した設定を保存しない")
+
+    tune = subparsers.add_parser("tune", help="faster-whisper の compute_type / cpu_threads / num_workers をチューニング")
+    tune.add_argument("audio", help="キャリブレーション用の音声ファイル")
+    tune.add_argument("-m", "--model", help="モデル名（デフォルト: large-v3-turbo）", default=None)
+    tune.add_argument("--clip-seconds", type=float, default=60.0, help="計測に使う先頭の秒数（デフォルト: 60）")
+    tune.add_argument("--compute-types", default=None, help="比較する計算精度（例: int8,int8_float32）")
+    tune.add_argument("--threads", type=_parse_int_list, default=None, help="比較するスレッド数（例: 4,8）")
+    tune.add_argument("--workers", type=_parse_int_list, default=[1, 2], help="比較するワーカー数（例: 1,2）")
+    tune.add_argument("-r", "--reference", help="参照テキストファイル（省略時は float32 / float16 の出力）", default=None)
+    tune.add_argument("--tolerance", type=float, default=0.01, help="許容するCERの増加量（デフォルト: 0.01）")
+    tune.add_argument("--no-save", action="store_true", help="選択した設定を保存しない")
+
+    profiles = subparsers.add_parser("profiles", help="faster-whisper の速度プリセットの速度と精度を比較")
+    profiles.add_argument("clips", nargs="+", help="参照クリップ（音声ファイルまたはディレクトリ。参照テキストは同名の .txt）")
+    profiles.add_argument("-m", "--model", help="モデル名（デフォルト: large-v3-turbo）", default=None)
+    profiles.add_argument("--profiles", default=None, help="比較するプリセット（例: fast,balanced）")
+
+    live = subparsers.add_parser("live", help="ライブ文字起こしの確定方式ごとの遅延と計算量をオフラインと比較")
+    live.add_argument("audio", help="計測用の音声ファイル（実時間で受信したものとして扱う）")
+    live.add_argument("-m", "--model", help="モデル名（デフォルト: large-v3-turbo）", default=None)
+    live.add_argument("-r", "--reference", help="参照テキストファイル（省略時はオフライン文字起こしの出力）", default=None)
+    live.add_argument("--policies", default=None, help="比較する確定方式（例: agreement,pause）")
+    live.add_argument("--speed", default="fast", help="速度プリセット（デフォルト: fast）")
+
+    args = parser.parse_args()
+
+    if args.command == "live":
+        results = benchmark_live(
+            args.audio,
+            model_name=args.model,
+            policies=args.policies.split(",") if args.policies else None,
+            speed_profile=args.speed,
+            reference_text=_read_reference(args.reference),
+        )
+        return 0 if results else 1
+
+    if args.command == "profiles":
+        results = benchmark_speed_profiles(
+            find_reference_clips(args.clips),
+            model_name=args.model,
+            profiles=args.profiles.split(",") if args.profiles else None,
+        )
+        return 0 if results else 1
+
+    if args.command == "tune":
+        best = tune_faster_whisper(
+            args.audio,
+            model_name=args.model,
+            clip_seconds=args.clip_seconds,
+            compute_types=args.compute_types.split(",") if args.compute_types else None,
+            thread_counts=args.threads,
+            worker_counts=args.workers,
+            tolerance=args.tolerance,
+            reference_text=_read_reference(args.reference),
+            save=not args.no_save,
+        )
+        return 0 if best else 1
+
+    if args.command == "kotoba":
+        best = benchmark_kotoba(
+            args.audio,
+            reference_text=_read_reference(args.reference),
+            batch_sizes=args.batch_sizes,
+            tolerance=args.tolerance,
+            save=not args.no_save,
+        )
+        return 0 if best else 1
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+番組ごとの定番イントロ・アウトロ検出モジュール
+Voicy / stand.fm のように毎回同じジングル・イントロ・アウトロが流れるチャンネルで、
+過去のエピソードとフィンガープリントを突き合わせて繰り返し区間を学習し、
+以降のエピソードでは文字起こし・話者分離の前に取り除く
+
+- エピソードの冒頭・末尾 EDGE_SECONDS 秒ずつのフィンガープリントを直近 MAX_EPISODES 本分保存し、
+  新しいエピソードと時間オフセットを合わせて一致が続く区間をテンプレートとして学習する
+- 学習済みテンプレートはエピソード全体から探すので、番組途中のジングルも取り除ける
+- 取り除いた区間は SpeechTimeline でタイムスタンプを元の時刻に戻す
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Union
+
+import numpy as np
+
+from fingerprint import (
+    FRAME_SIZE,
+    HOP_SECONDS,
+    SAMPLE_RATE,
+    find_offsets,
+    fingerprint_file,
+    frame_bit_errors,
+    matching_runs,
+)
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+EDGE_SECONDS = 300.0       # 学習に使う冒頭・末尾の長さ
+MAX_EPISODES = 8           # 突き合わせ用に保存する直近のエピソード数
+MIN_SPAN_SECONDS = 3.0     # これより短い一致は学習しない
+MAX_SPAN_SECONDS = 120.0   # これより長い一致は再投稿などとみなして学習しない
+MAX_TEMPLATES = 32
+TEMPLATE_MAX_ERROR = 0.3   # テンプレートとして検出するビット誤り率の上限
+SPAN_MARGIN = 0.2          # 取り除く区間の前後に残す余白（秒）
+PROFILE_VERSION = 1
+
+_EDGE_FRAMES = int(EDGE_SECONDS / HOP_SECONDS)
+_MIN_SPAN_FRAMES = int(MIN_SPAN_SECONDS / HOP_SECONDS)
+_MAX_SPAN_FRAMES = int(MAX_SPAN_SECONDS / HOP_SECONDS)
+_FRAME_CENTER = FRAME_SIZE / SAMPLE_RATE / 2
+
+
+def _default_profile_dir() -> Path:
+    from transcriber import APP_CACHE_DIR
+    return APP_CACHE_DIR / "channels"
+
+
+def _pack(arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """配列のリスト → (連結した配列, オフセット)"""
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    if arrays:
+        offsets[1:] = np.cumsum([len(a) for a in arrays])
+        return np.concatenate(arrays).astype(np.uint32), offsets
+    return np.zeros(0, dtype=np.uint32), offsets
+
+
+def _unpack(data: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    return [data[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _overlaps(span: Tuple[int, int], spans: List[Tuple[int, int]]) -> bool:
+    """span の半分以上が spans のどれかと重なっているか"""
+    length = span[1] - span[0]
+    return any(min(span[1], e) - max(span[0], s) >= length / 2 for s, e in spans)
+
+
+class ChannelProfile:
+    """
+    1チャンネル分の学習結果
+
+    profile_dir/<チャンネルキー>.npz に、直近エピソードの冒頭・末尾のフィンガープリントと、
+    繰り返し区間のテンプレート（フィンガープリントの断片）を保存する。
+    """
+
+    def __init__(self, channel_key: str, profile_dir: Optional[Union[str, Path]] = None):
+        self.channel_key = channel_key
+        self.profile_dir = Path(profile_dir) if profile_dir else _default_profile_dir()
+        safe_key = re.sub(r'[^0-9A-Za-z_.-]', '_', channel_key)
+        self.profile_file = self.profile_dir / f"{safe_key}.npz"
+        self.episodes: List[Dict] = []
+        self.heads: List[np.ndarray] = []
+        self.tails: List[np.ndarray] = []
+        self.templates: List[Dict] = []
+        self.template_prints: List[np.ndarray] = []
+        self._load()
+
+    def _load(self):
+        if not self.profile_file.exists():
+            return
+        try:
+            with np.load(self.profile_file, allow_pickle=False) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if meta.get('version') != PROFILE_VERSION:
+                    return
+                self.episodes = meta['episodes']
+                self.templates = meta['templates']
+                self.heads = _unpack(data['heads'], data['head_offsets'])
+                self.tails = _unpack(data['tails'], data['tail_offsets'])
+                self.template_prints = _unpack(data['template_prints'], data['template_offsets'])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] チャンネルプロファイルを読み込めません（作り直します）: {e}", flush=True)
+            self.episodes, self.heads, self.tails = [], [], []
+            self.templates, self.template_prints = [], []
+
+    def save(self):
+        """一時ファイルに書いてから置き換え"""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            'version': PROFILE_VERSION,
+            'channel': self.channel_key,
+            'episodes': self.episodes,
+            'templates': self.templates,
+        }
+        heads, head_offsets = _pack(self.heads)
+        tails, tail_offsets = _pack(self.tails)
+        template_prints, template_offsets = _pack(self.template_prints)
+        tmp_file = self.profile_file.with_name(self.profile_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.savez_compressed(
+                f,
+                meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+                heads=heads, head_offsets=head_offsets,
+                tails=tails, tail_offsets=tail_offsets,
+                template_prints=template_prints, template_offsets=template_offsets,
+            )
+        os.replace(tmp_file, self.profile_file)
+
+    def find_templates(self, fingerprint: np.ndarray) -> List[Tuple[int, int, int]]:
+        """
+        学習済みテンプレートをエピソード全体から探す
+
+        Returns:
+            [(テンプレート番号, 開始フレーム, 終了フレーム), ...]
+        """
+        found = []
+        for index, template in enumerate(self.template_prints):
+            for delta in find_offsets(template, fingerprint, max_candidates=4):
+                begin, end = delta, delta + len(template)
+                if begin < 0 or end > len(fingerprint):
+                    continue
+                errors = frame_bit_errors(template, fingerprint[begin:end])
+                if errors.mean() / 32.0 <= TEMPLATE_MAX_ERROR and not _overlaps((begin, end), [f[1:] for f in found]):
+                    found.append((index, begin, end))
+        return found
+
+    def _learn_from(
+        self,
+        part: np.ndarray,
+        base: int,
+        stored: List[np.ndarray],
+        known: List[Tuple[int, int]],
+    ) -> List[Tuple[int, int]]:
+        """part（エピソードの冒頭または末尾）と過去エピソードの同じ側で一致が続く区間を集める"""
+        learned = []
+        for previous in stored:
+            for delta in find_offsets(part, previous):
+                runs = matching_runs(part, previous, delta, _MIN_SPAN_FRAMES)
+                if sum(e - s for s, e in runs) > len(part) / 2:
+                    continue  # ほぼ全体が一致 = 同じエピソードの再投稿
+                for start, end in runs:
+                    span = (base + start, base + end)
+                    if end - start > _MAX_SPAN_FRAMES or _overlaps(span, known + learned):
+                        continue
+                    learned.append(span)
+        return learned
+
+    def process(self, fingerprint: np.ndarray, source: str = "") -> List[Tuple[float, float]]:
+        """
+        エピソードの繰り返し区間を検出し、学習結果を更新して保存
+
+        Args:
+            fingerprint: エピソード全体のフィンガープリント
+            source: エピソードの識別用（ファイル名など）
+
+        Returns:
+            取り除く区間 [(開始秒, 終了秒), ...]
+        """
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        # 1. 学習済みテンプレートを探す
+        found = self.find_templates(fingerprint)
+        for index, _, _ in found:
+            self.templates[index]['seen'] += 1
+            self.templates[index]['last_seen'] = now
+        spans = [(begin, end) for _, begin, end in found]
+
+        # 2. 冒頭・末尾を過去のエピソードと突き合わせて新しいテンプレートを学習
+        head = fingerprint[:_EDGE_FRAMES]
+        tail_base = max(0, len(fingerprint) - _EDGE_FRAMES)
+        tail = fingerprint[tail_base:]
+        learned_head = self._learn_from(head, 0, self.heads, spans)
+        learned_tail = self._learn_from(tail, tail_base, self.tails, spans + learned_head)
+        learned = learned_head + learned_tail
+        for number, (begin, end) in enumerate(learned):
+            self.templates.append({
+                'duration': round((end - begin) * HOP_SECONDS, 2),
+                'position': 'head' if number < len(learned_head) else 'tail',
+                'seen': 2,
+                'added': now,
+                'last_seen': now,
+            })
+            self.template_prints.append(fingerprint[begin:end].copy())
+        spans += learned
+
+        # 古い・出現回数の少ないテンプレートから捨てる
+        if len(self.templates) > MAX_TEMPLATES:
+            keep = sorted(
+                range(len(self.templates)),
+                key=lambda i: (self.templates[i]['last_seen'], self.templates[i]['seen']),
+            )[-MAX_TEMPLATES:]
+            keep.sort()
+            self.templates = [self.templates[i] for i in keep]
+            self.template_prints = [self.template_prints[i] for i in keep]
+
+        # 3. このエピソードの冒頭・末尾を保存
+        self.heads = (self.heads + [head.copy()])[-MAX_EPISODES:]
+        self.tails = (self.tails + [tail.copy()])[-MAX_EPISODES:]
+        self.episodes = (self.episodes + [{
+            'source': source,
+            'duration': round(len(fingerprint) * HOP_SECONDS, 1),
+            'added': now,
+        }])[-MAX_EPISODES:]
+        self.save()
+
+        return self._to_seconds(spans, len(fingerprint))
+
+    @staticmethod
+    def _to_seconds(spans: List[Tuple[int, int]], frame_count: int) -> List[Tuple[float, float]]:
+        """
+        フレーム範囲 → 秒（フレーム中心の時刻で、前後に SPAN_MARGIN を残す。
+        エピソードの先頭・末尾に接する区間は先頭・末尾まで広げる）
+        """
+        seconds = []
+        for begin, end in sorted(spans):
+            start = begin * HOP_SECONDS + _FRAME_CENTER + SPAN_MARGIN
+            stop = (end - 1) * HOP_SECONDS + _FRAME_CENTER - SPAN_MARGIN
+            if begin == 0:
+                start = 0.0
+            if end >= frame_count:
+                stop = frame_count * HOP_SECONDS + FRAME_SIZE / SAMPLE_RATE
+            if stop > start:
+                seconds.append((start, stop))
+        return seconds
+
+
+def detect_recurring_spans(
+    audio_file: str,
+    channel_key: str,
+    converter=None,
+    fingerprint: Optional[np.ndarray] = None,
+    profile_dir: Optional[Union[str, Path]] = None,
+) -> List[Tuple[float, float]]:
+    """
+    チャンネルの学習結果を使ってエピソードの繰り返し区間を検出（学習結果も更新）
+
+    Returns:
+        取り除く区間 [(開始秒, 終了秒), ...]、失敗時は空リスト
+    """
+    try:
+        if fingerprint is None:
+            fingerprint = fingerprint_file(audio_file, converter)
+        profile = ChannelProfile(channel_key, profile_dir)
+        spans = profile.process(fingerprint, source=Path(audio_file).name)
+        if spans:
+            total = sum(e - s for s, e in spans)
+            print(f"[INFO] 番組の定番区間を検出: {len(spans)}区間 ({total:.0f}秒)", flush=True)
+        elif len(profile.episodes) < 2:
+            print(f"[INFO] 定番区間の学習中: {channel_key}（{len(profile.episodes)}エピソード目）", flush=True)
+        return spans
+    except Exception as e:
+        print(f"[WARNING] 定番区間の検出に失敗（処理は続行）: {e}", flush=True)
+        return []
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="番組の定番イントロ・アウトロ検出")
+    parser.add_argument("channel", help="チャンネルキー（例: voicy_1234, standfm_<id>）")
+    parser.add_argument("audio", nargs="*", help="エピソードの音声ファイル（古い順）")
+    parser.add_argument("--profile-dir", default=None, help="プロファイルの保存先（デフォルト: ~/.cache/transcription-tool/channels）")
+
+    args = parser.parse_args()
+
+    for audio in args.audio:
+        print(f"\n{audio}", flush=True)
+        for start, end in detect_recurring_spans(audio, args.channel, profile_dir=args.profile_dir):
+            print(f"  {start:8.2f}秒 - {end:8.2f}秒", flush=True)
+
+    profile = ChannelProfile(args.channel, args.profile_dir)
+    print(f"\n=== {args.channel} ===", flush=True)
+    print(f"保存済みエピソード: {len(profile.episodes)}", flush=True)
+    for template in profile.templates:
+        print(
+            f"  {template['position']}: {template['duration']:.1f}秒"
+            f"  出現 {template['seen']}回  最終 {template['last_seen']}",
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -215,12 +215,8 @@ class SpeakerDiarizer:
                     speaker = d_seg['speaker']
                     break
 
-            merged_seg = {
-                'start': t_seg['start'],
-                'end': t_seg['end'],
-                'text': t_seg['text'],
-                'speaker': speaker,
-            }
+            # 信頼度・単語タイムスタンプ等の他のキーはそのまま引き継ぐ
+            merged_seg = dict(t_seg, speaker=speaker)
             merged.append(merged_seg)
 
         assigned = sum(1 for s in merged if s['speaker'])
@@ -3,14 +3,18 @@
 """
 動画・音声ダウンローダー
 yt-dlpを使用して各種プラットフォームから動画・音声をダウンロード
+HLS(.m3u8) はフラグメントを並列にダウンロードする（hls_fetcher、扱えないプレイリストは yt-dlp / ffmpeg）
 対応: Instagram, YouTube, X Spaces, Voicy, Radiko, stand.fm, UTAGE等（yt-dlp対応サイト全て）
 """
 
 import os
+import re
 import sys
 import subprocess
+import threading
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
+from hls_fetcher import FRAGMENT_RETRIES, FRAGMENT_WORKERS, HlsFragmentDownloader, UnsupportedPlaylist
 from utage_extractor import UtageExtractor
 from voicy_extractor import VoicyExtractor
 from standfm_extractor import StandfmExtractor
@@ -29,6 +33,9 @@ if sys.platform == 'win32':
         pass
 
 
+VIDEO_WORKERS = 3  # 複数動画のページで同時にダウンロードする動画数
+
+
 class VideoDownloader:
     """各種プラットフォームから動画・音声をダウンロードするクラス
 
@@ -36,11 +43,19 @@ class VideoDownloader:
     1,800以上のサイトから動画・音声をダウンロード
     """
 
-    def __init__(self, output_dir: str = "output", keep_video: bool = False):
+    def __init__(
+        self,
+        output_dir: str = "output",
+        keep_video: bool = False,
+        fragment_workers: int = FRAGMENT_WORKERS,
+        converter=None,
+    ):
         """
         Args:
             output_dir: 出力ディレクトリ
             keep_video: 動画ファイルを保持するかどうか（UTAGE動画のMP4変換に使用）
+            fragment_workers: HLSのフラグメントを同時にダウンロードする数
+            converter: UTAGE動画のMP4変換に使う AudioConverter（Noneの場合は必要になった時に1つだけ作る）
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
@@ -48,7 +63,19 @@ class VideoDownloader:
         self.voicy_extractor = VoicyExtractor()
         self.standfm_extractor = StandfmExtractor()
         self.keep_video = keep_video
+        self.fragment_workers = max(1, fragment_workers)
         self.is_utage_video = False  # UTAGE動画かどうかのフラグ
+        self.channel_key: Optional[str] = None  # 直前にダウンロードした番組のチャンネル（Voicy / stand.fm）
+        self._converter = converter
+        self._converter_lock = threading.Lock()
+
+    def _get_converter(self):
+        """MP4変換用の AudioConverter（ffmpeg の確認は最初の1回だけ）"""
+        with self._converter_lock:
+            if self._converter is None:
+                from audio_converter import AudioConverter
+                self._converter = AudioConverter()
+            return self._converter
 
     def _get_yt_dlp_path(self) -> str:
         """yt-dlpの実行可能ファイルのパスを取得"""
@@ -85,6 +112,7 @@ class VideoDownloader:
         Returns:
             ダウンロードしたファイルのパス、失敗時はNone
         """
+        self.channel_key = None
         try:
             # Voicyの場合、専用エクストラクタで音声URLを取得
             if self.voicy_extractor.is_voicy_url(url):
@@ -119,67 +147,18 @@ class VideoDownloader:
             else:
                 self.is_utage_video = False
 
-            if output_filename:
-                output_template = str(self.output_dir / f"{output_filename}.%(ext)s")
-            else:
-                output_template = str(self.output_dir / "%(id)s.%(ext)s")
-
             print(f"ダウンロード中: {url}")
 
-            # yt-dlpをPythonモジュールとして使用
-            try:
-                import yt_dlp
-
-                ydl_opts = {
-                    'outtmpl': output_template,
-                    'format': 'best',
-                    'nocheckcertificate': False,
-                    'quiet': False,
-                    'no_warnings': False,
-                    'progress_hooks': [self._progress_hook],
-                    'socket_timeout': 30,
-                    'noplaylist': True,
-                }
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([url])
-
-            except ImportError:
-                # フォールバック: コマンドラインのyt-dlpを使用
-                cmd = [
-                    "yt-dlp",
-                                        "-f", "best",
-                    "-o", output_template,
-                    url
-                ]
-                result = subprocess.run(
-                    cmd,
-                    check=True,
-                    capture_output=True,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-
-            # ダウンロードしたファイルを探す
+            # HLSはフラグメントを並列にダウンロード（扱えないプレイリストは yt-dlp）
             downloaded_file = None
-            if output_filename:
-                # 可能性のある拡張子をチェック
-                for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
-                    filepath = self.output_dir / f"{output_filename}.{ext}"
-                    if filepath.exists():
-                        print(f"[OK] ダウンロード完了: {filepath}")
-                        downloaded_file = str(filepath)
-                        break
-            else:
-                # 最新の動画ファイルを取得（ログファイルを除外）
-                video_files = []
-                for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
-                    video_files.extend(self.output_dir.glob(f"*.{ext}"))
-
-                if video_files:
-                    files = sorted(video_files, key=os.path.getmtime)
-                    print(f"[OK] ダウンロード完了: {files[-1]}")
-                    downloaded_file = str(files[-1])
+            if self._is_hls(url):
+                audio_only = not (self.is_utage_video and self.keep_video)
+                downloaded_file = self._download_hls_fragments(
+                    url, str(self.output_dir / (output_filename or 'hls_video')), audio_only)
+            if not downloaded_file:
+                downloaded_file = self._download_with_yt_dlp(url, output_filename)
+            if downloaded_file:
+                print(f"[OK] ダウンロード完了: {downloaded_file}")
 
             if not downloaded_file:
                 print("[ERROR] ダウンロードしたファイルが見つかりません")
@@ -188,8 +167,7 @@ class VideoDownloader:
             # UTAGE動画でkeep_videoフラグが立っている場合、MP4に変換
             if self.is_utage_video and self.keep_video:
                 print(f"[INFO] UTAGE動画をMP4形式に変換中...")
-                from audio_converter import AudioConverter
-                converter = AudioConverter()
+                converter = self._get_converter()
 
                 # MP4ファイル名を生成
                 downloaded_path = Path(downloaded_file)
@@ -220,6 +198,149 @@ class VideoDownloader:
             print(f"[ERROR] 予期しないエラー: {e}")
             return None
 
+    def _download_with_yt_dlp(self, url: str, output_filename: Optional[str] = None) -> Optional[str]:
+        """
+        yt-dlpでダウンロード（HLSのフラグメントは fragment_workers 個ずつ並列に取得）
+
+        Args:
+            url: 動画・音声のURL
+            output_filename: 出力ファイル名（拡張子なし、Noneの場合は動画ID）
+
+        Returns:
+            ダウンロードしたファイルのパス、見つからない場合はNone
+
+        Raises:
+            subprocess.CalledProcessError: コマンドラインのyt-dlpが失敗した場合
+        """
+        if output_filename:
+            output_template = str(self.output_dir / f"{output_filename}.%(ext)s")
+        else:
+            output_template = str(self.output_dir / "%(id)s.%(ext)s")
+
+        # yt-dlpをPythonモジュールとして使用
+        try:
+            import yt_dlp
+
+            ydl_opts = {
+                'outtmpl': output_template,
+                'format': 'best',
+                'nocheckcertificate': False,
+                'quiet': False,
+                'no_warnings': False,
+                'progress_hooks': [self._progress_hook],
+                'socket_timeout': 30,
+                'noplaylist': True,
+                'concurrent_fragment_downloads': self.fragment_workers,
+                'fragment_retries': FRAGMENT_RETRIES,
+            }
+
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([url])
+
+        except ImportError:
+            # フォールバック: コマンドラインのyt-dlpを使用
+            cmd = [
+                "yt-dlp",
+                "-f", "best",
+                "-N", str(self.fragment_workers),
+                "--fragment-retries", str(FRAGMENT_RETRIES),
+                "-o", output_template,
+                url
+            ]
+            subprocess.run(
+                cmd,
+                check=True,
+                capture_output=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+
+        # ダウンロードしたファイルを探す
+        if output_filename:
+            # 可能性のある拡張子をチェック
+            for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
+                filepath = self.output_dir / f"{output_filename}.{ext}"
+                if filepath.exists():
+                    return str(filepath)
+            return None
+
+        # 最新の動画ファイルを取得（ログファイルを除外）
+        video_files = []
+        for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
+            video_files.extend(self.output_dir.glob(f"*.{ext}"))
+        if video_files:
+            return str(sorted(video_files, key=os.path.getmtime)[-1])
+        return None
+
+    @staticmethod
+    def _is_hls(url: str) -> bool:
+        return url.split('?', 1)[0].endswith('.m3u8')
+
+    def _download_hls_fragments(self, m3u8_url: str, output_base: str, audio_only: bool = True) -> Optional[str]:
+        """
+        HLSのフラグメントを並列にダウンロードして1つのファイル（.ts / .mp4）に連結
+
+        Args:
+            m3u8_url: プレイリストのURL
+            output_base: 保存先（拡張子なし）
+            audio_only: 音声だけ使う場合True（音声レンディション・最も軽いバリアントを選ぶ）
+
+        Returns:
+            保存したファイルのパス、扱えないプレイリスト・失敗時はNone（yt-dlp / ffmpeg に任せる）
+        """
+        fetcher = HlsFragmentDownloader(m3u8_url, self.fragment_workers, audio_only=audio_only)
+        try:
+            fetcher.load()
+            print(f"[INFO] HLSのフラグメントを並列にダウンロード中（{len(fetcher.segments)}個, "
+                  f"{fetcher.duration:.0f}秒, 並列数 {fetcher.workers}）", flush=True)
+            return fetcher.download(f"{output_base}{fetcher.extension}")
+        except UnsupportedPlaylist as e:
+            print(f"[INFO] {e}。yt-dlp / ffmpeg でダウンロードします", flush=True)
+        except Exception as e:
+            print(f"[WARNING] フラグメントの並列ダウンロードに失敗、yt-dlp / ffmpeg でダウンロードします: {e}", flush=True)
+        finally:
+            fetcher.close()
+        return None
+
+    def resolve_hls(self, url: str, output_filename: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        URLの音声が HLS(.m3u8) で配信されている場合、プレイリストのURLと保存先のMP3を返す
+
+        ダウンロードしながら文字起こしする場合（hls_fetcher.ProgressiveHlsDownload）に使う。
+        Voicy / stand.fm は番組のチャンネルを channel_key に設定する。
+        UTAGE は keep_video の場合（動画ファイルが必要）は対象外。
+
+        Returns:
+            (m3u8のURL, 保存先のMP3ファイル)、HLSでない・取得に失敗した場合はNone
+        """
+        self.channel_key = None
+        try:
+            if self.voicy_extractor.is_voicy_url(url) or self.standfm_extractor.is_standfm_url(url):
+                voicy = self.voicy_extractor.is_voicy_url(url)
+                extractor = self.voicy_extractor if voicy else self.standfm_extractor
+                result = extractor.extract_audio_info(url)
+                if not result or '.m3u8' not in result['url']:
+                    return None
+                if result.get('channel_id'):
+                    self.channel_key = f"{'voicy' if voicy else 'standfm'}_{result['channel_id']}"
+                default_name = 'voicy_audio' if voicy else 'standfm_audio'
+                name = output_filename or re.sub(r'[\\/:*?"<>|]', '_', result.get('title', default_name))
+                return result['url'], str(self.output_dir / f"{name}.mp3")
+
+            if self.utage_extractor.is_utage_url(url):
+                if self.keep_video:
+                    return None
+                video_urls = self.utage_extractor.extract_video_urls(url)
+                if not video_urls or '.m3u8' not in video_urls[0]:
+                    return None
+                return video_urls[0], str(self.output_dir / f"{output_filename or 'utage_audio'}.mp3")
+
+            if self._is_hls(url):
+                return url, str(self.output_dir / f"{output_filename or 'hls_audio'}.mp3")
+        except Exception as e:
+            print(f"[WARNING] HLSのURL取得に失敗: {e}", flush=True)
+        return None
+
     def _download_voicy(self, url: str, output_filename: Optional[str] = None) -> Optional[str]:
         """
         Voicy音声をダウンロード
@@ -238,6 +359,8 @@ class VideoDownloader:
                 return None
 
             audio_url = result['url']
+            if result.get('channel_id'):
+                self.channel_key = f"voicy_{result['channel_id']}"
 
             if output_filename:
                 safe_name = output_filename
@@ -281,7 +404,8 @@ class VideoDownloader:
             return None
 
     def _download_hls_to_mp3(self, m3u8_url: str, output_path: str) -> Optional[str]:
-        """HLS(.m3u8)をffmpegでMP3に変換してダウンロード"""
+        """HLS(.m3u8)をffmpegでMP3に変換してダウンロード（フラグメントを並列にダウンロードしてから変換）"""
+        stream_file = self._download_hls_fragments(m3u8_url, str(Path(output_path).with_suffix('')))
         try:
             ffmpeg_path = os.environ.get('FFMPEG_BINARY', 'ffmpeg')
             if ffmpeg_path and not os.path.isfile(ffmpeg_path):
@@ -289,7 +413,7 @@ class VideoDownloader:
 
             cmd = [
                 ffmpeg_path,
-                "-i", m3u8_url,
+                "-i", stream_file or m3u8_url,
                 "-acodec", "libmp3lame",
                 "-b:a", "192k",
                 "-y",
@@ -323,6 +447,9 @@ class VideoDownloader:
         except Exception as e:
             print(f"[ERROR] HLS変換エラー: {e}")
             return None
+        finally:
+            if stream_file and os.path.exists(stream_file):
+                os.remove(stream_file)
 
     def _download_standfm(self, url: str, output_filename: Optional[str] = None) -> Optional[str]:
         """
@@ -342,6 +469,8 @@ class VideoDownloader:
                 return None
 
             audio_url = result['url']
+            if result.get('channel_id'):
+                self.channel_key = f"standfm_{result['channel_id']}"
 
             if output_filename:
                 safe_name = output_filename
@@ -434,144 +563,142 @@ class VideoDownloader:
             print(f"[WARNING] MP3変換失敗、M4Aのまま使用: {e}")
             return input_path
 
-    def download_multiple(self, url: str, output_filename_base: Optional[str] = None) -> List[str]:
+    def download_multiple(
+        self,
+        url: str,
+        output_filename_base: Optional[str] = None,
+        workers: int = VIDEO_WORKERS,
+    ) -> List[str]:
         """
         UTAGE等の複数動画があるページから全動画をダウンロード
 
         Args:
             url: 動画ページのURL
             output_filename_base: 出力ファイル名のベース（拡張子なし）
+            workers: 同時にダウンロードする動画数
 
         Returns:
-            ダウンロードしたファイルパスのリスト
+            ダウンロードしたファイルパスのリスト（ページ上の順）
+        """
+        results = sorted(
+            (index, filepath)
+            for index, _, filepath in self.iter_download_multiple(url, output_filename_base, workers)
+            if filepath
+        )
+        downloaded_files = [filepath for _, filepath in results]
+        print(f"\n[INFO] 合計 {len(downloaded_files)} 個の動画をダウンロードしました")
+        return downloaded_files
+
+    def iter_download_multiple(
+        self,
+        url: str,
+        output_filename_base: Optional[str] = None,
+        workers: int = VIDEO_WORKERS,
+    ) -> Iterator[Tuple[int, int, Optional[str]]]:
+        """
+        UTAGE等の複数動画があるページの全動画を並列にダウンロードし、終わったものから返す
+
+        ダウンロードは最大 workers 本ずつ行い、呼び出し側が1本目を処理している間も残りのダウンロードを続ける。
+        UTAGE以外のページは単一ダウンロード。
+
+        Args:
+            url: 動画ページのURL
+            output_filename_base: 出力ファイル名のベース（拡張子なし）
+            workers: 同時にダウンロードする動画数
+
+        Yields:
+            (動画番号（1始まり）, 動画数, ダウンロードしたファイルのパス（失敗時はNone))、ダウンロードが終わった順
         """
-        downloaded_files = []
+        if not self.utage_extractor.is_utage_url(url):
+            print("[INFO] 複数動画対応はUTAGEページのみです。単一ダウンロードを実行します")
+            yield 1, 1, self.download(url, output_filename_base)
+            return
 
-        # UTAGEページの場合、全動画URLを抽出
-        if self.utage_extractor.is_utage_url(url):
-            print(f"[INFO] UTAGEページを検出: {url}")
-            self.is_utage_video = True
+        print(f"[INFO] UTAGEページを検出: {url}")
+        self.is_utage_video = True
+        self.channel_key = None
 
-            video_urls = self.utage_extractor.extract_video_urls(url)
-            if not video_urls:
-                print(f"[ERROR] UTAGE動画URLの抽出に失敗")
-                return downloaded_files
+        video_urls = self.utage_extractor.extract_video_urls(url)
+        if not video_urls:
+            print(f"[ERROR] UTAGE動画URLの抽出に失敗")
+            return
 
-            print(f"[INFO] {len(video_urls)}個の動画を検出しました")
+        total = len(video_urls)
+        workers = max(1, min(workers, total))
+        print(f"[INFO] {total}個の動画を検出しました（同時ダウンロード数 {workers}）")
 
-            # 各動画をダウンロード
-            for i, video_url in enumerate(video_urls, 1):
-                print(f"\n[INFO] 動画 {i}/{len(video_urls)} をダウンロード中...")
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="video-download") as pool:
+            futures = {}
+            for i, video_url in enumerate(video_urls, 1):
                 # ファイル名を生成
                 if output_filename_base:
                     filename = f"{output_filename_base}_{i}"
                 else:
-                    filename = None
+                    filename = f"video_{i}"
+                futures[pool.submit(self._download_video, video_url, filename, i, total)] = i
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], total, future.result()
+            finally:
+                # 呼び出し側が途中でやめた場合、まだ始まっていないダウンロードは取り消す
+                for future in futures:
+                    future.cancel()
+
+    def _download_video(self, video_url: str, filename: str, index: int, total: int) -> Optional[str]:
+        """
+        複数動画のページの動画を1本ダウンロード（エラーは動画ごとに表示してNoneを返す）
 
-                # ダウンロード実行（extract_video_urlsで既にURLを取得しているので直接ダウンロード）
-                try:
-                    if filename:
-                        output_template = str(self.output_dir / f"{filename}.%(ext)s")
-                    else:
-                        output_template = str(self.output_dir / f"video_{i}.%(ext)s")
+        Args:
+            video_url: 動画のURL（extract_video_urlsで取得済み）
+            filename: 出力ファイル名（拡張子なし）
+            index: 動画番号（1始まり）
+            total: 動画数
 
-                    # yt-dlpをPythonモジュールとして使用
+        Returns:
+            ダウンロードしたファイルのパス、失敗時はNone
+        """
+        print(f"[INFO] 動画 {index}/{total} をダウンロード中...", flush=True)
+        try:
+            downloaded_file = None
+            if self._is_hls(video_url):
+                downloaded_file = self._download_hls_fragments(
+                    video_url, str(self.output_dir / filename), audio_only=not self.keep_video)
+            if not downloaded_file:
+                downloaded_file = self._download_with_yt_dlp(video_url, filename)
+
+            if not downloaded_file:
+                print(f"[ERROR] 動画 {index} のダウンロードファイルが見つかりません", flush=True)
+                return None
+
+            # UTAGE動画でkeep_videoフラグが立っている場合、MP4に変換
+            if self.keep_video:
+                print(f"[INFO] UTAGE動画 {index} をMP4形式に変換中...", flush=True)
+
+                # MP4ファイル名を生成
+                downloaded_path = Path(downloaded_file)
+                mp4_file = str(downloaded_path.parent / f"{downloaded_path.stem}_converted.mp4")
+
+                # MP4に変換
+                converted_file = self._get_converter().convert_to_mp4(downloaded_file, mp4_file)
+                if converted_file:
+                    # 元のファイルを削除（変換後のMP4を保持）
                     try:
-                        import yt_dlp
-
-                        ydl_opts = {
-                            'outtmpl': output_template,
-                            'format': 'best',
-                            'nocheckcertificate': False,
-                            'quiet': False,
-                            'no_warnings': False,
-                            'progress_hooks': [self._progress_hook],
-                        }
-
-                        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                            ydl.download([video_url])
-
-                    except ImportError:
-                        # フォールバック: コマンドラインのyt-dlpを使用
-                        cmd = [
-                            "yt-dlp",
-                                                        "-f", "best",
-                            "-o", output_template,
-                            video_url
-                        ]
-                        subprocess.run(
-                            cmd,
-                            check=True,
-                            capture_output=True,
-                            encoding='utf-8',
-                            errors='replace'
-                        )
-
-                    # ダウンロードしたファイルを探す
-                    downloaded_file = None
-                    if filename:
-                        for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
-                            filepath = self.output_dir / f"{filename}.{ext}"
-                            if filepath.exists():
-                                downloaded_file = str(filepath)
-                                break
-                    else:
-                        # 最新の動画ファイルを取得
-                        video_files = []
-                        for ext in ['mp4', 'webm', 'mkv', 'm4a', 'mp3', 'opus', 'ogg']:
-                            video_files.extend(self.output_dir.glob(f"*.{ext}"))
-                        if video_files:
-                            files = sorted(video_files, key=os.path.getmtime)
-                            downloaded_file = str(files[-1])
-
-                    if not downloaded_file:
-                        print(f"[ERROR] 動画 {i} のダウンロードファイルが見つかりません")
-                        continue
-
-                    # UTAGE動画でkeep_videoフラグが立っている場合、MP4に変換
-                    if self.keep_video and downloaded_file:
-                        print(f"[INFO] UTAGE動画 {i} をMP4形式に変換中...")
-                        from audio_converter import AudioConverter
-                        converter = AudioConverter()
-
-                        # MP4ファイル名を生成
-                        downloaded_path = Path(downloaded_file)
-                        mp4_file = str(downloaded_path.parent / f"{downloaded_path.stem}_converted.mp4")
-
-                        # MP4に変換
-                        converted_file = converter.convert_to_mp4(downloaded_file, mp4_file)
-                        if converted_file:
-                            # 元のファイルを削除（変換後のMP4を保持）
-                            try:
-                                os.remove(downloaded_file)
-                                print(f"[OK] 元のファイルを削除: {downloaded_file}")
-                            except:
-                                pass
-                            downloaded_files.append(converted_file)
-                            print(f"[OK] 動画 {i} ダウンロード完了: {converted_file}")
-                        else:
-                            print("[WARNING] MP4変換に失敗、元のファイルを使用します")
-                            downloaded_files.append(downloaded_file)
-                            print(f"[OK] 動画 {i} ダウンロード完了: {downloaded_file}")
-                    elif downloaded_file:
-                        downloaded_files.append(downloaded_file)
-                        print(f"[OK] 動画 {i} ダウンロード完了: {downloaded_file}")
-
-                except Exception as e:
-                    print(f"[ERROR] 動画 {i} のダウンロードエラー: {e}")
-                    continue
-
-            print(f"\n[INFO] 合計 {len(downloaded_files)} 個の動画をダウンロードしました")
-            return downloaded_files
+                        os.remove(downloaded_file)
+                        print(f"[OK] 元のファイルを削除: {downloaded_file}")
+                    except:
+                        pass
+                    downloaded_file = converted_file
+                else:
+                    print("[WARNING] MP4変換に失敗、元のファイルを使用します")
 
-        else:
-            # UTAGE以外の場合は単一ダウンロード
-            print("[INFO] 複数動画対応はUTAGEページのみです。単一ダウンロードを実行します")
-            result = self.download(url, output_filename_base)
-            if result:
-                downloaded_files.append(result)
-            return downloaded_files
+            print(f"[OK] 動画 {index} ダウンロード完了: {downloaded_file}", flush=True)
+            return downloaded_file
+
+        except Exception as e:
+            print(f"[ERROR] 動画 {index} のダウンロードエラー: {e}", flush=True)
+            return None
 
     def get_video_info(self, url: str) -> Optional[Dict]:
         """
@@ -519,7 +519,7 @@ class ProcessManager {
           }
 
           // Log important messages (sanitized)
-          if (line.includes('ステップ') || line.includes('処理') || line.includes('[OK]') || line.includes('[ERROR]') || line.includes('Whisper')) {
+          if (line.includes('ステップ') || line.includes('処理') || line.includes('[OK]') || line.includes('[ERROR]') || line.includes('Whisper') || line.includes('[SEGMENT]')) {
             this.log('info', this._sanitizeLogLine(line.trim()));
           }
 
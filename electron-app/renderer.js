@@ -51,7 +51,7 @@ const progressDetails = document.getElementById('progress-details');
 const dropZone = document.getElementById('drop-zone');
 
 // Supported file extensions for drag & drop
-const SUPPORTED_EXTENSIONS = ['.mp4', '.mp3', '.m4a', '.wav', '.webm', '.mkv', '.mov'];
+const SUPPORTED_EXTENSIONS = ['.mp4', '.mp3', '.m4a', '.wav', '.webm', '.mkv', '.mov', '.opus'];
 
 // Engine-specific model options
 const ENGINE_MODELS = {
@@ -63,6 +63,7 @@ const ENGINE_MODELS = {
     { value: 'small', label: 'small - 軽量・高速' },
     { value: 'base', label: 'base - 軽量' },
     { value: 'tiny', label: 'tiny - 最速（精度は低め）' },
+    { value: 'kotoba-whisper-v2.0', label: 'kotoba-whisper-v2.0 - 日本語特化（CTranslate2版・軽量）' },
   ],
   'kotoba-whisper': [
     { value: 'kotoba-whisper-v2.0', label: 'kotoba-whisper-v2.0 - 日本語特化（推奨）', selected: true },
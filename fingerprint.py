@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+音声フィンガープリントモジュール
+同じ音声の再投稿・転載（Instagram と TikTok の両方など）を検出し、
+保存済みの文字起こし結果を再利用する
+
+- 33バンドのエネルギー差分の符号から、約23msごとに32bitのサブフィンガープリントを作る
+  （Haitsma & Kalker 方式。コンテナ・ビットレート・音量の違いに強い）
+- 間引いたサブフィンガープリントの転置インデックス（ソート済み配列）で候補を引き、
+  時間オフセットの投票 → ビット誤り率で照合するので、先頭・末尾のトリムが違っても一致する
+- 登録時の文字起こし設定（エンジン・モデル・言語・話者分離）が同じ登録だけを再利用する
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Tuple, Union
+
+import numpy as np
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+SAMPLE_RATE = 5512
+FRAME_SIZE = 2048          # 約0.37秒
+HOP_SIZE = 128             # 約23ms
+BAND_COUNT = 33            # 32bit = 隣接バンド差分 32個
+MIN_FREQ = 300.0
+MAX_FREQ = 2000.0
+HOP_SECONDS = HOP_SIZE / SAMPLE_RATE
+
+INDEX_STRIDE = 4           # インデックスに登録するのは4フレームに1つ
+WEAK_BITS = 2              # 照合時に反転を試す、差分の小さい（不安定な）ビットの数
+MAX_POSTINGS = 200         # これより多くのクリップに現れるハッシュは照合に使わない
+MAX_BIT_ERROR_RATE = 0.35
+MIN_COVERAGE = 0.9         # 新しい音声のうち、登録済み音声と重なっている割合の下限
+MIN_MATCH_FRAMES = 200     # 約4.6秒
+INDEX_VERSION = 1
+
+BLOCK_FRAMES = 4096
+
+
+def _band_matrix() -> np.ndarray:
+    """FFTビン → 対数間隔の33バンドへの集約行列"""
+    freqs = np.fft.rfftfreq(FRAME_SIZE, d=1.0 / SAMPLE_RATE)
+    edges = np.geomspace(MIN_FREQ, MAX_FREQ, BAND_COUNT + 1)
+    band = np.searchsorted(edges, freqs, side='right') - 1
+    matrix = np.zeros((len(freqs), BAND_COUNT), dtype=np.float32)
+    valid = (band >= 0) & (band < BAND_COUNT)
+    matrix[np.nonzero(valid)[0], band[valid]] = 1.0
+    return matrix
+
+
+_BANDS = _band_matrix()
+_WINDOW = np.hanning(FRAME_SIZE).astype(np.float32)
+_BIT_WEIGHTS = (np.uint32(1) << np.arange(BAND_COUNT - 1, dtype=np.uint32)).astype(np.uint32)
+
+
+def _band_energies(samples: np.ndarray) -> np.ndarray:
+    """フレームごとのバンドエネルギー (フレーム数 × 33)"""
+    frame_count = (len(samples) - FRAME_SIZE) // HOP_SIZE + 1
+    if frame_count <= 0:
+        return np.zeros((0, BAND_COUNT), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE][:frame_count]
+    energies = []
+    for start in range(0, frame_count, BLOCK_FRAMES):
+        spectrum = np.fft.rfft(frames[start:start + BLOCK_FRAMES] * _WINDOW, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        energies.append(power @ _BANDS)
+    return np.concatenate(energies)
+
+
+def _hash_frames(energies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    バンドエネルギーの時間・周波数方向の差分の符号を32bitにまとめる
+
+    Returns:
+        (ハッシュ, 差分の絶対値が小さい WEAK_BITS 個のビットのマスク)
+    """
+    if len(energies) < 2:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint32)
+    diff = energies[:, :-1] - energies[:, 1:]
+    delta = diff[1:] - diff[:-1]
+    hashes = ((delta > 0).astype(np.uint32) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint32)
+    weakest = np.argpartition(np.abs(delta), WEAK_BITS, axis=1)[:, :WEAK_BITS]
+    weak_masks = _BIT_WEIGHTS[weakest].sum(axis=1, dtype=np.uint32)
+
+    # 無音フレームは 0 にして照合・インデックスの対象外にする
+    level = energies.sum(axis=1)
+    silent = level[1:] <= max(float(np.max(level)) * 1e-6, 1e-8)
+    hashes[silent] = 0
+    weak_masks[silent] = 0
+    return hashes, weak_masks
+
+
+def compute_fingerprint(samples: Union[np.ndarray, Iterable[np.ndarray]], weak_bits: bool = False):
+    """
+    5512Hz モノラルPCMからフィンガープリント（uint32 配列、HOP_SECONDS ごとに1つ）を計算
+
+    Args:
+        samples: float32 PCM（配列、またはチャンクのイテラブル）
+        weak_bits: True の場合、照合用に不安定なビットのマスクも返す
+
+    Returns:
+        フィンガープリント、weak_bits=True の場合は (フィンガープリント, マスク)
+    """
+    if isinstance(samples, np.ndarray):
+        samples = [samples]
+
+    energies = []
+    pending = np.zeros(0, dtype=np.float32)
+    for chunk in samples:
+        pending = np.concatenate([pending, np.asarray(chunk, dtype=np.float32)])
+        block = _band_energies(pending)
+        if len(block):
+            energies.append(block)
+            pending = pending[len(block) * HOP_SIZE:]
+    hashes, weak_masks = _hash_frames(
+        np.concatenate(energies) if energies else np.zeros((0, BAND_COUNT), dtype=np.float32)
+    )
+    return (hashes, weak_masks) if weak_bits else hashes
+
+
+def fingerprint_file(audio_file: str, converter=None, weak_bits: bool = False):
+    """音声・動画ファイルのフィンガープリントを計算（ffmpegでストリーミングデコード）"""
+    if converter is None:
+        from audio_converter import AudioConverter
+        converter = AudioConverter()
+    return compute_fingerprint(converter.iter_pcm(audio_file, sample_rate=SAMPLE_RATE), weak_bits=weak_bits)
+
+
+def _flip_weak_bits(frames: np.ndarray, hashes: np.ndarray, weak_masks: np.ndarray):
+    """不安定なビットを反転させた全組み合わせを照合用の候補に加える"""
+    remaining = weak_masks.copy()
+    for _ in range(WEAK_BITS):
+        bit = remaining & (~remaining + np.uint32(1))   # 最下位の立っているビット
+        remaining ^= bit
+        flip = bit != 0
+        frames = np.concatenate([frames, frames[flip]])
+        hashes = np.concatenate([hashes, hashes[flip] ^ bit[flip]])
+        remaining = np.concatenate([remaining, remaining[flip]])
+    keep = hashes != 0
+    return frames[keep], hashes[keep]
+
+
+def _match_postings(
+    fingerprint: np.ndarray,
+    weak_masks: Optional[np.ndarray],
+    keys: np.ndarray,
+    postings: np.ndarray,
+):
+    """
+    ソート済みの keys からサブフィンガープリントが一致するものを引く
+
+    Returns:
+        (一致したクエリ側のフレーム, 一致した postings の値) の配列の組
+    """
+    query_frames = np.nonzero(fingerprint)[0]
+    query = fingerprint[query_frames]
+    if weak_masks is not None:
+        query_frames, query = _flip_weak_bits(query_frames, query, weak_masks[query_frames])
+    lo = np.searchsorted(keys, query, side='left')
+    hi = np.searchsorted(keys, query, side='right')
+    counts = hi - lo
+    usable = (counts > 0) & (counts <= MAX_POSTINGS)
+    query_frames, lo, counts = query_frames[usable], lo[usable], counts[usable]
+
+    total = int(counts.sum())
+    group_start = np.repeat(np.cumsum(counts) - counts, counts)
+    posting_index = np.repeat(lo, counts) + (np.arange(total) - group_start)
+    return np.repeat(query_frames, counts), postings[posting_index]
+
+
+def find_offsets(
+    query: np.ndarray,
+    target: np.ndarray,
+    weak_masks: Optional[np.ndarray] = None,
+    max_candidates: int = 3,
+    min_votes: int = 8,
+) -> List[int]:
+    """
+    2つのフィンガープリントで同じ音が鳴っている時間オフセットの候補
+
+    Returns:
+        「target のフレーム - query のフレーム」の候補（一致数の多い順）
+    """
+    positions = np.nonzero(target)[0]
+    order = np.argsort(target[positions], kind='stable')
+    query_frames, matched = _match_postings(query, weak_masks, target[positions][order], positions[order])
+    if not len(matched):
+        return []
+    deltas, votes = np.unique(matched - query_frames, return_counts=True)
+    best = np.argsort(votes)[::-1][:max_candidates]
+    return [int(deltas[i]) for i in best if votes[i] >= min_votes]
+
+
+def frame_bit_errors(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """同じ長さのフィンガープリントのフレームごとの誤りビット数"""
+    diff = np.bitwise_xor(a, b).astype(np.uint32)
+    return np.unpackbits(diff.view(np.uint8).reshape(-1, 4), axis=1).sum(axis=1)
+
+
+def matching_runs(
+    query: np.ndarray,
+    target: np.ndarray,
+    delta: int,
+    min_frames: int,
+    max_error: float = 0.25,
+    smooth_frames: int = 43,
+) -> List[Tuple[int, int]]:
+    """
+    オフセット delta で重ねたとき、ビット誤り率が max_error 以下で続く区間
+
+    Returns:
+        query のフレーム範囲 [(開始, 終了), ...]
+    """
+    begin = max(0, -delta)
+    end = min(len(query), len(target) - delta)
+    if end - begin < min_frames:
+        return []
+    errors = frame_bit_errors(query[begin:end], target[begin + delta:end + delta]) / 32.0
+    kernel = np.ones(smooth_frames) / smooth_frames
+    smoothed = np.convolve(errors, kernel, mode='same')
+    matched = np.concatenate([[False], smoothed <= max_error, [False]])
+    edges = np.flatnonzero(matched[1:] != matched[:-1])
+    return [
+        (begin + int(s), begin + int(e))
+        for s, e in zip(edges[::2], edges[1::2])
+        if e - s >= min_frames
+    ]
+
+
+def bit_error_rate(a: np.ndarray, b: np.ndarray) -> float:
+    """同じ長さのフィンガープリント同士のビット誤り率"""
+    if len(a) == 0:
+        return 1.0
+    diff = np.bitwise_xor(a, b).view(np.uint8)
+    return float(np.unpackbits(diff).sum()) / (len(a) * 32)
+
+
+def _default_index_dir() -> Path:
+    from transcriber import APP_CACHE_DIR
+    return APP_CACHE_DIR / "fingerprints"
+
+
+class FingerprintIndex:
+    """
+    フィンガープリントと文字起こし結果のローカルインデックス
+
+    index.npz に全クリップのフィンガープリント（CSR形式）と、間引いたサブフィンガープリントの
+    ソート済み転置インデックスを保存し、文字起こし結果は <id>.npz（TranscriptResult.save）に保存する。
+    """
+
+    def __init__(self, index_dir: Optional[Union[str, Path]] = None):
+        self.index_dir = Path(index_dir) if index_dir else _default_index_dir()
+        self.index_file = self.index_dir / "index.npz"
+        self.entries: List[Dict] = []
+        self.hashes = np.zeros(0, dtype=np.uint32)
+        self.clip_offsets = np.zeros(1, dtype=np.int64)
+        self.keys = np.zeros(0, dtype=np.uint32)
+        self.postings = np.zeros(0, dtype=np.int64)
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _load(self):
+        if not self.index_file.exists():
+            return
+        try:
+            with np.load(self.index_file, allow_pickle=False) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if meta.get('version') != INDEX_VERSION:
+                    print("[WARNING] フィンガープリントのインデックス形式が古いため作り直します", flush=True)
+                    return
+                self.entries = meta['entries']
+                self.hashes = data['hashes']
+                self.clip_offsets = data['clip_offsets']
+                self.keys = data['keys']
+                self.postings = data['postings']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] フィンガープリントのインデックスを読み込めません（作り直します）: {e}", flush=True)
+
+    def _save(self):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        meta = {'version': INDEX_VERSION, 'entries': self.entries}
+        tmp_file = self.index_file.with_name(self.index_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            np.savez(
+                f,
+                meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+                hashes=self.hashes,
+                clip_offsets=self.clip_offsets,
+                keys=self.keys,
+                postings=self.postings,
+            )
+        os.replace(tmp_file, self.index_file)
+
+    def add(
+        self,
+        fingerprint: np.ndarray,
+        result,
+        source: str = "",
+        settings: Optional[Dict] = None,
+    ) -> Optional[str]:
+        """
+        フィンガープリントと文字起こし結果を登録
+
+        Args:
+            fingerprint: compute_fingerprint() の結果
+            result: 文字起こし結果（TranscriptResult または dict）
+            source: 元の音声ファイル名（表示用）
+            settings: 文字起こしの設定（{'engine', 'model', 'language', 'diarize'}）。
+                lookup() は同じ設定の登録だけを返す
+
+        Returns:
+            登録ID、フィンガープリントが短すぎる場合はNone
+        """
+        from transcript_result import TranscriptResult
+
+        if np.count_nonzero(fingerprint) < MIN_MATCH_FRAMES:
+            return None
+
+        entry_id = uuid.uuid4().hex[:16]
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        if not isinstance(result, TranscriptResult):
+            result = TranscriptResult.from_dict(result)
+        result.save(self.index_dir / f"{entry_id}.npz")
+
+        base = int(self.clip_offsets[-1])
+        sampled = np.arange(0, len(fingerprint), INDEX_STRIDE)
+        sampled = sampled[fingerprint[sampled] != 0]
+        new_keys = fingerprint[sampled]
+        order = np.argsort(new_keys, kind='stable')
+        new_keys = new_keys[order]
+        new_postings = sampled[order].astype(np.int64) + base
+
+        insert_at = np.searchsorted(self.keys, new_keys, side='right')
+        self.keys = np.insert(self.keys, insert_at, new_keys)
+        self.postings = np.insert(self.postings, insert_at, new_postings)
+        self.hashes = np.concatenate([self.hashes, fingerprint.astype(np.uint32)])
+        self.clip_offsets = np.append(self.clip_offsets, base + len(fingerprint))
+        self.entries.append({
+            'id': entry_id,
+            'source': source,
+            'duration': round(len(fingerprint) * HOP_SECONDS, 3),
+            'added': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'settings': settings or {},
+        })
+        self._save()
+        return entry_id
+
+    def lookup(
+        self,
+        fingerprint: np.ndarray,
+        weak_masks: Optional[np.ndarray] = None,
+        settings: Optional[Dict] = None,
+    ) -> Optional[Dict]:
+        """
+        登録済みの同じ音声を探す
+
+        Args:
+            fingerprint: compute_fingerprint() の結果
+            weak_masks: compute_fingerprint(weak_bits=True) のマスク。指定すると不安定なビットを
+                反転させた値でも候補を引くので、劣化した音声でも見つかりやすくなる
+            settings: 今回の文字起こしの設定。指定すると登録時の設定が同じものだけを対象にする
+                （設定の記録がない古い登録は対象外）
+
+        Returns:
+            {'id', 'source', 'offset', 'bit_error_rate', 'coverage'} または None
+            offset は「登録済み音声の時刻 - 新しい音声の時刻」（秒）
+        """
+        if not len(self.keys) or np.count_nonzero(fingerprint) < MIN_MATCH_FRAMES:
+            return None
+
+        query_frames, positions = _match_postings(fingerprint, weak_masks, self.keys, self.postings)
+        if not len(positions):
+            return None
+
+        # 一致したサブフィンガープリントごとに (クリップ, 時間オフセット) へ投票
+        clips = np.searchsorted(self.clip_offsets, positions, side='right') - 1
+        if settings is not None:
+            compatible = np.array([entry.get('settings') == settings for entry in self.entries], dtype=bool)
+            keep = compatible[clips]
+            clips, positions, query_frames = clips[keep], positions[keep], query_frames[keep]
+            if not len(clips):
+                return None
+        deltas = positions - self.clip_offsets[clips] - query_frames
+
+        votes = clips * (len(fingerprint) + len(self.hashes) + 1) + (deltas + len(fingerprint))
+        candidates, vote_counts = np.unique(votes, return_counts=True)
+        best = None
+        for candidate in candidates[np.argsort(vote_counts)[::-1][:5]]:
+            clip = int(candidate // (len(fingerprint) + len(self.hashes) + 1))
+            delta = int(candidate % (len(fingerprint) + len(self.hashes) + 1)) - len(fingerprint)
+            for shift in (-1, 0, 1):
+                match = self._verify(fingerprint, clip, delta + shift)
+                if match and (best is None or match['bit_error_rate'] < best['bit_error_rate']):
+                    best = match
+        return best
+
+    def _verify(self, fingerprint: np.ndarray, clip: int, delta: int) -> Optional[Dict]:
+        """オフセット delta（フレーム）で重ねたときのビット誤り率と重なりを確認"""
+        stored = self.hashes[self.clip_offsets[clip]:self.clip_offsets[clip + 1]]
+        begin = max(0, -delta)
+        end = min(len(fingerprint), len(stored) - delta)
+        if end - begin < MIN_MATCH_FRAMES:
+            return None
+
+        query = fingerprint[begin:end]
+        target = stored[begin + delta:end + delta]
+        active = (query != 0) | (target != 0)
+        if np.count_nonzero(active) < MIN_MATCH_FRAMES:
+            return None
+
+        coverage = float(np.count_nonzero(fingerprint[begin:end]) / max(1, np.count_nonzero(fingerprint)))
+        ber = bit_error_rate(query[active], target[active])
+        if ber > MAX_BIT_ERROR_RATE or coverage < MIN_COVERAGE:
+            return None
+
+        entry = self.entries[clip]
+        return {
+            'id': entry['id'],
+            'source': entry.get('source', ''),
+            'offset': delta * HOP_SECONDS,
+            'bit_error_rate': ber,
+            'coverage': coverage,
+        }
+
+    def load_transcript(self, match: Dict, duration: Optional[float] = None):
+        """
+        一致した登録済み音声の文字起こし結果を、新しい音声の時刻に合わせて読み込む
+
+        Args:
+            match: lookup() の戻り値
+            duration: 新しい音声の長さ（秒）。指定すると範囲外のセグメントを除く
+
+        Returns:
+            TranscriptResult、読み込めない場合はNone
+        """
+        from transcript_result import TranscriptResult
+
+        try:
+            result = TranscriptResult.load(self.index_dir / f"{match['id']}.npz")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] 保存済みの文字起こし結果を読み込めません: {e}", flush=True)
+            return None
+
+        offset = match['offset']
+        if abs(offset) < HOP_SECONDS and duration is None:
+            return result
+
+        segments = []
+        for seg in result.segments:
+            start, end = seg['start'] - offset, seg['end'] - offset
+            if end <= 0 or (duration is not None and start >= duration):
+                continue
+            seg = dict(seg, start=max(0.0, start), end=end if duration is None else min(end, duration))
+            if 'words' in seg:
+                seg['words'] = [
+                    dict(w, start=max(0.0, w['start'] - offset), end=max(0.0, w['end'] - offset))
+                    for w in seg['words']
+                ]
+            segments.append(seg)
+        return TranscriptResult.from_segments(segments)
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="音声フィンガープリントによる重複検出")
+    parser.add_argument("audio", nargs="+", help="音声・動画ファイル")
+    parser.add_argument("--index-dir", default=None, help="インデックスの保存先（デフォルト: ~/.cache/transcription-tool/fingerprints）")
+
+    args = parser.parse_args()
+
+    index = FingerprintIndex(args.index_dir)
+    print(f"[INFO] 登録済み: {len(index)}件", flush=True)
+    for audio in args.audio:
+        started = time.perf_counter()
+        fingerprint, weak_masks = fingerprint_file(audio, weak_bits=True)
+        elapsed = time.perf_counter() - started
+        match = index.lookup(fingerprint, weak_masks)
+        print(f"\n{audio} ({len(fingerprint) * HOP_SECONDS:.1f}秒, {elapsed:.2f}秒で計算)", flush=True)
+        if match:
+            print(
+                f"  一致: {match['source'] or match['id']}"
+                f"  オフセット {match['offset']:+.2f}秒"
+                f"  ビット誤り率 {match['bit_error_rate']:.3f}"
+                f"  重なり {match['coverage']:.0%}",
+                flush=True,
+            )
+        else:
+            print("  一致なし", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HLS音声の取得モジュール
+Voicy / stand.fm / UTAGE の HLS(.m3u8) のフラグメントを並列にダウンロードする。
+ダウンロードしながら、届いた分から順にデコードして文字起こしに渡すこともできる
+
+- HlsFragmentDownloader: フラグメントを並列に先読みし（接続は使い回し、フラグメントごとにやり直し）、
+  元の順序で連結する。1フラグメントごとの往復待ちが重ならないため、回線の速度でダウンロードできる
+- ProgressiveHlsDownload: 連結したストリームを1つの ffmpeg に流し、MP3 への保存と
+  16kHz モノラルPCM（パイプ）の出力を同時に行う
+- PCM はスレッドで読み続けてキューに溜める。文字起こしが遅れてもダウンロードは止めず、
+  MAX_BACKLOG 秒分溜まったときだけ待つ（メモリ使用量の上限）
+- ダウンロードと文字起こしが重なるため、1時間の講義でも所要時間はおおよそ max(ダウンロード, 文字起こし)
+"""
+
+import collections
+import itertools
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from typing import Optional, Dict, List, Iterator, Tuple
+from urllib.parse import urljoin
+
+import numpy as np
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 1.0
+MAX_BACKLOG = 600.0        # 文字起こし待ちのPCMをこれ以上溜めない（秒、float32 で約38MB）
+REQUEST_TIMEOUT = 15
+FRAGMENT_WORKERS = 8       # 同時にダウンロードするフラグメント数
+FRAGMENT_RETRIES = 5       # フラグメントごとのやり直し回数
+RETRY_BACKOFF = 0.5        # やり直しの待ち時間（秒、回数ごとに2倍）
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+
+# ---------------------------------------------------------------------------
+# プレイリスト
+# ---------------------------------------------------------------------------
+class UnsupportedPlaylist(Exception):
+    """自前のダウンローダーでは扱えないプレイリスト（ライブ配信・SAMPLE-AES など。yt-dlp / ffmpeg に任せる）"""
+
+
+_ATTRIBUTE_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def _attributes(line: str) -> Dict[str, str]:
+    """#EXT-X-...:KEY=VALUE,... の属性を辞書にする"""
+    return {k: v.strip('"') for k, v in _ATTRIBUTE_RE.findall(line.split(':', 1)[1])}
+
+
+def _byterange(value: str, previous_end: int) -> Tuple[int, int]:
+    """EXT-X-BYTERANGE の "長さ[@開始位置]" を (開始位置, 終了位置) にする"""
+    length, _, offset = value.partition('@')
+    start = int(offset) if offset else previous_end
+    return start, start + int(length)
+
+
+def parse_playlist(text: str, base_url: str) -> Dict:
+    """
+    m3u8 を解析
+
+    Returns:
+        {
+            'variants': [{'url': str, 'bandwidth': int, 'audio': str or None}, ...],  # マスタープレイリスト
+            'audio': {グループID: 音声レンディションのURL},                            # EXT-X-MEDIA TYPE=AUDIO
+            'segments': [{'url', 'duration', 'sequence', 'key', 'range'}, ...],        # メディアプレイリスト
+            'init': {'url', 'range'} or None,                                          # EXT-X-MAP（fMP4）
+            'ended': bool,                                                             # EXT-X-ENDLIST があるか（VOD）
+        }
+        key は {'method', 'url', 'iv'} または None、range は (開始, 終了) のバイト位置または None
+    """
+    variants: List[Dict] = []
+    audio: Dict[str, str] = {}
+    segments: List[Dict] = []
+    init = None
+    ended = False
+    sequence = 0
+    key = None
+    pending: Dict = {}
+    range_end = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            attrs = _attributes(line)
+            pending = {'variant': True, 'bandwidth': int(attrs.get('BANDWIDTH') or 0), 'audio': attrs.get('AUDIO')}
+        elif line.startswith('#EXT-X-MEDIA:'):
+            attrs = _attributes(line)
+            if attrs.get('TYPE') == 'AUDIO' and attrs.get('URI'):
+                # 同じグループの中では DEFAULT=YES のレンディションを優先
+                if attrs.get('GROUP-ID') not in audio or attrs.get('DEFAULT') == 'YES':
+                    audio[attrs.get('GROUP-ID')] = urljoin(base_url, attrs['URI'])
+        elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+            sequence = int(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-KEY:'):
+            attrs = _attributes(line)
+            method = attrs.get('METHOD', 'NONE')
+            key = None if method == 'NONE' else {
+                'method': method,
+                'url': urljoin(base_url, attrs.get('URI', '')),
+                'iv': attrs.get('IV'),
+            }
+        elif line.startswith('#EXT-X-MAP:'):
+            attrs = _attributes(line)
+            init = {'url': urljoin(base_url, attrs['URI']), 'range': None}
+            if attrs.get('BYTERANGE'):
+                init['range'] = _byterange(attrs['BYTERANGE'], 0)
+        elif line.startswith('#EXTINF:'):
+            pending['duration'] = float(line.split(':', 1)[1].split(',', 1)[0] or 0)
+        elif line.startswith('#EXT-X-BYTERANGE:'):
+            pending['range'] = _byterange(line.split(':', 1)[1], range_end)
+            range_end = pending['range'][1]
+        elif line.startswith('#EXT-X-ENDLIST'):
+            ended = True
+        elif not line.startswith('#'):
+            url = urljoin(base_url, line)
+            if pending.get('variant'):
+                variants.append({'url': url, 'bandwidth': pending['bandwidth'], 'audio': pending['audio']})
+            else:
+                segments.append({
+                    'url': url,
+                    'duration': pending.get('duration', 0.0),
+                    'sequence': sequence,
+                    'key': key,
+                    'range': pending.get('range'),
+                })
+                sequence += 1
+            pending = {}
+    return {'variants': variants, 'audio': audio, 'segments': segments, 'init': init, 'ended': ended}
+
+
+# ---------------------------------------------------------------------------
+# フラグメントの並列ダウンロード
+# ---------------------------------------------------------------------------
+class HlsFragmentDownloader:
+    """
+    VOD の HLS のフラグメントを並列にダウンロードし、元の順序で連結する
+
+    - 1つの requests.Session（接続プール = workers）で接続を使い回す
+    - 先読みは workers * 2 個まで（保持するフラグメント数の上限）
+    - フラグメントごとに、通信エラー・429・5xx は指数バックオフで retries 回までやり直す
+    - AES-128 で暗号化されたフラグメントは yt-dlp の AES 実装で復号する
+    """
+
+    def __init__(
+        self,
+        m3u8_url: str,
+        workers: int = FRAGMENT_WORKERS,
+        retries: int = FRAGMENT_RETRIES,
+        audio_only: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            m3u8_url: プレイリストのURL（マスター・メディアどちらでも可）
+            workers: 同時にダウンロードするフラグメント数
+            retries: フラグメントごとのやり直し回数
+            audio_only: 音声だけ使う場合は音声レンディション（なければ最も軽いバリアント）を選ぶ。
+                False の場合は最も高画質なバリアント
+            headers: 追加のHTTPヘッダー
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.m3u8_url = m3u8_url
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.audio_only = audio_only
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.segments: List[Dict] = []
+        self.init: Optional[Dict] = None
+        self.downloaded_bytes = 0
+        self._keys: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return sum(seg['duration'] for seg in self.segments)
+
+    @property
+    def extension(self) -> str:
+        """連結したファイルの拡張子（fMP4 は .mp4、それ以外は MPEG-TS / ADTS として .ts）"""
+        return '.mp4' if self.init else '.ts'
+
+    def load(self) -> "HlsFragmentDownloader":
+        """
+        プレイリストを取得してダウンロードするフラグメントを決める
+
+        Raises:
+            UnsupportedPlaylist: ライブ配信・SAMPLE-AES・音声と映像が別のプレイリストで映像も必要な場合
+        """
+        url = self.m3u8_url
+        for _ in range(3):  # マスター → メディアプレイリスト
+            playlist = parse_playlist(self._get(url).decode('utf-8', errors='replace'), url)
+            if not playlist['variants']:
+                break
+            if self.audio_only:
+                variant = min(playlist['variants'], key=lambda v: v['bandwidth'])
+                url = playlist['audio'].get(variant['audio']) or variant['url']
+            else:
+                variant = max(playlist['variants'], key=lambda v: v['bandwidth'])
+                if playlist['audio'].get(variant['audio']):
+                    raise UnsupportedPlaylist("音声が別のプレイリストに分かれています")
+                url = variant['url']
+        if not playlist['ended']:
+            raise UnsupportedPlaylist("ライブ配信のプレイリストです")
+        if not playlist['segments']:
+            raise UnsupportedPlaylist("フラグメントがありません")
+        if any(seg['key'] and seg['key']['method'] != 'AES-128' for seg in playlist['segments']):
+            raise UnsupportedPlaylist("AES-128 以外の暗号化には対応していません")
+        if any(seg['key'] for seg in playlist['segments']):
+            try:
+                import yt_dlp.aes  # noqa: F401
+            except ImportError:
+                raise UnsupportedPlaylist("暗号化されたフラグメントの復号には yt-dlp が必要です")
+        self.segments = playlist['segments']
+        self.init = playlist['init']
+        return self
+
+    def _get(self, url: str, byte_range: Optional[Tuple[int, int]] = None) -> bytes:
+        """GET（通信エラー・429・5xx はバックオフしてやり直す）"""
+        import requests
+
+        headers = {'Range': f"bytes={byte_range[0]}-{byte_range[1] - 1}"} if byte_range else None
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+                return response.content
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                response = getattr(e, 'response', None)
+                status = response.status_code if response is not None else None
+                if (status is not None and status != 429 and status < 500) or attempt >= self.retries:
+                    raise
+                delay = RETRY_BACKOFF * 2 ** attempt
+                retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            attempt += 1
+            time.sleep(delay)
+
+    def _key(self, url: str) -> bytes:
+        with self._lock:
+            if url not in self._keys:
+                self._keys[url] = self._get(url)
+            return self._keys[url]
+
+    def _fetch(self, segment: Dict) -> bytes:
+        """フラグメントを1つダウンロード（暗号化されていれば復号）"""
+        data = self._get(segment['url'], segment.get('range'))
+        key = segment.get('key')
+        if key:
+            from yt_dlp.aes import aes_cbc_decrypt_bytes, unpad_pkcs7
+
+            iv = bytes.fromhex(key['iv'][2:].zfill(32)) if key['iv'] else segment['sequence'].to_bytes(16, 'big')
+            data = unpad_pkcs7(aes_cbc_decrypt_bytes(data, self._key(key['url']), iv))
+        with self._lock:
+            self.downloaded_bytes += len(data)
+        return data
+
+    def iter_fragments(self) -> Iterator[bytes]:
+        """初期化セグメント（fMP4）とフラグメントを元の順序で返す（ダウンロードは並列に先読み）"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self.init:
+            yield self._get(self.init['url'], self.init['range'])
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hls-fragment") as pool:
+            pending = collections.deque()
+            segments = iter(self.segments)
+            try:
+                for segment in itertools.islice(segments, self.workers * 2):
+                    pending.append(pool.submit(self._fetch, segment))
+                while pending:
+                    data = pending.popleft().result()
+                    for segment in itertools.islice(segments, 1):
+                        pending.append(pool.submit(self._fetch, segment))
+                    yield data
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def download(self, output_file: str) -> str:
+        """
+        全フラグメントを1つのファイルに連結して保存（途中のファイルは .part）
+
+        Returns:
+            保存したファイルのパス
+        """
+        total = len(self.segments) + bool(self.init)
+        part_file = f"{output_file}.part"
+        started = time.monotonic()
+        last_percent = -1
+        try:
+            with open(part_file, 'wb') as f:
+                for done, data in enumerate(self.iter_fragments(), 1):
+                    f.write(data)
+                    percent = int(done / total * 100)
+                    if percent > last_percent:
+                        last_percent = percent
+                        print(f"[PROGRESS] ダウンロード: {percent}%", flush=True)
+        except BaseException:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+            raise
+        os.replace(part_file, output_file)
+        elapsed = max(time.monotonic() - started, 1e-6)
+        print(f"[OK] {len(self.segments)}フラグメントをダウンロード: {output_file} "
+              f"({self.downloaded_bytes / 1e6:.1f} MB, {self.downloaded_bytes * 8 / 1e6 / elapsed:.1f} Mbps, "
+              f"並列数 {self.workers})", flush=True)
+        return output_file
+
+    def close(self):
+        self.session.close()
+
+
+# ---------------------------------------------------------------------------
+# ダウンロードしながらデコード
+# ---------------------------------------------------------------------------
+class ProgressiveHlsDownload:
+    """HLS を MP3 に保存しながら、デコード済みのPCMを届いた順にチャンクで渡す"""
+
+    def __init__(
+        self,
+        m3u8_url: str,
+        output_file: str,
+        converter,
+        bitrate: str = "192k",
+        max_backlog: float = MAX_BACKLOG,
+        workers: int = FRAGMENT_WORKERS,
+    ):
+        """
+        Args:
+            m3u8_url: HLS プレイリストのURL
+            output_file: 保存するMP3ファイル
+            converter: AudioConverter
+            bitrate: MP3のビットレート
+            max_backlog: 文字起こし待ちのPCMを溜める上限（秒）
+            workers: 同時にダウンロードするフラグメント数
+        """
+        self.m3u8_url = m3u8_url
+        self.output_file = output_file
+        self.converter = converter
+        self.bitrate = bitrate
+        self.workers = workers
+        self.received = 0
+        self.error: Optional[BaseException] = None
+        self.duration: Optional[float] = None
+        self._fetcher: Optional[HlsFragmentDownloader] = None
+        self._queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=max(1, int(max_backlog / CHUNK_SECONDS)))
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hls-download", daemon=True)
+
+    @property
+    def received_seconds(self) -> float:
+        return self.received / SAMPLE_RATE
+
+    @property
+    def backlog_seconds(self) -> float:
+        """デコード済みで文字起こし待ちの音声の長さ"""
+        return self._queue.qsize() * CHUNK_SECONDS
+
+    def start(self):
+        """
+        プレイリストを読み込んでダウンロードを開始
+
+        フラグメントは HlsFragmentDownloader で並列にダウンロードして ffmpeg の stdin に順に流す。
+        自前で扱えないプレイリストは ffmpeg に直接読ませる。
+        """
+        try:
+            self._fetcher = HlsFragmentDownloader(self.m3u8_url, self.workers).load()
+            self.duration = self._fetcher.duration
+        except UnsupportedPlaylist as e:
+            print(f"[INFO] {e}。ffmpeg で直接読み込みます", flush=True)
+            self._fetcher = None
+        except Exception as e:
+            self.error = e
+            self._done.set()
+            return
+        self._thread.start()
+
+    def _feed(self) -> Iterator[bytes]:
+        """フラグメントを順に返す（失敗したら error に記録して入力を終える）"""
+        try:
+            yield from self._fetcher.iter_fragments()
+        except Exception as e:
+            self.error = e
+
+    def _run(self):
+        if self._fetcher:
+            pcm_iter = self.converter.iter_pcm_with_mp3(
+                "pipe:0", self.output_file, self.bitrate, SAMPLE_RATE, CHUNK_SECONDS, feed=self._feed(),
+            )
+        else:
+            pcm_iter = self.converter.iter_pcm_with_mp3(
+                self.m3u8_url, self.output_file, self.bitrate, SAMPLE_RATE, CHUNK_SECONDS,
+            )
+        try:
+            for pcm in pcm_iter:
+                self.received += len(pcm)
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(pcm, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue  # 文字起こしが MAX_BACKLOG 秒遅れている
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            self.error = self.error or e
+        finally:
+            pcm_iter.close()
+            if self._fetcher:
+                self._fetcher.close()
+            self._done.set()
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """デコード済みのPCMチャンク（ダウンロードが終わるか close() されるまで）"""
+        while True:
+            try:
+                yield self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._done.is_set() and self._queue.empty():
+                    return
+
+    def close(self):
+        """ダウンロードを止めて終了を待つ"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+def main():
+    """テスト用のメイン関数（HLS をダウンロード、またはMP3に保存しながらデコードの進み具合を表示）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HLSのフラグメントを並列にダウンロード")
+    parser.add_argument("url", help="HLS プレイリスト(.m3u8)のURL")
+    parser.add_argument("-o", "--output", default=None, help="保存するファイル（デフォルト: hls_audio.mp3 / hls_video.ts）")
+    parser.add_argument("-j", "--workers", type=int, default=FRAGMENT_WORKERS, help="同時にダウンロードするフラグメント数")
+    parser.add_argument("--no-decode", action="store_true", help="デコードせず、フラグメントを連結したファイルだけを保存する")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    if args.no_decode:
+        fetcher = HlsFragmentDownloader(args.url, args.workers, audio_only=False)
+        try:
+            fetcher.load()
+            fetcher.download(args.output or f"hls_video{fetcher.extension}")
+        except Exception as e:
+            print(f"[ERROR] HLSのダウンロードに失敗: {e}", flush=True)
+            return 1
+        finally:
+            fetcher.close()
+        return 0
+
+    from audio_converter import AudioConverter
+
+    output = args.output or "hls_audio.mp3"
+    download = ProgressiveHlsDownload(args.url, output, AudioConverter(), workers=args.workers)
+    download.start()
+    if download.duration:
+        print(f"[INFO] 音声の長さ: {download.duration:.0f}秒", flush=True)
+    try:
+        for _ in download.chunks():
+            if download.received % (SAMPLE_RATE * 60) < SAMPLE_RATE * CHUNK_SECONDS:
+                print(f"[INFO] {download.received_seconds:.0f}秒 デコード済み ({time.monotonic() - started:.1f}秒経過)", flush=True)
+    finally:
+        download.close()
+    if download.error:
+        print(f"[ERROR] HLSのダウンロードに失敗: {download.error}", flush=True)
+        return 1
+    print(f"[OK] 保存しました: {output} ({download.received_seconds:.0f}秒)", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
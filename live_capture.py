@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブ配信の受信バッファと音声アーカイブモジュール
+
+- PcmRingBuffer: 受信した PCM を入れる固定長のリングバッファ。書き込み側（受信スレッド）は決して待たされず、
+  読み出し側（ライブ文字起こし・アーカイブ）はそれぞれのカーソルで読む。
+  読み出しが容量以上遅れた場合は古い音声が上書きされ、読み飛ばしたサンプル数が返る
+- LiveArchiver: リングバッファから完了したブロックを別スレッドで読み出し、一定時間ごとに区切った
+  Opus ファイルに書き出す（write-behind）。ディスクが詰まってもライブ文字起こしは止まらない。
+  欠落した区間は無音で埋めるため、アーカイブの時刻はライブ文字起こしの時刻と一致する
+- manifest.json: 区切ったファイル・配信時刻・実時刻（受信時刻）の対応表。
+  アーカイブのディレクトリ（または manifest.json）は main.py --local-file でそのまま文字起こしできる
+"""
+
+import collections
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+
+import numpy as np
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+RING_SECONDS = 120.0              # リングバッファの容量
+ARCHIVE_SEGMENT_SECONDS = 600.0   # アーカイブを区切る長さ
+ARCHIVE_BLOCK_SECONDS = 10.0      # アーカイブに書き出す単位
+ARCHIVE_BITRATE = "32k"
+ARCHIVE_MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='milliseconds')
+
+
+class PcmRingBuffer:
+    """書き込み側1つ・読み出し側複数の固定長 float32 PCM リングバッファ"""
+
+    def __init__(self, seconds: float = RING_SECONDS, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.capacity = int(seconds * sample_rate)
+        self.data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0  # 書き込んだ総サンプル数
+        self.closed = False
+        self._times: "collections.deque[Tuple[int, float]]" = collections.deque(maxlen=4096)
+        self._cond = threading.Condition()
+
+    def write(self, pcm: np.ndarray):
+        """PCMを追加（読み出し側を待たない）"""
+        total = len(pcm)
+        pcm = pcm[-self.capacity:]
+        with self._cond:
+            if self.closed:
+                return
+            start = (self.written + total - len(pcm)) % self.capacity
+            first = min(len(pcm), self.capacity - start)
+            self.data[start:start + first] = pcm[:first]
+            self.data[:len(pcm) - first] = pcm[first:]
+            self.written += total
+            self._times.append((self.written, time.time()))
+            self._cond.notify_all()
+
+    def close(self):
+        """書き込み終了（読み出し側は残りを読み切ると None を受け取る）"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read(
+        self,
+        cursor: int,
+        min_samples: int = 1,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Optional[np.ndarray], int, int]:
+        """
+        cursor 以降に書き込まれたPCMを読み出す
+
+        min_samples 溜まるか、書き込みが終わるまで待つ（timeout 秒で諦める）。
+
+        Returns:
+            (PCM、読めるものがなければNone, 新しいカーソル, 上書きされて読み飛ばしたサンプル数)
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.written - cursor >= min_samples or self.closed, timeout=timeout,
+            )
+            lost = max(0, self.written - self.capacity - cursor)
+            cursor += lost
+            end = self.written
+            if end <= cursor:
+                return None, cursor, lost
+            start = cursor % self.capacity
+            count = end - cursor
+            if start + count <= self.capacity:
+                pcm = self.data[start:start + count].copy()
+            else:
+                pcm = np.concatenate([self.data[start:], self.data[:start + count - self.capacity]])
+            return pcm, end, lost
+
+    def wall_clock(self, position: int) -> float:
+        """サンプル位置を受信した実時刻（UNIX時間）の推定値"""
+        with self._cond:
+            times = list(self._times)
+        for end, timestamp in times:
+            if end >= position:
+                return timestamp - (end - position) / self.sample_rate
+        if times:
+            end, timestamp = times[-1]
+            return timestamp + (position - end) / self.sample_rate
+        return time.time()
+
+
+class LiveArchiver:
+    """リングバッファの音声を区切った Opus ファイルに書き出すバックグラウンドライター"""
+
+    def __init__(
+        self,
+        ring: PcmRingBuffer,
+        converter,
+        archive_dir: str,
+        source: str = "",
+        segment_seconds: float = ARCHIVE_SEGMENT_SECONDS,
+        block_seconds: float = ARCHIVE_BLOCK_SECONDS,
+        bitrate: str = ARCHIVE_BITRATE,
+    ):
+        """
+        Args:
+            ring: 受信中の配信のリングバッファ
+            converter: AudioConverter
+            archive_dir: 書き出し先ディレクトリ
+            source: 配信のURL（manifest に記録）
+            segment_seconds: ファイルを区切る長さ（秒）
+            block_seconds: 書き出す単位（秒）
+            bitrate: Opus のビットレート
+        """
+        self.ring = ring
+        self.converter = converter
+        self.archive_dir = Path(archive_dir)
+        self.sample_rate = ring.sample_rate
+        self.segment_samples = int(segment_seconds * self.sample_rate)
+        self.block_samples = int(block_seconds * self.sample_rate)
+        self.bitrate = bitrate
+        self.error: Optional[BaseException] = None
+        self.samples = 0  # 書き出した総サンプル数（欠落区間の無音を含む）
+        self._encoder = None
+        self._segment_start = 0
+        self.manifest: Dict = {
+            'version': MANIFEST_VERSION,
+            'source': source,
+            'sample_rate': self.sample_rate,
+            'started_at': None,
+            'duration': 0.0,
+            'segments': [],
+            'marks': [],
+            'gaps': [],
+        }
+        self._thread = threading.Thread(target=self._run, name="live-archiver", daemon=True)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.archive_dir / ARCHIVE_MANIFEST
+
+    def start(self):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> Path:
+        """書き込みが終わった後、残りを書き出し終えるまで待つ"""
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[WARNING] 音声アーカイブの書き出しが終わっていません: {self.archive_dir}", flush=True)
+        elif self.error is None:
+            print(f"[OK] 音声アーカイブ保存: {self.archive_dir} ({self.samples / self.sample_rate:.0f}秒, "
+                  f"{len(self.manifest['segments'])}ファイル)", flush=True)
+        return self.manifest_path
+
+    def _run(self):
+        cursor = 0
+        try:
+            while True:
+                pcm, cursor, lost = self.ring.read(cursor, min_samples=self.block_samples)
+                if lost:
+                    # 書き出しが遅れて上書きされた区間は無音で埋め、時刻をずらさない
+                    print(f"[WARNING] 音声アーカイブの書き出しが遅れ、{lost / self.sample_rate:.1f}秒分を欠落しました",
+                          flush=True)
+                    self.manifest['gaps'].append({
+                        'start': self.samples / self.sample_rate,
+                        'duration': lost / self.sample_rate,
+                    })
+                    position = cursor - (len(pcm) if pcm is not None else 0) - lost
+                    while lost:
+                        silence = min(lost, self.block_samples)
+                        self._write(np.zeros(silence, dtype=np.float32), position)
+                        position += silence
+                        lost -= silence
+                if pcm is None:
+                    break
+                self._write(pcm, cursor - len(pcm))
+                self._save_manifest()
+        except Exception as e:
+            self.error = e
+            print(f"[WARNING] 音声アーカイブの書き出しを中止: {e}", flush=True)
+        finally:
+            try:
+                self._close_segment()
+            except Exception as e:
+                self.error = self.error or e
+            self._save_manifest()
+
+    def _write(self, pcm: np.ndarray, position: int):
+        """position（リングバッファ上の位置）から始まるPCMをアーカイブに追加"""
+        wall_clock = self.ring.wall_clock(position)
+        if self.manifest['started_at'] is None:
+            self.manifest['started_at'] = _isoformat(wall_clock - self.samples / self.sample_rate)
+
+        while len(pcm):
+            if self._encoder is None:
+                self._open_segment()
+            room = self.segment_samples - (self.samples - self._segment_start)
+            part, pcm = pcm[:room], pcm[room:]
+            self.manifest['marks'].append({
+                'time': self.samples / self.sample_rate,
+                'segment': len(self.manifest['segments']) - 1,
+                'offset': (self.samples - self._segment_start) / self.sample_rate,
+                'wall_clock': _isoformat(wall_clock),
+            })
+            pcm16 = np.clip(part * 32768.0, -32768, 32767).astype(np.int16)
+            self._encoder.stdin.write(pcm16.tobytes())
+            self.samples += len(part)
+            wall_clock += len(part) / self.sample_rate
+            self.manifest['segments'][-1]['duration'] = (self.samples - self._segment_start) / self.sample_rate
+            self.manifest['duration'] = self.samples / self.sample_rate
+            if self.samples - self._segment_start >= self.segment_samples:
+                self._close_segment()
+
+    def _open_segment(self):
+        index = len(self.manifest['segments'])
+        name = f"part_{index:04d}.opus"
+        self._encoder = self.converter.open_pcm_encoder(
+            str(self.archive_dir / name), self.sample_rate, codec="libopus", bitrate=self.bitrate,
+        )
+        self._segment_start = self.samples
+        self.manifest['segments'].append({
+            'file': name,
+            'start': self.samples / self.sample_rate,
+            'duration': 0.0,
+        })
+
+    def _close_segment(self):
+        if self._encoder is None:
+            return
+        encoder, self._encoder = self._encoder, None
+        try:
+            encoder.stdin.close()
+        finally:
+            encoder.wait()
+        if encoder.returncode != 0:
+            raise RuntimeError(f"ffmpegエンコードエラー: 終了コード {encoder.returncode}")
+
+    def _save_manifest(self):
+        """manifest.json を書き換える（途中で落ちても壊れないよう一時ファイルから置き換える）"""
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"[WARNING] アーカイブの manifest を保存できません: {e}", flush=True)
+
+
+def find_manifest(path: str) -> Optional[Path]:
+    """アーカイブのディレクトリまたは manifest.json なら manifest のパスを返す"""
+    path = Path(path)
+    if path.is_dir() and (path / ARCHIVE_MANIFEST).exists():
+        return path / ARCHIVE_MANIFEST
+    if path.name == ARCHIVE_MANIFEST and path.exists():
+        return path
+    return None
+
+
+def join_archive(manifest_path: Path, output_file: str, converter) -> Optional[str]:
+    """
+    アーカイブの Opus ファイルを連結して1つのMP3にする（オフラインでの再文字起こし用）
+
+    Returns:
+        出力ファイルのパス、失敗時はNone
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    files = [str(manifest_path.parent / seg['file']) for seg in manifest.get('segments', [])]
+    files = [f for f in files if Path(f).exists()]
+    if not files:
+        print(f"[ERROR] アーカイブに音声ファイルがありません: {manifest_path.parent}", flush=True)
+        return None
+    if manifest.get('gaps'):
+        total = sum(gap['duration'] for gap in manifest['gaps'])
+        print(f"[WARNING] アーカイブには欠落区間（計{total:.1f}秒, 無音）があります", flush=True)
+    return converter.concat_audio(files, output_file)
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+    from audio_converter import AudioConverter
+
+    parser = argparse.ArgumentParser(description="ライブ配信の音声アーカイブを1つのMP3に連結")
+    parser.add_argument("archive", help="アーカイブのディレクトリまたは manifest.json")
+    parser.add_argument("-o", "--output", default=None, help="出力ファイル（デフォルト: <ディレクトリ名>.mp3）")
+    args = parser.parse_args()
+
+    manifest_path = find_manifest(args.archive)
+    if manifest_path is None:
+        print(f"[ERROR] manifest.json が見つかりません: {args.archive}")
+        return 1
+    output_file = args.output or str(manifest_path.parent.with_suffix('.mp3'))
+    return 0 if join_archive(manifest_path, output_file, AudioConverter()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
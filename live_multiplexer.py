@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数のライブ配信の同時文字起こしモジュール
+複数の配信（Instagram Live, X Spaces, HLS/DASH 等）を1つのプロセス・1つのモデルで受信しながら文字起こしする
+
+- 配信ごとに受信スレッドと未確定バッファ（agreement 方式）を持つ
+- デコードできる状態の配信のバッファを、faster-whisper の BatchedInferencePipeline で
+  1回のエンコーダー・デコーダー呼び出しにまとめてデコードする
+- 最も長く待っている配信から順にデコードし（EDF: 全配信で目標遅延が同じため）、
+  デコード待ちが目標遅延を超えたらデコード間隔を広げて1回のバッチに多くの配信をまとめる
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Callable
+
+import numpy as np
+
+from live_capture import LiveArchiver
+from live_transcriber import (
+    SAMPLE_RATE,
+    STEP_SECONDS,
+    LIVE_VAD_PARAMETERS,
+    LiveOutput,
+    LocalAgreementTranscriber,
+    StreamReader,
+    resolve_stream,
+)
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+TARGET_LATENCY = 5.0       # 受信してからデコードするまでの目標遅延（秒）
+MAX_BATCH = 8              # 1回のバッチでデコードする配信の最大数
+POLL_INTERVAL = 0.05
+
+
+class BatchedWindowDecoder:
+    """
+    複数の配信の未確定バッファを1回のバッチデコードにまとめる
+
+    各バッファの発話区間を VAD で求め、最初の発話の開始から最後の発話の終了までを1つのクリップとして
+    （バッファは MAX_BUFFER 秒以下なので Whisper の30秒の窓に収まる）、全バッファを連結した音声の
+    clip_timestamps として BatchedInferencePipeline に渡す。結果のセグメントは元のバッファごとに振り分け、
+    時刻をバッファ先頭からの秒数に戻す。
+    BatchedInferencePipeline はバッチ全体で1つのプロンプトしか使えないため、
+    配信ごとの確定済みテキストはプロンプトに使わない。
+    """
+
+    def __init__(self, transcriber, max_batch: int = MAX_BATCH):
+        """
+        Args:
+            transcriber: モデル読み込み済みの FasterWhisperTranscriber
+            max_batch: 1回のエンコーダー・デコーダー呼び出しでまとめるクリップの最大数
+        """
+        from faster_whisper import BatchedInferencePipeline
+
+        self.transcriber = transcriber
+        self.pipeline = BatchedInferencePipeline(model=transcriber.model)
+        self.max_batch = max_batch
+        self.decode_count = 0
+        self.decode_seconds = 0.0
+
+        options = transcriber._decode_options()
+        self.vad_parameters = dict(options.pop('vad_parameters', {}), **LIVE_VAD_PARAMETERS)
+        options.pop('vad_filter', None)
+        options.pop('condition_on_previous_text', None)
+        options['word_timestamps'] = True
+        self.options = options
+
+    def decode(self, buffers: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Args:
+            buffers: 配信ごとの未確定バッファ
+
+        Returns:
+            バッファごとのセグメント（時刻はバッファ先頭からの秒数）
+        """
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        vad_options = VadOptions(**self.vad_parameters)
+        offsets = []
+        clips = []
+        position = 0
+        for buffer in buffers:
+            offsets.append(position)
+            if not len(buffer):
+                continue
+            regions = get_speech_timestamps(buffer, vad_options)
+            if regions:
+                # 発話区間ごとではなくバッファごとに1クリップ（バッチの大きさ = 発話のある配信の数）
+                clips.append({'start': position + regions[0]['start'], 'end': position + regions[-1]['end']})
+            position += len(buffer)
+
+        results: List[List[Dict]] = [[] for _ in buffers]
+        if not clips:
+            return results
+
+        started = time.perf_counter()
+        segments, _ = self.pipeline.transcribe(
+            np.concatenate(buffers),
+            language=self.transcriber.language,
+            vad_filter=False,
+            clip_timestamps=clips,
+            batch_size=min(len(clips), self.max_batch),
+            **self.options,
+        )
+        for seg in segments:
+            seg = self.transcriber._segment_dict(seg)
+            if not seg['text'].strip():
+                continue
+            middle = (seg['start'] + seg['end']) / 2 * SAMPLE_RATE
+            index = max(i for i, offset in enumerate(offsets) if offset <= middle)
+            shift = offsets[index] / SAMPLE_RATE
+            seg['start'] = max(0.0, seg['start'] - shift)
+            seg['end'] = max(seg['start'], seg['end'] - shift)
+            for word in seg.get('words') or ():
+                word['start'] -= shift
+                word['end'] -= shift
+            results[index].append(seg)
+
+        self.decode_count += 1
+        self.decode_seconds += time.perf_counter() - started
+        return results
+
+
+class LiveStream:
+    """多重化する配信1本分の受信・確定・出力の状態"""
+
+    def __init__(
+        self,
+        url: str,
+        stream_url: str,
+        input_options: List[str],
+        transcriber,
+        converter,
+        output_dir: Path,
+        formats: List[str],
+        label: str,
+        archive: bool = False,
+        on_event=None,
+    ):
+        self.url = url
+        self.label = label
+        base_name = f"live_{label}_{time.strftime('%Y%m%d_%H%M%S')}"
+        self.reader = StreamReader(converter, stream_url, input_options)
+        self.live = LocalAgreementTranscriber(transcriber)
+        self.output = LiveOutput(output_dir, base_name, formats, label=label, on_event=on_event)
+        self.archiver = None
+        if archive:
+            self.archiver = LiveArchiver(
+                self.reader.ring, converter, str(output_dir / f"{base_name}_archive"), source=url,
+            )
+        self.waiting_since: Optional[float] = None  # 未デコードの音声を最初に受け取った時刻
+        self.lags: List[float] = []
+        self.ended = False
+        self.done = False
+
+    def start(self):
+        if self.archiver:
+            self.archiver.start()
+        self.reader.start()
+
+    def poll(self, now: float):
+        """受信済みのPCMをバッファに移す"""
+        pcm, lost, ended = self.reader.drain()
+        if lost:
+            self.live.skip(lost)
+        if pcm is not None and len(pcm):
+            if self.waiting_since is None:
+                self.waiting_since = now
+            self.live.append(pcm)
+        if ended:
+            self.ended = True
+
+    def stop(self):
+        self.reader.stop()
+        self.ended = True
+
+    @property
+    def ready(self) -> bool:
+        return self.live.ready or (self.ended and not self.done)
+
+    def update(self, segments: List[Dict], now: float):
+        """バッチデコードの結果を反映"""
+        if self.waiting_since is not None:
+            self.lags.append(now - self.waiting_since)
+            self.waiting_since = None
+        self.output.emit(self.live.update(segments, final=self.ended))
+        self.output.partial(self.live.partial_text, self.live.received_seconds)
+        self.output.stats(
+            received=self.live.received_seconds,
+            backlog=self.reader.backlog_seconds,
+            step=self.live.step,
+        )
+        if self.ended:
+            self.done = True
+
+
+class LiveMultiplexer:
+    """複数の配信のデコードを1つのモデルにまとめるスケジューラ"""
+
+    def __init__(
+        self,
+        transcriber,
+        target_latency: float = TARGET_LATENCY,
+        max_batch: int = MAX_BATCH,
+    ):
+        """
+        Args:
+            transcriber: モデル読み込み済みの FasterWhisperTranscriber
+            target_latency: 受信してからデコードするまでの目標遅延（秒）
+            max_batch: 1回のバッチでデコードする配信の最大数
+        """
+        self.decoder = BatchedWindowDecoder(transcriber, max_batch=max_batch)
+        self.target_latency = target_latency
+        self.max_batch = max_batch
+        self.step = STEP_SECONDS
+        self.streams: List[LiveStream] = []
+        self._last_warning = 0.0
+
+    def run(self, max_duration: Optional[float] = None):
+        """全ての配信が終わるまで（Ctrl+C・max_duration 経過でも終了）デコードを続ける"""
+        for stream in self.streams:
+            stream.start()
+        try:
+            while not all(stream.done for stream in self.streams):
+                now = time.monotonic()
+                for stream in self.streams:
+                    if stream.done:
+                        continue
+                    stream.poll(now)
+                    if max_duration and stream.live.received_seconds >= max_duration:
+                        stream.stop()
+                if not self._decode_next():
+                    time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            print("\n[INFO] 中断しました。ここまでの結果を保存します", flush=True)
+            for stream in self.streams:
+                if not stream.done:
+                    stream.stop()
+            while self._decode_next():
+                pass
+
+    def _decode_next(self) -> bool:
+        """デコード待ちが最も長い配信から max_batch 本をまとめてデコード"""
+        ready = [stream for stream in self.streams if not stream.done and stream.ready]
+        if not ready:
+            return False
+        ready.sort(key=lambda stream: stream.waiting_since if stream.waiting_since is not None else float('inf'))
+        batch = ready[:self.max_batch]
+
+        results = self.decoder.decode([stream.live.buffer for stream in batch])
+        now = time.monotonic()
+        worst = 0.0
+        for stream, segments in zip(batch, results):
+            if stream.waiting_since is not None:
+                worst = max(worst, now - stream.waiting_since)
+            stream.update(segments, now)
+        self._adapt(worst, waiting=len(ready) - len(batch))
+        return True
+
+    def _adapt(self, worst_lag: float, waiting: int):
+        """
+        デコード間隔を調整する
+
+        目標遅延を超えたら間隔を広げてデコード回数を減らし（1回のバッチに多くの配信が入る）、
+        十分余裕があれば STEP_SECONDS まで戻す。
+        """
+        max_step = max(STEP_SECONDS, self.target_latency / 2)
+        if worst_lag > self.target_latency:
+            self.step = min(max_step, self.step * 1.5)
+            if self.step >= max_step and time.monotonic() - self._last_warning > 30:
+                self._last_warning = time.monotonic()
+                print(f"[WARNING] デコード待ちが目標遅延を超えています（{worst_lag:.1f}秒, 待機中の配信 {waiting}本）。"
+                      "配信数を減らすか、より軽いモデルを検討してください", flush=True)
+        elif worst_lag < self.target_latency / 2:
+            self.step = max(STEP_SECONDS, self.step / 1.25)
+        for stream in self.streams:
+            stream.live.step = self.step
+
+
+def transcribe_live_multi(
+    urls: List[str],
+    transcriber,
+    output_dir: str,
+    formats: Optional[List[str]] = None,
+    max_duration: Optional[float] = None,
+    converter=None,
+    target_latency: float = TARGET_LATENCY,
+    max_batch: int = MAX_BATCH,
+    archive: bool = False,
+    on_event: Optional[Callable[[str, Dict], None]] = None,
+) -> Optional[Dict[str, object]]:
+    """
+    複数のライブ配信を同時に受信しながら文字起こしする
+
+    Args:
+        urls: 配信ページまたは .m3u8 / .mpd のURL
+        transcriber: FasterWhisperTranscriber（全配信で共有）
+        output_dir: 出力ディレクトリ
+        formats: 出力形式（transcript_writers.WRITERS のキー）
+        max_duration: 配信ごとに受信する最大秒数（Noneで配信終了まで）
+        converter: AudioConverter（Noneの場合は作成）
+        target_latency: 受信してからデコードするまでの目標遅延（秒）
+        max_batch: 1回のバッチでデコードする配信の最大数
+        archive: 受信した音声を配信ごとに <出力名>_archive/ に Opus で保存する
+        on_event: イベントごとに呼ばれるコールバック（データの 'stream' に配信の識別子）
+
+    Returns:
+        配信の識別子 → TranscriptResult、全ての配信の解決に失敗した場合はNone
+    """
+    from audio_converter import AudioConverter
+    import transcript_writers
+
+    formats = list(formats or transcript_writers.DEFAULT_FORMATS)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    converter = converter or AudioConverter()
+
+    multiplexer = LiveMultiplexer(transcriber, target_latency=target_latency, max_batch=max_batch)
+    labels = set()
+    for url in urls:
+        try:
+            stream_url, input_options, name = resolve_stream(url)
+        except Exception as e:
+            print(f"[ERROR] 配信URLの解決に失敗: {url}: {e}", flush=True)
+            continue
+        label = name
+        index = 2
+        while label in labels:
+            label = f"{name}_{index}"
+            index += 1
+        labels.add(label)
+        multiplexer.streams.append(LiveStream(
+            url, stream_url, input_options, transcriber, converter, output_path, formats, label, archive, on_event,
+        ))
+    if not multiplexer.streams:
+        return None
+
+    print(f"[INFO] {len(multiplexer.streams)}本のライブ配信の文字起こしを開始", flush=True)
+    for stream in multiplexer.streams:
+        print(f"  [{stream.label}] {stream.url}", flush=True)
+    print("[INFO] 終了するには Ctrl+C を押してください", flush=True)
+    multiplexer.run(max_duration)
+
+    results = {}
+    for stream in multiplexer.streams:
+        if stream.reader.error:
+            print(f"[WARNING] [{stream.label}] 配信の受信が終了しました: {stream.reader.error}", flush=True)
+        results[stream.label] = stream.output.close()
+        if stream.archiver:
+            stream.archiver.close()
+        lags = stream.lags or [0.0]
+        print(f"[OK] [{stream.label}] {stream.live.received_seconds:.0f}秒受信, {len(stream.output)}セグメント, "
+              f"デコード待ち p90={np.percentile(lags, 90):.1f}秒", flush=True)
+
+    decoder = multiplexer.decoder
+    print(f"\n[OK] ライブ文字起こし終了: バッチデコード {decoder.decode_count}回, "
+          f"計 {decoder.decode_seconds:.0f}秒", flush=True)
+    return results
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+    import transcript_writers
+    from transcriber import FasterWhisperTranscriber
+
+    parser = argparse.ArgumentParser(description="複数のライブ配信の同時文字起こし")
+    parser.add_argument("urls", nargs="+", help="配信ページ、.m3u8 / .mpd のURL、またはファイル")
+    parser.add_argument("-m", "--model", default="large-v3-turbo", help="faster-whisper のモデル名")
+    parser.add_argument("-l", "--language", default="ja", help="言語コード")
+    parser.add_argument("-o", "--output", default=".", help="出力ディレクトリ")
+    parser.add_argument("-t", "--duration", type=float, default=None, help="配信ごとに受信する最大秒数")
+    parser.add_argument("--target-latency", type=float, default=TARGET_LATENCY,
+                        help=f"受信してからデコードするまでの目標遅延（秒, デフォルト: {TARGET_LATENCY}）")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help=f"1回のバッチでデコードする配信の最大数（デフォルト: {MAX_BATCH}）")
+    parser.add_argument("--archive", action="store_true", help="受信した音声を配信ごとに Opus で保存する")
+    parser.add_argument("--serve", type=int, metavar="PORT", default=None,
+                        help="途中経過を http://127.0.0.1:PORT/ から Server-Sent Events で配信する")
+    parser.add_argument(
+        "--speed",
+        choices=list(FasterWhisperTranscriber.SPEED_PROFILES),
+        default="fast",
+        help="デコード速度プリセット（デフォルト: fast）",
+    )
+    parser.add_argument(
+        "--formats",
+        type=transcript_writers.parse_formats,
+        default=None,
+        help=f"出力形式をカンマ区切りで指定 ({', '.join(transcript_writers.WRITERS)}, all)",
+    )
+
+    args = parser.parse_args()
+
+    server = None
+    if args.serve is not None:
+        from live_server import LiveEventHub, LiveEventServer
+        server = LiveEventServer(LiveEventHub(), args.serve)
+        server.start()
+
+    try:
+        with FasterWhisperTranscriber(args.model, args.language, speed_profile=args.speed) as transcriber:
+            results = transcribe_live_multi(
+                args.urls, transcriber, args.output, args.formats, args.duration,
+                target_latency=args.target_latency, max_batch=args.max_batch, archive=args.archive,
+                on_event=server.hub.publish if server else None,
+            )
+    finally:
+        if server:
+            server.close()
+    return 0 if results is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブ文字起こしのイベント配信サーバーモジュール
+ライブ文字起こしの途中経過をローカルのHTTPサーバーから Server-Sent Events で配信する
+
+- GET /events      : イベントストリーム（text/event-stream）
+    segment  確定したセグメント
+    partial  未確定の仮説（新しいもので置き換わる）
+    speaker  話者の切り替わり（セグメントに話者ラベルがある場合）
+    stats    受信秒数・デコード待ち・計算時間など
+    end      文字起こし終了
+- GET /transcript  : 確定済みのセグメント（JSON）
+- GET /stats       : 最新の stats（JSON）
+- GET /            : ブラウザ用の簡易ビューア
+
+CORS ヘッダーは付けない（ブラウザで開いている他のサイトから文字起こしを読み取れないように。
+同梱のビューアは同一オリジンなので不要）。
+
+発行側（デコーダー）は決して待たない。クライアントごとのキューが溢れた場合は古い partial / stats から捨て、
+確定イベントまで溢れたクライアントは切断する（EventSource は Last-Event-ID 付きで再接続し、
+取りこぼした確定イベントを受け取り直す）。
+"""
+
+import collections
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+DEFAULT_HOST = "127.0.0.1"
+MAX_CLIENT_QUEUE = 256     # クライアントごとに溜める最大イベント数
+KEEPALIVE_SECONDS = 15.0
+RETRY_MILLISECONDS = 3000
+PERSISTENT_EVENTS = ('segment', 'speaker', 'end')   # 再接続時に再送するイベント
+
+
+class _Subscriber:
+    """1クライアント分の送信待ちイベント"""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self.events: "collections.deque[Tuple[int, str, str]]" = collections.deque()
+        self.overflowed = False
+        self.dropped = 0
+        self._cond = threading.Condition()
+
+    def put(self, item: Tuple[int, str, str]):
+        """イベントを追加（発行側を待たせない）"""
+        with self._cond:
+            if len(self.events) >= self.max_queue:
+                # 新しいもので置き換わる partial / stats から捨てる
+                for i, (_, event, _) in enumerate(self.events):
+                    if event not in PERSISTENT_EVENTS:
+                        del self.events[i]
+                        self.dropped += 1
+                        break
+                else:
+                    self.overflowed = True
+                    self._cond.notify()
+                    return
+            self.events.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> List[Tuple[int, str, str]]:
+        """溜まっているイベントを全て取り出す（なければ timeout 秒待つ）"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.events or self.overflowed, timeout=timeout)
+            events = list(self.events)
+            self.events.clear()
+            return events
+
+
+class LiveEventHub:
+    """ライブ文字起こしのイベントを購読中のクライアントに配信する"""
+
+    def __init__(self, max_queue: int = MAX_CLIENT_QUEUE):
+        self.max_queue = max_queue
+        self.history: List[Tuple[int, str, str]] = []   # 確定イベント（再接続・途中参加用）
+        self.segments: List[Dict] = []
+        self.latest: Dict[Tuple[str, Optional[str]], Tuple[int, str, str]] = {}  # 最新の partial / stats
+        self._clients: List[_Subscriber] = []
+        self._speakers: Dict[Optional[str], Optional[str]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def publish(self, event: str, data: Dict):
+        """
+        イベントを発行
+
+        Args:
+            event: イベント名（segment / partial / stats / end）
+            data: イベントの内容（複数の配信を扱う場合は 'stream' に配信の識別子）
+        """
+        with self._lock:
+            if event == 'segment':
+                stream = data.get('stream')
+                speaker = data.get('speaker')
+                if speaker is not None and speaker != self._speakers.get(stream):
+                    self._speakers[stream] = speaker
+                    self._dispatch('speaker', {'stream': stream, 'speaker': speaker, 'start': data.get('start')})
+                self.segments.append(data)
+            if event == 'stats':
+                data = dict(data, clients=len(self._clients))
+            self._dispatch(event, data)
+
+    def _dispatch(self, event: str, data: Dict):
+        item = (self._next_id, event, json.dumps(data, ensure_ascii=False, default=float))
+        self._next_id += 1
+        if event in PERSISTENT_EVENTS:
+            self.history.append(item)
+        else:
+            self.latest[(event, data.get('stream'))] = item
+        for client in self._clients:
+            client.put(item)
+
+    def subscribe(self, last_event_id: int = 0) -> _Subscriber:
+        """購読を開始（last_event_id より後の確定イベントと最新の partial / stats を先に送る）"""
+        client = _Subscriber(self.max_queue)
+        with self._lock:
+            replay = [item for item in self.history if item[0] > last_event_id]
+            replay += [item for item in self.latest.values() if item[0] > last_event_id]
+            for item in sorted(replay):
+                client.events.append(item)
+            self._clients.append(client)
+        return client
+
+    def unsubscribe(self, client: _Subscriber):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def transcript(self) -> List[Dict]:
+        with self._lock:
+            return list(self.segments)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latest = [json.loads(payload) for (event, _), (_, _, payload) in self.latest.items() if event == 'stats']
+        return {'clients': self.client_count, 'segments': len(self.segments), 'streams': latest}
+
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html lang="ja"><head><meta charset="utf-8"><title>ライブ文字起こし</title>
+<style>body{font-family:sans-serif;max-width:48em;margin:1em auto}#partial{color:#888}#stats{font-size:.8em;color:#666}
+.t{color:#999;font-size:.8em;margin-right:.5em}</style></head>
+<body><div id="stats"></div><div id="log"></div><p id="partial"></p>
+<script>
+const log = document.getElementById('log'), partial = document.getElementById('partial');
+const fmt = s => new Date(s * 1000).toISOString().substr(11, 8);
+const es = new EventSource('/events');
+es.addEventListener('segment', e => {
+  const d = JSON.parse(e.data), p = document.createElement('p');
+  p.innerHTML = `<span class="t">${fmt(d.start)}${d.stream ? ' ' + d.stream : ''}</span>`;
+  p.append(d.text); log.append(p); partial.textContent = ''; p.scrollIntoView();
+});
+es.addEventListener('partial', e => { partial.textContent = JSON.parse(e.data).text; });
+es.addEventListener('stats', e => {
+  const d = JSON.parse(e.data);
+  document.getElementById('stats').textContent = `受信 ${d.received.toFixed(0)}秒 / 遅れ ${d.backlog.toFixed(1)}秒 / 視聴 ${d.clients}`;
+});
+es.addEventListener('end', () => { partial.textContent = '（終了）'; es.close(); });
+</script></body></html>
+"""
+
+
+class _EventRequestHandler(BaseHTTPRequestHandler):
+    server_version = "LiveTranscript/1.0"
+    timeout = 60  # 受信しないクライアントへの書き込みが詰まったら切断する
+
+    def log_message(self, format, *args):
+        pass  # アクセスログは出さない（標準出力は [SEGMENT] 行などに使う）
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        hub: LiveEventHub = self.server.hub
+        if url.path == '/events':
+            self._stream_events(hub, url)
+        elif url.path == '/transcript':
+            self._send_json(hub.transcript())
+        elif url.path == '/stats':
+            self._send_json(hub.stats())
+        elif url.path == '/':
+            self._send_body(VIEWER_HTML.encode('utf-8'), 'text/html; charset=utf-8')
+        else:
+            self.send_error(404)
+
+    def _send_json(self, data):
+        self._send_body(json.dumps(data, ensure_ascii=False, default=float).encode('utf-8'),
+                        'application/json; charset=utf-8')
+
+    def _send_body(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, hub: LiveEventHub, url):
+        last_event_id = self.headers.get('Last-Event-ID') or parse_qs(url.query).get('last_event_id', ['0'])[0]
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            last_event_id = 0
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        client = hub.subscribe(last_event_id)
+        try:
+            self.wfile.write(f"retry: {RETRY_MILLISECONDS}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            while True:
+                events = client.get(KEEPALIVE_SECONDS)
+                if not events and not client.overflowed:
+                    self.wfile.write(b": ping\n\n")
+                for event_id, event, payload in events:
+                    self.wfile.write(f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if client.overflowed or any(event == 'end' for _, event, _ in events):
+                    break  # 溢れたクライアントは切断（再接続すると確定イベントを再送する）
+        except OSError:
+            pass  # 切断・タイムアウト
+        finally:
+            hub.unsubscribe(client)
+
+
+class LiveEventServer:
+    """LiveEventHub のイベントを配信するローカルHTTPサーバー（バックグラウンドスレッドで動作）"""
+
+    def __init__(self, hub: LiveEventHub, port: int, host: str = DEFAULT_HOST):
+        self.hub = hub
+        self.httpd = ThreadingHTTPServer((host, port), _EventRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.hub = hub
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="live-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        print(f"[INFO] ライブ文字起こしを配信中: {self.url} (イベント: {self.url}events)", flush=True)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    """テスト用のメイン関数（ダミーのイベントを配信）"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="ライブ文字起こしのイベント配信サーバー（動作確認用）")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="ポート番号")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="待ち受けるアドレス")
+    args = parser.parse_args()
+
+    hub = LiveEventHub()
+    server = LiveEventServer(hub, args.port, args.host)
+    server.start()
+    try:
+        for i in range(1000):
+            hub.publish('partial', {'text': f"テスト{i}", 'start': float(i)})
+            time.sleep(1.0)
+            hub.publish('segment', {'start': float(i), 'end': i + 1.0, 'text': f"テスト{i}。"})
+            hub.publish('stats', {'received': i + 1.0, 'backlog': 0.0})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hub.publish('end', {})
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
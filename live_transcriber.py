@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブ配信のリアルタイム文字起こしモジュール
+Instagram Live / YouTube Live などの HLS・DASH 配信を yt-dlp で解決し、ffmpeg で
+16kHz モノラルPCMとして受信しながら、直近の音声だけを faster-whisper でデコードする
+
+- 受信はスレッドで続け、デコードが遅れても配信の読み込みは止めない
+- 直近の未確定音声を STEP_SECONDS ごとにデコードし、確定したテキストだけを出力する
+  - agreement（デフォルト）: 連続する2回のデコード結果で一致した単語列を確定（LocalAgreement-2）。
+    バッファは確定済みの文末で切り詰め、確定したテキストを次のデコードのプロンプトにする
+  - pause: 後ろに音声が続いた（=言い終わった）セグメントから確定する
+- 確定したセグメントは標準出力（[SEGMENT] 行）とタイムスタンプ付きテキストに逐次書き出し、
+  配信終了・中断時に残りの出力形式をまとめて書き出す
+
+ローカルでの動作確認（ファイルをライブHLSとして配信）:
+    ffmpeg -re -i talk.mp3 -c:a aac -f hls -hls_time 2 -hls_list_size 6 -hls_flags delete_segments live/stream.m3u8
+    python -m http.server -d live 8000
+    python main.py --live http://localhost:8000/stream.m3u8
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Iterator, Tuple
+
+import numpy as np
+
+from live_capture import RING_SECONDS, LiveArchiver, PcmRingBuffer
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 0.5        # ffmpeg から読み込む単位
+STEP_SECONDS = 1.0         # 新しい音声がこれだけ溜まるごとにデコード
+MAX_WINDOW = 15.0          # 未確定の音声がこれを超えたら、最後のセグメント以外を強制的に確定
+COMMIT_MARGIN = 1.0        # 最後のセグメントの後にこれだけ音声が続いたら言い終わったとみなす
+KEEP_SILENCE = 1.0         # 発話がない場合も残しておく末尾の長さ（言いかけを切らないため）
+LAG_WARNING = 30.0         # デコード待ちの音声がこれを超えたら警告
+STATS_INTERVAL = 5.0       # on_event に stats を送る間隔（秒）
+
+# ライブ用のVAD設定（短いポーズで区切って早く確定させる）
+LIVE_VAD_PARAMETERS = {"min_silence_duration_ms": 500, "speech_pad_ms": 200}
+
+
+# ---------------------------------------------------------------------------
+# 配信の受信
+# ---------------------------------------------------------------------------
+def resolve_stream(url: str, require_live: bool = False) -> Tuple[str, List[str], str]:
+    """
+    配信ページのURLから ffmpeg に渡す配信URLを解決
+
+    .m3u8 / .mpd の直接指定やローカルファイルはそのまま使い、それ以外は yt-dlp で解決する。
+    require_live の場合、ライブ配信中でなければ RuntimeError（live_watcher の確認用）。
+
+    Returns:
+        (配信URL, ffmpeg の入力オプション, 出力ファイル名に使う識別子)
+    """
+    if os.path.exists(url) or re.search(r'\.(m3u8|mpd)(\?|$)', url):
+        name = re.sub(r'[^0-9A-Za-z_-]', '_', Path(url.split('?')[0]).stem) or "stream"
+        return url, _input_options(url, {}), name
+
+    import yt_dlp
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'quiet': True,
+        'no_warnings': True,
+        'noplaylist': True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    # 映像と音声が別フォーマットの場合は音声側を使う
+    stream = info
+    for fmt in info.get('requested_formats') or []:
+        if fmt.get('acodec') not in (None, 'none'):
+            stream = fmt
+            break
+    stream_url = stream.get('url') or stream.get('manifest_url')
+    if not stream_url:
+        raise RuntimeError("配信URLを取得できませんでした")
+
+    if not info.get('is_live'):
+        if require_live:
+            raise RuntimeError("ライブ配信中ではありません")
+        print("[WARNING] ライブ配信ではないようです。録画として先頭から文字起こしします", flush=True)
+    name = re.sub(r'[^0-9A-Za-z_-]', '_', str(info.get('id') or 'live'))
+    return stream_url, _input_options(stream_url, stream.get('http_headers') or info.get('http_headers') or {}), name
+
+
+def _input_options(stream_url: str, headers: Dict[str, str]) -> List[str]:
+    """HTTPヘッダーと再接続設定"""
+    options = []
+    if stream_url.startswith(('http://', 'https://')):
+        options += ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+    if headers:
+        options += ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+    return options
+
+
+class StreamReader:
+    """
+    ffmpeg の PCM 出力をスレッドで読み続けてリングバッファに書き込む
+
+    受信スレッドはデコードやアーカイブの書き出しを待たない。デコードが RING_SECONDS 以上遅れた場合は
+    古い音声が上書きされ、read() / drain() が読み飛ばしたサンプル数を返す。
+    """
+
+    def __init__(self, converter, stream_url: str, input_options: List[str]):
+        self.converter = converter
+        self.stream_url = stream_url
+        self.input_options = input_options
+        self.ring = PcmRingBuffer(RING_SECONDS, SAMPLE_RATE)
+        self.error: Optional[BaseException] = None
+        self._cursor = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-reader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """受信を止める（ffmpeg が次のチャンクを返すのを待たずに、読み出し側へ終了を伝える）"""
+        self._stop.set()
+        self.ring.close()
+
+    def _run(self):
+        try:
+            for chunk in self.converter.iter_pcm(
+                self.stream_url, SAMPLE_RATE, CHUNK_SECONDS, input_options=self.input_options,
+            ):
+                self.ring.write(chunk)
+                if self._stop.is_set():
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ring.close()
+
+    def read(self) -> Iterator[Tuple[np.ndarray, int]]:
+        """受信済みのPCMをまとめて (PCM, 読み飛ばしたサンプル数) として返す（配信が終わるまで）"""
+        while True:
+            pcm, self._cursor, lost = self.ring.read(self._cursor)
+            if pcm is None:
+                return
+            yield pcm, lost
+
+    def drain(self) -> Tuple[Optional[np.ndarray], int, bool]:
+        """
+        受信済みのPCMを待たずに取り出す（複数の配信を1スレッドで扱う場合）
+
+        Returns:
+            (PCM、受信済みのものがなければNone, 読み飛ばしたサンプル数, 配信が終わったか)
+        """
+        pcm, self._cursor, lost = self.ring.read(self._cursor, timeout=0)
+        ended = self.ring.closed and self._cursor >= self.ring.written
+        return pcm, lost, ended
+
+    @property
+    def backlog_seconds(self) -> float:
+        return (self.ring.written - self._cursor) / SAMPLE_RATE
+
+
+# ---------------------------------------------------------------------------
+# ローリングウィンドウのデコード
+# ---------------------------------------------------------------------------
+class LiveTranscriber:
+    """
+    受信したPCMを少しずつ受け取り、確定したセグメントを返す（pause 方式）
+
+    feed() に新しい音声を渡すと、STEP_SECONDS 分溜まるごとに未確定部分をデコードする。
+    セグメントの時刻は配信の受信開始からの秒数。
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        step: float = STEP_SECONDS,
+        max_window: float = MAX_WINDOW,
+    ):
+        """
+        Args:
+            transcriber: モデル読み込み済みの FasterWhisperTranscriber
+            step: デコード間隔（秒）
+            max_window: 未確定の音声の最大長（秒）
+        """
+        self.transcriber = transcriber
+        self.step = step
+        self.max_window = max_window
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_start = 0.0
+        self.received = 0
+        self.committed_text = ""
+        self.partial_text = ""     # 未確定の仮説（表示用）
+        self.decode_count = 0
+        self.decode_seconds = 0.0
+        self._pending = 0
+
+        self.options = transcriber._decode_options()
+        self.options['condition_on_previous_text'] = False
+        self.options['vad_parameters'] = dict(self.options.get('vad_parameters', {}), **LIVE_VAD_PARAMETERS)
+
+    @property
+    def received_seconds(self) -> float:
+        return self.received / SAMPLE_RATE
+
+    @property
+    def ready(self) -> bool:
+        """前回のデコードから step 秒分の音声が溜まったか"""
+        return self._pending >= self.step * SAMPLE_RATE
+
+    def append(self, pcm: np.ndarray):
+        """受信したPCMをバッファに追加（デコードはしない）"""
+        self.buffer = np.concatenate([self.buffer, pcm.astype(np.float32, copy=False)])
+        self.received += len(pcm)
+        self._pending += len(pcm)
+
+    def skip(self, samples: int):
+        """デコードが遅れて読み飛ばした音声の分だけ時刻を進める（未確定の音声は捨てる）"""
+        print(f"[WARNING] 文字起こしが遅れたため {samples / SAMPLE_RATE:.1f}秒分の音声を読み飛ばしました", flush=True)
+        self.received += samples
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_start = self.received_seconds
+        self._pending = 0
+
+    def feed(self, pcm: np.ndarray) -> List[Dict]:
+        """受信したPCMを追加し、確定したセグメントを返す"""
+        self.append(pcm)
+        if not self.ready:
+            return []
+        return self.update(self._decode(), final=False)
+
+    def finish(self) -> List[Dict]:
+        """配信終了時に残りを全て確定する"""
+        if not len(self.buffer):
+            return []
+        return self.update(self._decode(), final=True)
+
+    def prompt(self) -> str:
+        """次のデコードに渡すプロンプト"""
+        return self.committed_text[-self.transcriber.RESUME_PROMPT_CHARS:]
+
+    def _decode(self) -> List[Dict]:
+        """バッファ全体をデコード（時刻はバッファ先頭からの秒数）"""
+        options = dict(self.options)
+        prompt = self.prompt()
+        if prompt:
+            options['initial_prompt'] = prompt
+        started = time.perf_counter()
+        segments, _ = self.transcriber.model.transcribe(
+            self.buffer, language=self.transcriber.language, **options,
+        )
+        segments = [
+            seg for seg in (self.transcriber._segment_dict(s) for s in segments)
+            if seg['text'].strip()
+        ]
+        self.decode_count += 1
+        self.decode_seconds += time.perf_counter() - started
+        return segments
+
+    def update(self, segments: List[Dict], final: bool) -> List[Dict]:
+        """
+        バッファのデコード結果から確定できるセグメントを確定して返す
+
+        Args:
+            segments: バッファ全体のデコード結果（時刻はバッファ先頭からの秒数）
+            final: 配信終了（残りを全て確定する）
+        """
+        self._pending = 0
+        duration = len(self.buffer) / SAMPLE_RATE
+
+        if final:
+            committed = segments
+        elif segments and duration - segments[-1]['end'] >= COMMIT_MARGIN:
+            committed = segments
+        elif duration >= self.max_window:
+            committed = segments[:-1] or segments
+        else:
+            committed = segments[:-1]
+
+        if committed:
+            cut = committed[-1]['end']
+        elif not segments:
+            cut = max(0.0, duration - KEEP_SILENCE)
+        else:
+            cut = 0.0
+        self.partial_text = "".join(seg['text'] for seg in segments[len(committed):]).strip()
+        return self._commit(committed, cut)
+
+    def _to_stream_time(self, seg: Dict) -> Dict:
+        """バッファ先頭からの時刻 → 配信の受信開始からの時刻"""
+        offset = self.buffer_start
+        seg['start'] = max(seg['start'] + offset, self.buffer_start)
+        seg['end'] = max(seg['end'] + offset, seg['start'])
+        for word in seg.get('words') or ():
+            word['start'] += offset
+            word['end'] += offset
+        return seg
+
+    def _trim_buffer(self, cut: float):
+        """バッファ先頭から cut 秒までの音声を捨てる"""
+        cut_samples = min(len(self.buffer), max(0, int(cut * SAMPLE_RATE)))
+        self.buffer = self.buffer[cut_samples:]
+        self.buffer_start += cut_samples / SAMPLE_RATE
+
+    def _commit(self, segments: List[Dict], cut: float) -> List[Dict]:
+        """セグメントを配信の時刻に直して確定し、cut 秒までの音声を捨てる"""
+        committed = [self._to_stream_time(seg) for seg in segments]
+        for seg in committed:
+            self.committed_text += seg['text'].strip()
+        self._trim_buffer(cut)
+        return committed
+
+
+class LocalAgreementTranscriber(LiveTranscriber):
+    """
+    LocalAgreement-2 方式のストリーミングデコード（agreement 方式）
+
+    毎回バッファ全体を単語タイムスタンプ付きでデコードし、前回の仮説と先頭から一致した単語列だけを
+    確定する。ウィンドウの端で途切れた単語は次のデコードで結果が変わるため確定されない。
+    バッファが TRIM_SECONDS を超えたら確定済みの文末（セグメント末尾・句点）で切り詰め、
+    切り詰めた範囲の確定テキストを次のデコードのプロンプトにする。
+    """
+
+    TRIM_SECONDS = 10.0
+    MAX_BUFFER = 25.0          # バッファの上限（超えたら今回の仮説を確定し、それでも超える分は捨てる）
+    SENTENCE_END = ('。', '？', '！', '?', '!', '.')
+    MAX_NGRAM = 5              # 確定済みの末尾と重複して再認識された単語列を除く長さ
+    KEEP_WORDS = 50
+
+    def __init__(self, transcriber, step: float = STEP_SECONDS):
+        super().__init__(transcriber, step=step, max_window=self.MAX_BUFFER)
+        self.options['word_timestamps'] = True
+        self.previous: List[Dict] = []     # 前回の仮説のうち未確定の単語
+        self.committed: List[Dict] = []    # 確定した単語（直近 KEEP_WORDS 個）
+        self.committed_end = 0.0
+        self.prompt_text = ""              # バッファから外れた確定済みテキスト
+
+    def prompt(self) -> str:
+        return self.prompt_text[-self.transcriber.RESUME_PROMPT_CHARS:]
+
+    def skip(self, samples: int):
+        super().skip(samples)
+        self.previous = []
+        self.committed_end = self.buffer_start
+
+    @staticmethod
+    def _normalize(word: Dict) -> str:
+        return word['word'].strip().lower()
+
+    def _hypothesis(self, segments: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """デコード結果を (配信時刻のセグメント, 確定済み以降の単語) にする"""
+        segments = [self._to_stream_time(seg) for seg in segments]
+        words = [
+            w for seg in segments for w in seg.get('words') or ()
+            if w['end'] > self.committed_end + 0.05
+        ]
+
+        # 確定済みの末尾をもう一度認識した単語列（例: 切り詰め直後）を除く
+        if words and self.committed and words[0]['start'] - self.committed_end < 1.0:
+            for n in range(min(self.MAX_NGRAM, len(words), len(self.committed)), 0, -1):
+                tail = [self._normalize(w) for w in self.committed[-n:]]
+                if tail == [self._normalize(w) for w in words[:n]]:
+                    words = words[n:]
+                    break
+        return segments, words
+
+    def update(self, segments: List[Dict], final: bool) -> List[Dict]:
+        self._pending = 0
+        segments, words = self._hypothesis(segments)
+
+        if final or len(self.buffer) / SAMPLE_RATE > self.MAX_BUFFER:
+            # 配信終了、または仮説が一致しないまま上限を超えた（音楽・雑音など）: 今回の仮説を確定
+            agreed = words
+        else:
+            agreed = []
+            for previous, current in zip(self.previous, words):
+                if self._normalize(previous) != self._normalize(current):
+                    break
+                agreed.append(current)
+        self.previous = [] if final else words[len(agreed):]
+        self.partial_text = "".join(w['word'] for w in self.previous).strip()
+
+        committed = self._commit_words(agreed)
+        self._trim(segments, has_speech=bool(words))
+        return committed
+
+    def _commit_words(self, words: List[Dict]) -> List[Dict]:
+        """一致した単語列を1つのセグメントとして確定"""
+        if not words:
+            return []
+        self.committed = (self.committed + words)[-self.KEEP_WORDS:]
+        self.committed_end = words[-1]['end']
+        text = "".join(w['word'] for w in words).strip()
+        self.committed_text += text
+        return [{
+            'start': words[0]['start'],
+            'end': words[-1]['end'],
+            'text': text,
+            'words': words,
+        }]
+
+    def _trim(self, segments: List[Dict], has_speech: bool):
+        """確定済みの文末でバッファを切り詰める（MAX_BUFFER 秒を超えた分は必ず捨てる）"""
+        duration = len(self.buffer) / SAMPLE_RATE
+        cut = self.buffer_start
+        if not has_speech and not self.previous:
+            # 発話がない: 確定済みの末尾か、末尾 KEEP_SILENCE 秒を残して捨てる
+            cut = max(self.committed_end, self.buffer_start + duration - KEEP_SILENCE)
+        elif duration > self.TRIM_SECONDS:
+            boundaries = [seg['end'] for seg in segments if seg['end'] <= self.committed_end]
+            boundaries += [w['end'] for w in self.committed if w['word'].strip().endswith(self.SENTENCE_END)]
+            boundaries = [t for t in boundaries if t > self.buffer_start]
+            if boundaries:
+                cut = max(boundaries)
+            elif duration > self.MAX_BUFFER:
+                cut = self.committed_end
+        if duration > self.MAX_BUFFER:
+            # 区切りが見つからなくてもバッファを上限以下に保つ（デコード時間が伸び続けないように）
+            cut = max(cut, self.buffer_start + duration - self.MAX_BUFFER)
+
+        if cut <= self.buffer_start:
+            return
+        old_start = self.buffer_start
+        self._trim_buffer(cut - old_start)
+        self.prompt_text += "".join(
+            w['word'] for w in self.committed if old_start < w['end'] <= self.buffer_start
+        ).strip()
+
+
+POLICIES = {
+    "agreement": LocalAgreementTranscriber,
+    "pause": LiveTranscriber,
+}
+
+
+# ---------------------------------------------------------------------------
+# 実行
+# ---------------------------------------------------------------------------
+class LiveOutput:
+    """確定したセグメントを逐次書き出し、終了時に残りの出力形式をまとめて書き出す"""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        base_name: str,
+        formats: List[str],
+        on_segment: Optional[Callable[[Dict], None]] = None,
+        label: Optional[str] = None,
+        on_event: Optional[Callable[[str, Dict], None]] = None,
+    ):
+        """
+        Args:
+            output_dir: 出力ディレクトリ
+            base_name: 出力ファイル名（拡張子なし）
+            formats: 出力形式（transcript_writers.WRITERS のキー）
+            on_segment: 確定したセグメントごとに呼ばれるコールバック
+            label: [SEGMENT] 行に付ける配信の識別子（複数の配信を同時に扱う場合）
+            on_event: イベント（segment / partial / stats / end）ごとに呼ばれるコールバック（live_server 用）
+        """
+        from transcript_result import TranscriptResultBuilder
+        import transcript_writers
+
+        self.output_dir = output_dir
+        self.base_name = base_name
+        self.formats = formats
+        self.on_segment = on_segment
+        self.label = label
+        self.on_event = on_event
+        self.prefix = f"[SEGMENT] [{label}] " if label else "[SEGMENT] "
+        self._partial = ""
+        self._last_stats = 0.0
+        self.segments = TranscriptResultBuilder()
+        self.detailed_path = transcript_writers.output_file(output_dir, base_name, 'detailed')
+        self.detailed = open(self.detailed_path, 'w', encoding='utf-8') if 'detailed' in formats else None
+
+    def emit(self, new_segments: List[Dict]):
+        import transcript_writers
+
+        for seg in new_segments:
+            line = transcript_writers.format_detailed_line(seg)
+            print(f"{self.prefix}{line}", end="", flush=True)
+            if self.detailed:
+                self.detailed.write(line)
+                self.detailed.flush()
+            self.segments.append(seg)
+            if self.on_segment:
+                self.on_segment(seg)
+            self.publish('segment', seg)
+            self._partial = ""
+
+    def publish(self, event: str, data: Dict):
+        """on_event にイベントを送る（配信の識別子を付ける）"""
+        if self.on_event:
+            self.on_event(event, dict(data, stream=self.label) if self.label else data)
+
+    def partial(self, text: str, received: float):
+        """未確定の仮説が変わったら partial イベントを送る"""
+        if text != self._partial:
+            self._partial = text
+            self.publish('partial', {'text': text, 'time': received})
+
+    def stats(self, **stats):
+        """STATS_INTERVAL ごとに stats イベントを送る"""
+        if self.on_event and time.monotonic() - self._last_stats >= STATS_INTERVAL:
+            self._last_stats = time.monotonic()
+            self.publish('stats', dict(stats, segments=len(self.segments)))
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def close(self):
+        """残りの出力形式を書き出して TranscriptResult を返す"""
+        import transcript_writers
+
+        result = self.segments.build()
+        if self.detailed:
+            self.detailed.close()
+            print(f"[OK] タイムスタンプ付きテキスト保存: {self.detailed_path}", flush=True)
+        transcript_writers.write_transcript(
+            result, self.output_dir, self.base_name, [f for f in self.formats if f != 'detailed'],
+        )
+        self.publish('end', {'segments': len(self.segments)})
+        return result
+
+
+def transcribe_live(
+    url: str,
+    transcriber,
+    output_dir: str,
+    formats: Optional[List[str]] = None,
+    max_duration: Optional[float] = None,
+    converter=None,
+    on_segment: Optional[Callable[[Dict], None]] = None,
+    policy: str = "agreement",
+    archive: bool = False,
+    on_event: Optional[Callable[[str, Dict], None]] = None,
+    stream: Optional[Tuple[str, List[str], str]] = None,
+    stop_event: Optional[threading.Event] = None,
+    label: Optional[str] = None,
+):
+    """
+    ライブ配信を受信しながら文字起こしする（配信終了・Ctrl+C・max_duration 経過で終了）
+
+    Args:
+        url: 配信ページまたは .m3u8 / .mpd のURL
+        transcriber: FasterWhisperTranscriber
+        output_dir: 出力ディレクトリ
+        formats: 出力形式（transcript_writers.WRITERS のキー）
+        max_duration: 受信する最大秒数（Noneで配信終了まで）
+        converter: AudioConverter（Noneの場合は作成）
+        on_segment: 確定したセグメントごとに呼ばれるコールバック
+        policy: 確定方式（POLICIES のキー）
+        archive: 受信した音声を <出力名>_archive/ に Opus で保存する（後から高精度で再文字起こしする用）
+        on_event: イベント（segment / partial / stats / end）ごとに呼ばれるコールバック
+            （live_server.LiveEventHub.publish を渡すとHTTPで配信できる）
+        stream: resolve_stream() で解決済みの (配信URL, 入力オプション, 識別子)（Noneの場合は url から解決）
+        stop_event: セットされたら受信を止めて終了する（別スレッドから動かす場合）
+        label: [SEGMENT] 行とイベントの stream に付ける配信の識別子（複数の配信を同時に扱う場合）
+
+    Returns:
+        TranscriptResult、失敗時はNone
+    """
+    from audio_converter import AudioConverter
+    import transcript_writers
+
+    formats = list(formats or transcript_writers.DEFAULT_FORMATS)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    converter = converter or AudioConverter()
+
+    try:
+        stream_url, input_options, name = stream or resolve_stream(url)
+    except Exception as e:
+        print(f"[ERROR] 配信URLの解決に失敗: {e}", flush=True)
+        return None
+
+    base_name = f"live_{name}_{time.strftime('%Y%m%d_%H%M%S')}"
+    live = POLICIES[policy](transcriber)
+    output = LiveOutput(output_path, base_name, formats, on_segment, label=label, on_event=on_event)
+    reader = StreamReader(converter, stream_url, input_options)
+    archiver = None
+    if archive:
+        archiver = LiveArchiver(reader.ring, converter, str(output_path / f"{base_name}_archive"), source=url)
+
+    print(f"[INFO] ライブ配信の文字起こしを開始: {url}", flush=True)
+    print("[INFO] 終了するには Ctrl+C を押してください", flush=True)
+    if archiver:
+        archiver.start()
+    reader.start()
+    last_warning = 0.0
+    try:
+        for pcm, lost in reader.read():
+            if lost:
+                live.skip(lost)
+            output.emit(live.feed(pcm))
+            output.partial(live.partial_text, live.received_seconds)
+            output.stats(
+                received=live.received_seconds,
+                backlog=reader.backlog_seconds,
+                decodes=live.decode_count,
+                decode_seconds=live.decode_seconds,
+            )
+            if reader.backlog_seconds > LAG_WARNING and time.monotonic() - last_warning > 30:
+                last_warning = time.monotonic()
+                print(f"[WARNING] 文字起こしが配信に {reader.backlog_seconds:.0f}秒 遅れています"
+                      "（より軽いモデル・--speed fast を検討してください）", flush=True)
+            if max_duration and live.received_seconds >= max_duration:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+    except KeyboardInterrupt:
+        print("\n[INFO] 中断しました。ここまでの結果を保存します", flush=True)
+    finally:
+        reader.stop()
+        output.emit(live.finish())
+
+    if reader.error:
+        print(f"[WARNING] 配信の受信が終了しました: {reader.error}", flush=True)
+
+    result = output.close()
+    if archiver:
+        archiver.close()
+    print(f"\n[OK] ライブ文字起こし終了: {live.received_seconds:.0f}秒受信, {len(output)}セグメント", flush=True)
+    return result
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+    import transcript_writers
+    from transcriber import FasterWhisperTranscriber
+
+    parser = argparse.ArgumentParser(description="ライブ配信のリアルタイム文字起こし")
+    parser.add_argument("url", help="配信ページ、.m3u8 / .mpd のURL、またはファイル")
+    parser.add_argument("-m", "--model", default="large-v3-turbo", help="faster-whisper のモデル名")
+    parser.add_argument("-l", "--language", default="ja", help="言語コード")
+    parser.add_argument("-o", "--output", default=".", help="出力ディレクトリ")
+    parser.add_argument("-t", "--duration", type=float, default=None, help="受信する最大秒数")
+    parser.add_argument(
+        "--speed",
+        choices=list(FasterWhisperTranscriber.SPEED_PROFILES),
+        default="fast",
+        help="デコード速度プリセット（デフォルト: fast）",
+    )
+    parser.add_argument(
+        "--policy",
+        choices=list(POLICIES),
+        default="agreement",
+        help="確定方式（agreement: 連続するデコード結果の一致で確定, pause: ポーズで確定）",
+    )
+    parser.add_argument("--archive", action="store_true", help="受信した音声を Opus で保存する")
+    parser.add_argument("--serve", type=int, metavar="PORT", default=None,
+                        help="途中経過を http://127.0.0.1:PORT/ から Server-Sent Events で配信する")
+    parser.add_argument(
+        "--formats",
+        type=transcript_writers.parse_formats,
+        default=None,
+        help=f"出力形式をカンマ区切りで指定 ({', '.join(transcript_writers.WRITERS)}, all)",
+    )
+
+    args = parser.parse_args()
+
+    server = None
+    if args.serve is not None:
+        from live_server import LiveEventHub, LiveEventServer
+        server = LiveEventServer(LiveEventHub(), args.serve)
+        server.start()
+
+    try:
+        with FasterWhisperTranscriber(args.model, args.language, speed_profile=args.speed) as transcriber:
+            result = transcribe_live(
+                args.url, transcriber, args.output, args.formats, args.duration, policy=args.policy,
+                archive=args.archive, on_event=server.hub.publish if server else None,
+            )
+    finally:
+        if server:
+            server.close()
+    return 0 if result is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
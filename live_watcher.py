@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブ配信の監視モジュール
+登録したアカウント・チャンネルを定期的に確認し、ライブ配信が始まったらすぐに受信と文字起こしを始める
+
+- 確認は条件付きリクエスト（ETag / Last-Modified）で行い、変化がなければ 304 だけで済ませる
+- ページが変化した場合のみ、ライブ配信中らしい印（isLiveNow 等）があれば yt-dlp で配信URLを解決する。
+  HLS のプレイリスト（.m3u8）を直接監視する場合は #EXT-X-ENDLIST がなければ配信中とみなす
+- 確認間隔にはゆらぎ（ジッター）を入れ、失敗・429・5xx では指数バックオフする（Retry-After に従う）
+- モデルは起動時に読み込んでウォームアップし、ffmpeg も起動確認しておくため、
+  配信を検出してから数秒で受信と文字起こしが始まる
+
+設定ファイル（JSON）:
+    {"channels": [
+        {"url": "https://www.youtube.com/@example/live", "name": "example", "interval": 60},
+        {"url": "https://example.com/live/stream.m3u8"}
+    ]}
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Tuple
+
+import numpy as np
+
+from hls_fetcher import parse_playlist
+from live_transcriber import SAMPLE_RATE, resolve_stream, transcribe_live
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+POLL_INTERVAL = 60.0       # 確認間隔（秒）
+MAX_BACKOFF = 900.0        # 失敗が続いた場合の最大間隔（秒）
+JITTER = 0.2               # 確認間隔のゆらぎ（±20%）
+COOLDOWN = 60.0            # 配信の受信が終わってから次に確認するまでの間隔（秒）
+REQUEST_TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# ページにこれが含まれていればライブ配信中の可能性がある（yt-dlp で確認する）
+LIVE_MARKERS = ('"isLiveNow":true', '"isLive":true', '"is_live":true', '"broadcast_status":"active"')
+
+
+class RetryLater(Exception):
+    """サーバーから間隔を空けるよう求められた（429・5xx）"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WatchedChannel:
+    """監視する1チャンネル分の状態（条件付きリクエストの検証子・バックオフ・受信中のスレッド）"""
+
+    def __init__(
+        self,
+        url: str,
+        name: Optional[str] = None,
+        check_url: Optional[str] = None,
+        interval: float = POLL_INTERVAL,
+    ):
+        """
+        Args:
+            url: 配信ページのURL（またはライブ配信の .m3u8）
+            name: 表示名
+            check_url: 確認に使うURL（Noneの場合は url）
+            interval: 確認間隔（秒）
+        """
+        self.url = url
+        self.name = name or url
+        self.check_url = check_url or url
+        self.interval = interval
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.failures = 0
+        self.next_check = 0.0
+        self.capture: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float):
+        """delay 秒（±JITTER）後に次の確認を予定"""
+        self.next_check = time.monotonic() + delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def back_off(self, retry_after: Optional[float] = None):
+        """失敗が続くほど間隔を広げる（フルジッター）"""
+        self.failures += 1
+        delay = min(MAX_BACKOFF, self.interval * 2 ** self.failures)
+        delay = random.uniform(delay / 2, delay)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.next_check = time.monotonic() + delay
+        return delay
+
+
+def load_channels(config_path: str) -> List[WatchedChannel]:
+    """設定ファイル（JSON）から監視するチャンネルを読み込む"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    entries = config.get('channels', []) if isinstance(config, dict) else config
+    channels = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'url': entry}
+        channels.append(WatchedChannel(
+            entry['url'],
+            name=entry.get('name'),
+            check_url=entry.get('check_url'),
+            interval=float(entry.get('interval', POLL_INTERVAL)),
+        ))
+    return channels
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class LiveWatcher:
+    """チャンネルを監視し、ライブ配信が始まったら transcribe_live を別スレッドで動かす"""
+
+    def __init__(
+        self,
+        channels: List[WatchedChannel],
+        transcriber,
+        output_dir: str,
+        formats: Optional[List[str]] = None,
+        converter=None,
+        max_captures: int = 2,
+        archive: bool = False,
+        on_event: Optional[Callable[[str, Dict], None]] = None,
+    ):
+        """
+        Args:
+            channels: 監視するチャンネル
+            transcriber: モデル読み込み済みの FasterWhisperTranscriber（全配信で共有）
+            output_dir: 出力ディレクトリ
+            formats: 出力形式（transcript_writers.WRITERS のキー）
+            converter: AudioConverter（Noneの場合は作成）
+            max_captures: 同時に受信する配信の最大数
+            archive: 受信した音声を Opus で保存する
+            on_event: イベントごとに呼ばれるコールバック（live_server 用）
+        """
+        import requests
+        from audio_converter import AudioConverter
+
+        self.channels = channels
+        self.transcriber = transcriber
+        self.output_dir = output_dir
+        self.formats = formats
+        self.converter = converter or AudioConverter()  # ffmpeg の起動確認も兼ねる
+        self.max_captures = max_captures
+        self.archive = archive
+        self.on_event = on_event
+        self.stop_event = threading.Event()
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+
+    def warm_up(self):
+        """初回のデコードで発生する初期化コストを先に済ませる"""
+        started = time.monotonic()
+        list(self.transcriber.model.transcribe(
+            np.zeros(SAMPLE_RATE, dtype=np.float32), language=self.transcriber.language,
+        )[0])
+        print(f"[OK] モデルのウォームアップ完了 ({time.monotonic() - started:.1f}秒)", flush=True)
+
+    def check(self, channel: WatchedChannel) -> Optional[Tuple[str, List[str], str]]:
+        """
+        チャンネルがライブ配信中か確認
+
+        Returns:
+            配信中なら resolve_stream() の結果、そうでなければNone
+        """
+        headers = {}
+        if channel.etag:
+            headers['If-None-Match'] = channel.etag
+        if channel.last_modified:
+            headers['If-Modified-Since'] = channel.last_modified
+        response = self.session.get(channel.check_url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 304:
+            return None  # 前回から変化なし
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RetryLater(f"HTTP {response.status_code}", _parse_retry_after(response.headers.get('Retry-After')))
+        if response.status_code in (404, 410):
+            return None  # 配信前のプレイリストなど
+        response.raise_for_status()
+
+        # 条件付きGETの検証子は「配信中でない」と確定した場合だけ残す
+        # （配信中の目印があるのに解決できなかった場合は、ページが変わらなくても次回また確認する）
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        channel.etag = channel.last_modified = None
+        body = response.text
+
+        if body.lstrip().startswith('#EXTM3U'):
+            if not self._playlist_is_live(body, channel.check_url):
+                channel.etag, channel.last_modified = etag, last_modified
+                return None  # 終了済みの配信・VOD
+            return resolve_stream(channel.check_url)
+        if not any(marker in body for marker in LIVE_MARKERS):
+            channel.etag, channel.last_modified = etag, last_modified
+            return None
+        try:
+            return resolve_stream(channel.url, require_live=True)
+        except Exception:
+            return None
+
+    def _playlist_is_live(self, body: str, url: str) -> bool:
+        """
+        HLS プレイリストがライブ配信か
+
+        #EXT-X-ENDLIST で判定できるのはメディアプレイリスト（#EXT-X-TARGETDURATION あり）だけなので、
+        マスタープレイリストは最初のバリアントを取得して判定する。
+        """
+        if '#EXT-X-TARGETDURATION' not in body:
+            variants = parse_playlist(body, url)['variants']
+            if not variants:
+                return False
+            response = self.session.get(variants[0]['url'], timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            body = response.text
+            if '#EXT-X-TARGETDURATION' not in body:
+                return False
+        return '#EXT-X-ENDLIST' not in body
+
+    def run(self):
+        """Ctrl+C まで監視を続ける"""
+        self.warm_up()
+        print(f"[INFO] {len(self.channels)}チャンネルの監視を開始", flush=True)
+        for channel in self.channels:
+            print(f"  [{channel.name}] {channel.check_url} ({channel.interval:.0f}秒ごと)", flush=True)
+        try:
+            while not self.stop_event.is_set():
+                for channel in self.channels:
+                    self._poll(channel)
+                now = time.monotonic()
+                waits = [c.next_check - now for c in self.channels if c.capture is None]
+                self.stop_event.wait(min([1.0] + waits) if waits else 1.0)
+        except KeyboardInterrupt:
+            print("\n[INFO] 監視を終了します", flush=True)
+        finally:
+            self.stop_event.set()
+            for channel in self.channels:
+                if channel.capture:
+                    channel.capture.join()
+
+    @property
+    def active_captures(self) -> int:
+        return sum(1 for channel in self.channels if channel.capture is not None)
+
+    def _poll(self, channel: WatchedChannel):
+        if channel.capture is not None:
+            if channel.capture.is_alive():
+                return
+            channel.capture = None
+            channel.etag = channel.last_modified = None
+            channel.schedule(COOLDOWN)
+            return
+        if time.monotonic() < channel.next_check:
+            return
+
+        try:
+            stream = self.check(channel)
+        except RetryLater as e:
+            delay = channel.back_off(e.retry_after)
+            print(f"[WARNING] [{channel.name}] {e}: {delay:.0f}秒後に再確認", flush=True)
+            return
+        except Exception as e:
+            delay = channel.back_off()
+            print(f"[WARNING] [{channel.name}] 確認に失敗: {e}: {delay:.0f}秒後に再確認", flush=True)
+            return
+        channel.failures = 0
+
+        if stream is None:
+            channel.schedule(channel.interval)
+            return
+        if self.active_captures >= self.max_captures:
+            print(f"[WARNING] [{channel.name}] 配信中ですが、同時に受信できる数（{self.max_captures}）に達しています",
+                  flush=True)
+            channel.schedule(min(channel.interval, 10.0))
+            return
+
+        print(f"[INFO] [{channel.name}] ライブ配信を検出しました。受信を開始します", flush=True)
+        channel.capture = threading.Thread(
+            target=self._capture, args=(channel, stream), name=f"capture-{channel.name}", daemon=True,
+        )
+        channel.capture.start()
+
+    def _capture(self, channel: WatchedChannel, stream: Tuple[str, List[str], str]):
+        try:
+            transcribe_live(
+                channel.url,
+                self.transcriber,
+                self.output_dir,
+                formats=self.formats,
+                converter=self.converter,
+                archive=self.archive,
+                on_event=self.on_event,
+                stream=stream,
+                stop_event=self.stop_event,
+                label=re.sub(r'[^\w-]', '_', channel.name) or "stream",
+            )
+        except Exception as e:
+            print(f"[ERROR] [{channel.name}] ライブ文字起こしに失敗: {e}", flush=True)
+
+
+def main():
+    """テスト用のメイン関数"""
+    import argparse
+    import transcript_writers
+    from transcriber import FasterWhisperTranscriber
+
+    parser = argparse.ArgumentParser(description="ライブ配信を監視し、始まったら文字起こしする")
+    parser.add_argument("urls", nargs="*", help="監視する配信ページまたは .m3u8 のURL")
+    parser.add_argument("-c", "--config", default=None, help="監視するチャンネルの設定ファイル（JSON）")
+    parser.add_argument("-m", "--model", default="large-v3-turbo", help="faster-whisper のモデル名")
+    parser.add_argument("-l", "--language", default="ja", help="言語コード")
+    parser.add_argument("-o", "--output", default=".", help="出力ディレクトリ")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help=f"確認間隔（秒, デフォルト: {POLL_INTERVAL:.0f}）")
+    parser.add_argument("--max-captures", type=int, default=2, help="同時に受信する配信の最大数（デフォルト: 2）")
+    parser.add_argument("--archive", action="store_true", help="受信した音声を Opus で保存する")
+    parser.add_argument(
+        "--formats",
+        type=transcript_writers.parse_formats,
+        default=None,
+        help=f"出力形式をカンマ区切りで指定 ({', '.join(transcript_writers.WRITERS)}, all)",
+    )
+    args = parser.parse_args()
+
+    channels = load_channels(args.config) if args.config else []
+    channels += [WatchedChannel(url, interval=args.interval) for url in args.urls]
+    if not channels:
+        parser.error("監視するURLまたは --config を指定してください")
+
+    Path(args.output).mkdir(parents=True, exist_ok=True)
+    with FasterWhisperTranscriber(args.model, args.language, speed_profile="fast") as transcriber:
+        watcher = LiveWatcher(
+            channels, transcriber, args.output, args.formats,
+            max_captures=args.max_captures, archive=args.archive,
+        )
+        watcher.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
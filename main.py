@@ -10,6 +10,7 @@ import os
 import sys
 import argparse
 import multiprocessing
+import threading
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
@@ -37,7 +38,16 @@ if sys.platform == 'win32':
 
 from downloader import VideoDownloader
 from audio_converter import AudioConverter
+from channel_profile import detect_recurring_spans
+from live_transcriber import transcribe_live
+from live_multiplexer import transcribe_live_multi
+from live_capture import find_manifest, join_archive
+from live_server import LiveEventHub, LiveEventServer
+from live_watcher import LiveWatcher, WatchedChannel, load_channels
+from fingerprint import FingerprintIndex, HOP_SECONDS, fingerprint_file
+from hls_fetcher import FRAGMENT_WORKERS, ProgressiveHlsDownload
 from transcriber import AudioTranscriber
+from transcript_writers import DEFAULT_FORMATS, parse_formats, write_transcript, WRITERS
 from title_generator import TitleGenerator
 from obsidian_writer import ObsidianWriter
 from summarizer import ContentSummarizer, DEFAULT_SUMMARY_PROMPT
@@ -90,6 +100,14 @@ class AudioTranscriptionProcessor:
         summary_provider: str = "builtin",
         summary_model: Optional[str] = None,
         gemini_api_key: Optional[str] = None,
+        draft_model: Optional[str] = None,
+        speed_profile: Optional[str] = None,
+        output_formats: Optional[List[str]] = None,
+        trim_silence: bool = False,
+        dedup: bool = False,
+        skip_recurring: bool = False,
+        progressive: bool = False,
+        fragment_workers: int = FRAGMENT_WORKERS,
         **kwargs,
     ):
         """
@@ -108,6 +126,14 @@ class AudioTranscriptionProcessor:
             summary_provider: 要約プロバイダ ("builtin", "openai", "gemini")
             summary_model: 要約に使用するモデル名
             gemini_api_key: Gemini APIキー
+            draft_model: 2パスモードの下書きモデル（faster-whisper、Noneで1パス）
+            speed_profile: デコード速度プリセット（faster-whisper: fast / balanced / accurate）
+            output_formats: 文字起こし結果の出力形式（txt, detailed, srt, vtt, jsonl, json, npz）
+            trim_silence: 文字起こしの前に長い無音・BGMだけの区間を取り除くかどうか
+            dedup: 音声フィンガープリントで同じ音声を検出し、保存済みの文字起こし結果を再利用するかどうか
+            skip_recurring: Voicy / stand.fm で番組ごとの定番イントロ・アウトロを学習して取り除くかどうか
+            progressive: HLS で配信される音声（Voicy, stand.fm, UTAGE等）をダウンロードしながら文字起こしするかどうか
+            fragment_workers: HLSのフラグメントを同時にダウンロードする数
         """
         # output_dirが指定されていない場合はOSごとのデフォルトを使用
         if output_dir is None:
@@ -118,12 +144,25 @@ class AudioTranscriptionProcessor:
         self.keep_video = keep_video
         self.diarize = diarize
         self.api_key = api_key
+        self.output_formats = list(output_formats or DEFAULT_FORMATS)
+        self.trim_silence = trim_silence
+        self.fingerprints = FingerprintIndex() if dedup else None
+        self.skip_recurring = skip_recurring
+        self.progressive = progressive
 
         print("=" * 60)
         print("音声文字起こしシステム")
         print(f"エンジン: {engine}")
         if diarize:
             print("話者分離: 有効")
+        if trim_silence:
+            print("無音・BGM区間の除去: 有効")
+        if dedup:
+            print(f"重複音声の検出: 有効（登録済み {len(self.fingerprints)}件）")
+        if skip_recurring:
+            print("定番イントロ・アウトロの除去: 有効（Voicy, stand.fm）")
+        if progressive:
+            print("ダウンロードしながら文字起こし: 有効（HLS）")
         if summarize:
             print("内容要約: 有効")
         if obsidian_vault:
@@ -132,9 +171,13 @@ class AudioTranscriptionProcessor:
         print("=" * 60)
 
         # 各コンポーネントを初期化
-        self.downloader = VideoDownloader(str(self.output_dir), keep_video=keep_video)
         self.converter = AudioConverter()
-        self.transcriber = AudioTranscriber(whisper_model, language, engine=engine, api_key=api_key)
+        self.downloader = VideoDownloader(
+            str(self.output_dir), keep_video=keep_video, fragment_workers=fragment_workers, converter=self.converter)
+        self._start_transcriber_loading(
+            whisper_model, language, engine, api_key,
+            draft_model=draft_model, speed_profile=speed_profile,
+        )
         self.title_generator = TitleGenerator(api_key=api_key)
 
         # 話者分離（オプション）
@@ -146,6 +189,14 @@ class AudioTranscriptionProcessor:
             except ImportError:
                 print("[WARNING] 話者分離モジュール (diarizer) が見つかりません。話者分離をスキップします。", flush=True)
 
+        # 重複音声の再利用は同じ設定で作った文字起こし結果に限る（--dedup）
+        self.transcript_settings = {
+            'engine': engine,
+            'model': whisper_model,
+            'language': language,
+            'diarize': self.diarizer is not None,
+        }
+
         # Obsidian（オプション）
         self.obsidian_writer = None
         if obsidian_vault:
@@ -179,12 +230,174 @@ class AudioTranscriptionProcessor:
                 label = {"gemini": "Gemini", "openai": "OpenAI"}.get(summary_provider, summary_provider)
                 print(f"[WARNING] 内容要約: {label} APIキーが設定されていません。要約をスキップします。", flush=True)
 
+    def _start_transcriber_loading(
+        self,
+        whisper_model: str,
+        language: str,
+        engine: str,
+        api_key: Optional[str],
+        **options,
+    ):
+        """
+        文字起こしモデルの読み込みをバックグラウンドで開始
+
+        モデル読み込み（large-v3-turbo のCPU読み込みで数秒）をダウンロードと並行して行い、
+        最初の文字起こしの直前に self.transcriber で完了を待つ。
+        openai-api はクライアント生成のみで軽量なため、設定エラーを即座に出すよう同期的に初期化する。
+        """
+        self._transcriber: Optional[AudioTranscriber] = None
+        self._transcriber_error: Optional[BaseException] = None
+        self._transcriber_thread: Optional[threading.Thread] = None
+
+        if engine == "openai-api":
+            self._transcriber = AudioTranscriber(whisper_model, language, engine=engine, api_key=api_key, **options)
+            return
+
+        def load():
+            try:
+                self._transcriber = AudioTranscriber(whisper_model, language, engine=engine, api_key=api_key, **options)
+            except BaseException as e:  # sys.exit() も含めてメインスレッドで再送出する
+                self._transcriber_error = e
+
+        self._transcriber_thread = threading.Thread(target=load, name="transcriber-loader", daemon=True)
+        self._transcriber_thread.start()
+
+    @property
+    def transcriber(self) -> AudioTranscriber:
+        """文字起こしエンジン（バックグラウンド読み込み中なら完了を待つ）"""
+        if self._transcriber is None and self._transcriber_thread is not None:
+            if self._transcriber_thread.is_alive():
+                print("[INFO] 文字起こしモデルの読み込み完了を待機中...", flush=True)
+            self._transcriber_thread.join()
+            if self._transcriber_error is not None:
+                raise self._transcriber_error
+        return self._transcriber
+
+    def process_live(
+        self,
+        urls: List[str],
+        max_duration: Optional[float] = None,
+        archive: bool = False,
+        serve_port: Optional[int] = None,
+    ) -> bool:
+        """
+        ライブ配信を受信しながら文字起こし（faster-whisper エンジンのみ）
+
+        複数の配信を指定した場合は、1つのモデルでまとめてバッチデコードする。
+
+        Args:
+            urls: 配信ページまたは .m3u8 / .mpd のURL
+            max_duration: 配信ごとに受信する最大秒数（Noneで配信終了・Ctrl+Cまで）
+            archive: 受信した音声を Opus で保存する（--local-file で再文字起こしできる）
+            serve_port: 途中経過を Server-Sent Events で配信するポート（Noneで配信しない）
+
+        Returns:
+            成功した場合True
+        """
+        from transcriber import FasterWhisperTranscriber
+
+        print(f"\n{'=' * 60}")
+        print(f"ライブ配信の文字起こし: {', '.join(urls)}")
+        print(f"{'=' * 60}\n")
+
+        engine = self.transcriber.backend
+        if not isinstance(engine, FasterWhisperTranscriber):
+            print("[ERROR] ライブ文字起こしは faster-whisper エンジンのみ対応しています")
+            return False
+
+        server = None
+        if serve_port is not None:
+            server = LiveEventServer(LiveEventHub(), serve_port)
+            server.start()
+        on_event = server.hub.publish if server else None
+
+        try:
+            if len(urls) > 1:
+                results = transcribe_live_multi(
+                    urls,
+                    engine,
+                    str(self.output_dir),
+                    formats=self.output_formats,
+                    max_duration=max_duration,
+                    converter=self.converter,
+                    archive=archive,
+                    on_event=on_event,
+                )
+                return results is not None
+
+            result = transcribe_live(
+                urls[0],
+                engine,
+                str(self.output_dir),
+                formats=self.output_formats,
+                max_duration=max_duration,
+                converter=self.converter,
+                archive=archive,
+                on_event=on_event,
+            )
+            return result is not None
+        finally:
+            if server:
+                server.close()
+
+    def watch_live(
+        self,
+        targets: List[str],
+        archive: bool = False,
+        serve_port: Optional[int] = None,
+    ) -> bool:
+        """
+        チャンネルを監視し、ライブ配信が始まったら文字起こし（faster-whisper エンジンのみ、Ctrl+Cまで）
+
+        Args:
+            targets: 監視する配信ページ・.m3u8 のURL、または設定ファイル（.json）
+            archive: 受信した音声を Opus で保存する
+            serve_port: 途中経過を Server-Sent Events で配信するポート（Noneで配信しない）
+
+        Returns:
+            成功した場合True
+        """
+        from transcriber import FasterWhisperTranscriber
+
+        channels = []
+        for target in targets:
+            if target.endswith('.json') and os.path.exists(target):
+                channels += load_channels(target)
+            else:
+                channels.append(WatchedChannel(target))
+
+        engine = self.transcriber.backend
+        if not isinstance(engine, FasterWhisperTranscriber):
+            print("[ERROR] ライブ文字起こしは faster-whisper エンジンのみ対応しています")
+            return False
+
+        server = None
+        if serve_port is not None:
+            server = LiveEventServer(LiveEventHub(), serve_port)
+            server.start()
+        try:
+            watcher = LiveWatcher(
+                channels,
+                engine,
+                str(self.output_dir),
+                formats=self.output_formats,
+                converter=self.converter,
+                archive=archive,
+                on_event=server.hub.publish if server else None,
+            )
+            watcher.run()
+            return True
+        finally:
+            if server:
+                server.close()
+
     def process_file(self, file_path: str) -> bool:
         """
         ローカルファイル（動画・音声）を処理
 
         Args:
-            file_path: ローカルの動画・音声ファイルのパス（MP4, MP3, M4A, WAV, WebM, MKV, MOV）
+            file_path: ローカルの動画・音声ファイルのパス（MP4, MP3, M4A, WAV, WebM, MKV, MOV, Opus）、
+                またはライブ配信の音声アーカイブ（ディレクトリまたは manifest.json）
 
         Returns:
             成功した場合True
@@ -200,11 +413,22 @@ class AudioTranscriptionProcessor:
             print(f"[ERROR] ファイルが見つかりません: {file_path}")
             return False
 
+        # ライブ配信の音声アーカイブは1つのMP3に連結してから処理
+        manifest_path = find_manifest(file_path)
+        if manifest_path:
+            print("[INFO] ライブ配信の音声アーカイブを検出")
+            joined = join_archive(
+                manifest_path, str(self.output_dir / f"{manifest_path.parent.name}.mp3"), self.converter,
+            )
+            if not joined:
+                return False
+            file_path_obj = Path(joined)
+
         # ファイル拡張子の確認
         file_ext = file_path_obj.suffix.lower()
-        if file_ext not in ['.mp4', '.mp3', '.m4a', '.wav', '.webm', '.mkv', '.mov']:
+        if file_ext not in ['.mp4', '.mp3', '.m4a', '.wav', '.webm', '.mkv', '.mov', '.opus']:
             print(f"[ERROR] サポートされていないファイル形式: {file_ext}")
-            print("[INFO] 対応形式: .mp4, .mp3, .m4a, .wav, .webm, .mkv, .mov")
+            print("[INFO] 対応形式: .mp4, .mp3, .m4a, .wav, .webm, .mkv, .mov, .opus")
             return False
 
         # MP3ファイルの場合はそのまま文字起こし
@@ -222,15 +446,11 @@ class AudioTranscriptionProcessor:
 
             # ステップ2: 文字起こし
             print(f"\n【ステップ2/2】文字起こし")
-            result = self.transcriber.transcribe(mp3_file, str(self.output_dir))
+            result = self._transcribe(mp3_file)
             if not result:
                 print("[ERROR] 文字起こし失敗")
                 return False
 
-            # 話者分離（オプション）
-            if self.diarizer and result:
-                result = self._apply_diarization(mp3_file, result)
-
             # タイトル生成（GPT、ローカルファイル用）
             title = self.title_generator.generate_title_from_text(result.get('text', ''))
 
@@ -285,15 +505,11 @@ class AudioTranscriptionProcessor:
 
             # ステップ3: 文字起こし
             print(f"\n【ステップ3/3】文字起こし")
-            result = self.transcriber.transcribe(mp3_file, str(self.output_dir))
+            result = self._transcribe(mp3_file)
             if not result:
                 print("[ERROR] 文字起こし失敗")
                 return False
 
-            # 話者分離（オプション）
-            if self.diarizer and result:
-                result = self._apply_diarization(mp3_file, result)
-
             # タイトル生成（GPT、ローカルファイル用）
             title = self.title_generator.generate_title_from_text(result.get('text', ''))
 
@@ -347,46 +563,47 @@ class AudioTranscriptionProcessor:
         except Exception as e:
             print(f"[WARNING] タイトル取得失敗（処理は続行）: {e}", flush=True)
 
-        # ステップ1: 動画をダウンロード
-        print("【ステップ1/3】動画ダウンロード", flush=True)
-        video_file = self.downloader.download(url, filename_prefix)
-        if not video_file:
-            print("[ERROR] ダウンロード失敗")
-            return False
-
-        # ステップ2: 音声をMP3に変換（すでにMP3の場合はスキップ）
-        if video_file.lower().endswith('.mp3'):
-            print(f"\n【ステップ2/3】音声抽出（MP3のためスキップ）")
-            mp3_file = video_file
+        # HLSの音声はダウンロードしながら文字起こし（--progressive）
+        progressive = self._process_progressive(url, filename_prefix) if self.progressive else None
+        if progressive:
+            mp3_file, result = progressive
         else:
-            print(f"\n【ステップ2/3】音声抽出")
-            mp3_file = self.converter.extract_audio(video_file)
-            if not mp3_file:
-                print("[ERROR] 音声抽出失敗")
+            # ステップ1: 動画をダウンロード
+            print("【ステップ1/3】動画ダウンロード", flush=True)
+            video_file = self.downloader.download(url, filename_prefix)
+            if not video_file:
+                print("[ERROR] ダウンロード失敗")
                 return False
 
-            # 動画ファイルの処理（保持 or 削除）
-            if self.keep_video:
-                print(f"[OK] 動画ファイルを保持: {video_file}")
+            # ステップ2: 音声をMP3に変換（すでにMP3の場合はスキップ）
+            if video_file.lower().endswith('.mp3'):
+                print(f"\n【ステップ2/3】音声抽出（MP3のためスキップ）")
+                mp3_file = video_file
             else:
-                try:
-                    if video_file != mp3_file:
-                        os.remove(video_file)
-                        print(f"[OK] 元の動画ファイルを削除: {video_file}")
-                except Exception as e:
-                    print(f"[WARNING] 動画ファイル削除時の警告: {e}")
+                print(f"\n【ステップ2/3】音声抽出")
+                mp3_file = self.converter.extract_audio(video_file)
+                if not mp3_file:
+                    print("[ERROR] 音声抽出失敗")
+                    return False
+
+                # 動画ファイルの処理（保持 or 削除）
+                if self.keep_video:
+                    print(f"[OK] 動画ファイルを保持: {video_file}")
+                else:
+                    try:
+                        if video_file != mp3_file:
+                            os.remove(video_file)
+                            print(f"[OK] 元の動画ファイルを削除: {video_file}")
+                    except Exception as e:
+                        print(f"[WARNING] 動画ファイル削除時の警告: {e}")
 
-        # ステップ3: 音声を文字起こし
-        print(f"\n【ステップ3/3】文字起こし")
-        result = self.transcriber.transcribe(mp3_file, str(self.output_dir))
+            # ステップ3: 音声を文字起こし
+            print(f"\n【ステップ3/3】文字起こし")
+            result = self._transcribe(mp3_file, channel=self.downloader.channel_key)
         if not result:
             print("[ERROR] 文字起こし失敗")
             return False
 
-        # 話者分離（オプション）
-        if self.diarizer and result:
-            result = self._apply_diarization(mp3_file, result)
-
         # 内容要約（オプション）
         self._apply_summarization(mp3_file, result)
 
@@ -411,6 +628,158 @@ class AudioTranscriptionProcessor:
 
         return True
 
+    def _transcribe(self, mp3_file: str, channel: Optional[str] = None):
+        """
+        文字起こし → 話者分離（オプション） → 出力ファイルの書き出し
+
+        話者分離する場合は、話者情報を付与してから全形式を1回だけ書き出す。
+        trim_silence が有効な場合は発話区間だけに縮めた音声を文字起こし・話者分離し、
+        タイムスタンプは元の音声の時刻に戻す。
+        dedup が有効な場合は、同じ音声の文字起こし結果が同じ設定（エンジン・モデル・言語・話者分離）で
+        登録済みならエンジンを使わずに再利用する。
+        skip_recurring が有効で channel が分かる場合は、番組の定番区間を取り除いてから文字起こしする。
+
+        Args:
+            mp3_file: 音声ファイル
+            channel: 番組のチャンネルキー（VideoDownloader.channel_key）
+
+        Returns:
+            文字起こし結果、失敗時はNone
+        """
+        fingerprint = None
+        if self.fingerprints is not None:
+            fingerprint, result = self._find_duplicate(mp3_file)
+            if result:
+                if self.diarizer and not result.speaker_labels:
+                    result = self._apply_diarization(mp3_file, result)
+                write_transcript(result, self.output_dir, Path(mp3_file).stem, self.output_formats)
+                return result
+
+        result = self._transcribe_audio(mp3_file, channel, fingerprint)
+        if result and fingerprint is not None:
+            try:
+                self.fingerprints.add(
+                    fingerprint, result, source=Path(mp3_file).name, settings=self.transcript_settings)
+            except OSError as e:
+                print(f"[WARNING] フィンガープリントの登録に失敗: {e}", flush=True)
+        return result
+
+    def _process_progressive(self, url: str, filename_prefix: str):
+        """
+        HLS で配信される音声をダウンロードしながら文字起こし
+
+        完成したセグメントから順にデコードして文字起こしに渡すため、所要時間は
+        ダウンロードと文字起こしの合計ではなく、おおよそ長い方だけになる。
+        音声全体が先に必要な --trim-silence / --dedup / --skip-recurring と併用する場合や、
+        HLS でない場合は None を返し、通常どおりダウンロード後に文字起こしする。
+
+        Returns:
+            (MP3ファイル, 文字起こし結果 or None)、対象外の場合はNone
+        """
+        if self.trim_silence or self.fingerprints is not None or self.skip_recurring:
+            print("[INFO] --trim-silence / --dedup / --skip-recurring は音声全体が必要なため、"
+                  "ダウンロード後に文字起こしします", flush=True)
+            return None
+        hls = self.downloader.resolve_hls(url, filename_prefix)
+        if not hls:
+            return None
+        m3u8_url, mp3_file = hls
+
+        print("【ステップ1/1】ダウンロードしながら文字起こし（HLS）", flush=True)
+        download = ProgressiveHlsDownload(m3u8_url, mp3_file, self.converter, workers=self.downloader.fragment_workers)
+        download.start()
+        try:
+            # モデルの読み込み中もダウンロード・デコードは進む（PCMはキューに溜まる）
+            result = self.transcriber.transcribe_pcm_stream(
+                download.chunks(),
+                str(self.output_dir),
+                Path(mp3_file).stem,
+                formats=self.output_formats,
+                write_outputs=not self.diarizer,
+                duration=download.duration,
+            )
+        finally:
+            download.close()
+
+        if download.error:
+            if not download.received:
+                print(f"[WARNING] HLSを読み込めませんでした。通常のダウンロードで処理します: {download.error}", flush=True)
+                return None
+            print(f"[ERROR] HLSのダウンロードが途中で失敗: {download.error}", flush=True)
+            return mp3_file, None
+        print(f"[OK] ダウンロード・変換完了: {mp3_file}", flush=True)
+
+        if result and self.diarizer:
+            result = self._apply_diarization(mp3_file, result)
+            write_transcript(result, self.output_dir, Path(mp3_file).stem, self.output_formats)
+        return mp3_file, result
+
+    def _find_duplicate(self, mp3_file: str):
+        """
+        フィンガープリントを計算し、登録済みの同じ音声の文字起こし結果を探す
+
+        Returns:
+            (フィンガープリント, 再利用する文字起こし結果またはNone)
+            フィンガープリントを計算できなかった場合は (None, None)
+        """
+        try:
+            fingerprint, weak_masks = fingerprint_file(mp3_file, self.converter, weak_bits=True)
+        except Exception as e:
+            print(f"[WARNING] フィンガープリントの計算に失敗（通常どおり文字起こしします）: {e}", flush=True)
+            return None, None
+
+        match = self.fingerprints.lookup(fingerprint, weak_masks, settings=self.transcript_settings)
+        if not match:
+            return fingerprint, None
+
+        duration = len(fingerprint) * HOP_SECONDS
+        result = self.fingerprints.load_transcript(match, duration)
+        if result is None:
+            return fingerprint, None
+        print(
+            f"[OK] 同じ音声の文字起こし結果を再利用: {match['source'] or match['id']}"
+            f"（オフセット {match['offset']:+.1f}秒, ビット誤り率 {match['bit_error_rate']:.3f}）",
+            flush=True,
+        )
+        return fingerprint, result
+
+    def _transcribe_audio(self, mp3_file: str, channel: Optional[str] = None, fingerprint=None):
+        """エンジンで文字起こしし、話者分離（オプション）と出力ファイルの書き出しを行う"""
+        recurring = []
+        if self.skip_recurring and channel:
+            recurring = detect_recurring_spans(mp3_file, channel, self.converter, fingerprint)
+
+        audio_file, timeline = mp3_file, None
+        if self.trim_silence or recurring:
+            trimmed = self.converter.trim_to_speech(
+                mp3_file,
+                exclude=recurring,
+                detect_silence=self.trim_silence,
+                min_saving=0.05 if self.trim_silence else 0.0,
+            )
+            if trimmed:
+                audio_file, timeline = trimmed
+
+        try:
+            result = self.transcriber.transcribe(
+                audio_file,
+                str(self.output_dir),
+                formats=self.output_formats,
+                write_outputs=not self.diarizer,
+                timeline=timeline,
+                output_name=Path(mp3_file).stem,
+            )
+            if not result:
+                return None
+
+            if self.diarizer:
+                result = self._apply_diarization(audio_file, result, timeline)
+                write_transcript(result, self.output_dir, Path(mp3_file).stem, self.output_formats)
+            return result
+        finally:
+            if timeline is not None:
+                Path(audio_file).unlink(missing_ok=True)
+
     def _apply_summarization(self, mp3_file: str, result: dict) -> Optional[str]:
         """
         要約を実行しファイルに保存
@@ -442,13 +811,14 @@ class AudioTranscriptionProcessor:
 
         return None
 
-    def _apply_diarization(self, mp3_file: str, result: dict) -> dict:
+    def _apply_diarization(self, mp3_file: str, result: dict, timeline=None) -> dict:
         """
-        話者分離を実行し、結果をマージ。detailedファイルを再保存する。
+        話者分離を実行し、結果をマージ
 
         Args:
             mp3_file: 音声ファイルパス
             result: 文字起こし結果
+            timeline: mp3_file が発話区間だけに縮めた音声の場合、その SpeechTimeline
 
         Returns:
             話者情報が付与された結果辞書
@@ -456,27 +826,13 @@ class AudioTranscriptionProcessor:
         try:
             print("\n【追加ステップ】話者分離")
             diarization_segments = self.diarizer.diarize(mp3_file)
+            if diarization_segments and timeline is not None:
+                diarization_segments = timeline.remap_segments(diarization_segments)
             if diarization_segments:
                 merged_segments = self.diarizer.merge_with_transcription(
                     result['segments'], diarization_segments
                 )
                 result['segments'] = merged_segments
-
-                # detailed テキストを再保存（speaker付き）
-                from transcriber import TranscriberBase
-                base_name = Path(mp3_file).stem
-                detailed_file = self.output_dir / f"{base_name}_transcript_detailed.txt"
-                with open(detailed_file, 'w', encoding='utf-8') as f:
-                    for seg in merged_segments:
-                        start = TranscriberBase._format_timestamp(seg['start'])
-                        end = TranscriberBase._format_timestamp(seg['end'])
-                        text = seg['text'].strip()
-                        speaker = seg.get('speaker', '')
-                        if speaker:
-                            f.write(f"[{start} -> {end}] [{speaker}] {text}\n")
-                        else:
-                            f.write(f"[{start} -> {end}] {text}\n")
-                print(f"[OK] 話者情報付きdetailedテキスト再保存: {detailed_file}")
         except Exception as e:
             print(f"[WARNING] 話者分離失敗（処理は続行）: {e}")
 
@@ -518,6 +874,9 @@ class AudioTranscriptionProcessor:
         """
         複数動画があるページを処理（UTAGEページ用）
 
+        動画は並列にダウンロードし、ダウンロードが終わったものから順に音声抽出・文字起こしを行う
+        （文字起こし中も残りの動画のダウンロードは続く）。動画ごとに成功・失敗を記録する。
+
         Args:
             url: UTAGEページのURL
             filename_prefix: ファイル名のプレフィックス
@@ -529,27 +888,23 @@ class AudioTranscriptionProcessor:
         print(f"複数動画の処理を開始")
         print(f"{'=' * 60}\n")
 
-        # ステップ1: 全動画をダウンロード
-        print("【ステップ1/3】全動画ダウンロード")
-        video_files = self.downloader.download_multiple(url, filename_prefix)
-        if not video_files:
-            print("[ERROR] ダウンロード失敗")
-            return False
-
-        print(f"\n[INFO] {len(video_files)}個の動画をダウンロード完了")
-
-        # 各動画を処理
-        success_count = 0
-        for i, video_file in enumerate(video_files, 1):
+        print("【ステップ1/3】動画ダウンロード（並列）")
+        results = {}  # 動画番号 -> (成否, MP3ファイル または 失敗した工程)
+        total = 0
+        for i, total, video_file in self.downloader.iter_download_multiple(url, filename_prefix):
             print(f"\n{'=' * 60}")
-            print(f"動画 {i}/{len(video_files)} の処理")
+            print(f"動画 {i}/{total} の処理（{len(results) + 1}本目）")
             print(f"{'=' * 60}\n")
+            if not video_file:
+                results[i] = (False, "ダウンロード失敗")
+                continue
 
             # ステップ2: 音声をMP3に変換
-            print(f"【ステップ2/3】音声抽出 ({i}/{len(video_files)})")
+            print(f"【ステップ2/3】音声抽出 ({i}/{total})")
             mp3_file = self.converter.extract_audio(video_file)
             if not mp3_file:
                 print(f"[ERROR] 動画 {i} の音声抽出失敗")
+                results[i] = (False, "音声抽出失敗")
                 continue
 
             # 動画ファイルの処理（保持 or 削除）
@@ -564,10 +919,15 @@ class AudioTranscriptionProcessor:
                     print(f"[WARNING] 動画ファイル削除時の警告: {e}")
 
             # ステップ3: 音声を文字起こし
-            print(f"\n【ステップ3/3】文字起こし ({i}/{len(video_files)})")
-            result = self.transcriber.transcribe(mp3_file, str(self.output_dir))
+            print(f"\n【ステップ3/3】文字起こし ({i}/{total})")
+            try:
+                result = self._transcribe(mp3_file)
+            except Exception as e:
+                print(f"[ERROR] 動画 {i} の文字起こしエラー: {e}")
+                result = None
             if not result:
                 print(f"[ERROR] 動画 {i} の文字起こし失敗")
+                results[i] = (False, "文字起こし失敗")
                 continue
 
             # 内容要約（オプション）
@@ -576,17 +936,25 @@ class AudioTranscriptionProcessor:
             print(f"\n[OK] 動画 {i} の処理完了!")
             print(f"MP3ファイル: {mp3_file}")
             print(f"文字起こし: {Path(mp3_file).stem}_transcript.txt")
-            success_count += 1
+            results[i] = (True, mp3_file)
+
+        if not results:
+            print("[ERROR] ダウンロード失敗")
+            return False
 
-        # 最終結果
+        # 最終結果（動画ごと）
+        success_count = sum(1 for ok, _ in results.values() if ok)
         print(f"\n{'=' * 60}")
         print(f"全体の処理結果")
         print(f"{'=' * 60}")
-        print(f"合計: {len(video_files)} 個")
+        for i in sorted(results):
+            ok, detail = results[i]
+            print(f"{'[OK]' if ok else '[ERROR]'} 動画 {i}: {detail}")
+        print(f"合計: {total} 個")
         print(f"成功: {success_count} 個")
-        print(f"失敗: {len(video_files) - success_count} 個")
+        print(f"失敗: {total - success_count} 個")
 
-        return success_count == len(video_files)
+        return success_count == total
 
     def process_urls_from_file(self, file_path: str) -> dict:
         """
@@ -683,6 +1051,22 @@ def main():
   # UTAGEページで複数動画を全て処理
   python main.py --url "https://example.utage-system.com/..." --all
 
+  # HLSの講義・音声配信をダウンロードしながら文字起こし
+  python main.py --url "https://voicy.jp/channel/..." --progressive
+
+  # ライブ配信をリアルタイムで文字起こし（Ctrl+Cで終了）
+  python main.py --live "https://www.instagram.com/<user>/live/"
+
+  # ライブ配信の音声も保存し、配信後にアーカイブを高精度で再文字起こし
+  python main.py --live "https://www.instagram.com/<user>/live/" --live-archive
+  python main.py --local-file ./output/live_<id>_<日時>_archive --speed accurate
+
+  # チャンネルを監視し、ライブ配信が始まったら自動で文字起こし
+  python main.py --watch channels.json
+
+  # 複数のライブ配信を1つのモデルで同時に文字起こし
+  python main.py --live "https://www.instagram.com/<user1>/live/" "https://x.com/i/spaces/..."
+
   # ローカルファイルを処理（MP4/MP3）
   python main.py --local-file "/path/to/video.mp4"
   python main.py --local-file "/path/to/audio.mp3"
@@ -696,6 +1080,39 @@ def main():
         "-u", "--url",
         help="動画・音声のURL（Instagram, YouTube, X Spaces, Voicy等）"
     )
+    parser.add_argument(
+        "--live",
+        metavar="URL",
+        nargs="+",
+        default=None,
+        help="ライブ配信（Instagram Live, YouTube Live, HLS/DASH）を受信しながら文字起こしする（faster-whisper）。"
+             "複数指定すると1つのモデルで同時に文字起こしする"
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="URL_OR_CONFIG",
+        nargs="+",
+        default=None,
+        help="チャンネルを監視し、ライブ配信が始まったら自動で文字起こしする（URL または設定ファイル .json）"
+    )
+    parser.add_argument(
+        "--live-duration",
+        type=float,
+        default=None,
+        help="ライブ配信を受信する最大秒数（デフォルト: 配信終了またはCtrl+Cまで）"
+    )
+    parser.add_argument(
+        "--live-archive",
+        action="store_true",
+        help="ライブ配信の音声を Opus で保存する（後から --local-file <アーカイブ> で高精度に再文字起こしできる）"
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        default=None,
+        help="ライブ文字起こしの途中経過を http://127.0.0.1:PORT/ から Server-Sent Events で配信する"
+    )
     parser.add_argument(
         "-lf", "--local-file",
         help="処理するローカルファイルのパス（MP4, MP3, M4A, WAV, WebM, MKV）"
@@ -714,7 +1131,51 @@ def main():
     parser.add_argument(
         "-m", "--model",
         default=None,
-        help="Whisperモデル名（デフォルト: エンジンに依存。faster-whisper=large-v3-turbo, local-whisper=base）"
+        help="Whisperモデル名（デフォルト: エンジンに依存。faster-whisper=large-v3-turbo, local-whisper=base）。"
+             "faster-whisper では kotoba-whisper-v2.0 等のCTranslate2版日本語特化モデルも指定可"
+    )
+    parser.add_argument(
+        "--draft-model",
+        default=None,
+        help="2パスモード: 小さいモデル（tiny/base）で下書きし、低信頼度の区間だけ --model のモデルで再デコード（faster-whisper）"
+    )
+    parser.add_argument(
+        "--speed",
+        default=None,
+        choices=["fast", "balanced", "accurate"],
+        help="デコード速度プリセット（faster-whisper、デフォルト: balanced）。fast は低信頼度の区間だけビームサーチで再デコード"
+    )
+    parser.add_argument(
+        "--formats",
+        type=parse_formats,
+        default=None,
+        help=f"出力形式をカンマ区切りで指定（{', '.join(WRITERS)}, all。デフォルト: txt,detailed）"
+    )
+    parser.add_argument(
+        "--trim-silence",
+        action="store_true",
+        help="文字起こしの前に長い無音・BGMだけの区間を取り除く（タイムスタンプは元の音声の時刻のまま）"
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="音声フィンガープリントで再投稿・転載された同じ音声を検出し、保存済みの文字起こし結果を再利用する"
+    )
+    parser.add_argument(
+        "--skip-recurring",
+        action="store_true",
+        help="Voicy / stand.fm で毎回流れるジングル・イントロ・アウトロを番組ごとに学習し、文字起こし前に取り除く"
+    )
+    parser.add_argument(
+        "--progressive",
+        action="store_true",
+        help="HLSで配信される音声（Voicy, stand.fm, UTAGE等）をダウンロードしながら文字起こしする"
+    )
+    parser.add_argument(
+        "--fragment-workers",
+        type=int,
+        default=FRAGMENT_WORKERS,
+        help=f"HLSのフラグメントを同時にダウンロードする数（デフォルト: {FRAGMENT_WORKERS}）"
     )
     parser.add_argument(
         "--api-key",
@@ -801,10 +1262,27 @@ def main():
         summary_provider=args.summary_provider,
         summary_model=args.summary_model,
         gemini_api_key=args.gemini_api_key,
+        draft_model=args.draft_model,
+        # ライブ配信は速度プリセット未指定なら fast（配信に追いつくことを優先）
+        speed_profile=args.speed or ("fast" if args.live or args.watch else None),
+        output_formats=args.formats,
+        trim_silence=args.trim_silence,
+        dedup=args.dedup,
+        skip_recurring=args.skip_recurring,
+        progressive=args.progressive,
+        fragment_workers=args.fragment_workers,
     )
 
-    # 単一URL処理、ローカルファイル処理、またはファイル一括処理
-    if args.url:
+    # ライブ配信、単一URL処理、ローカルファイル処理、またはファイル一括処理
+    if args.watch:
+        success = processor.watch_live(args.watch, archive=args.live_archive, serve_port=args.serve)
+        return 0 if success else 1
+    elif args.live:
+        success = processor.process_live(
+            args.live, max_duration=args.live_duration, archive=args.live_archive, serve_port=args.serve,
+        )
+        return 0 if success else 1
+    elif args.url:
         success = processor.process_url(args.url, process_all=args.all)
         return 0 if success else 1
     elif args.local_file:
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+モデルプールモジュール
+WhisperModel / transformers pipeline / APIクライアントをプロセス内で共有し、
+同じ (エンジン, モデル, デバイス, 計算精度) のモデルを二重に読み込まないようにする
+
+- 参照カウント方式: acquire() で取得、release() で返却
+- 参照がなくなったモデルは idle_timeout 秒後に自動で解放
+- warm_up() で最初のジョブが来る前にモデルを読み込んでおける
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+DEFAULT_IDLE_TIMEOUT = 600.0  # 10分
+
+
+class _PoolEntry:
+    """プール内の1モデル分の状態"""
+
+    __slots__ = ('model', 'refcount', 'last_used', 'ready', 'error', 'inference_lock')
+
+    def __init__(self):
+        self.model: Any = None
+        self.refcount = 0
+        self.last_used = time.monotonic()
+        self.ready = threading.Event()
+        self.error: Optional[BaseException] = None
+        # スレッドセーフでないモデル（transformers pipeline等）の推論を直列化するためのロック
+        self.inference_lock = threading.RLock()
+
+
+class ModelPool:
+    """スレッドセーフなモデルレジストリ"""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            idle_timeout: 参照されなくなったモデルを保持する秒数（0以下で即時解放）
+        """
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _PoolEntry] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        モデルを取得（未読み込みなら loader() で読み込む）
+
+        同じキーで同時に呼ばれた場合、読み込みは1回だけ行われ、
+        他のスレッドは読み込み完了を待つ。
+
+        Args:
+            key: (engine, model, device, compute_type) などのキー
+            loader: モデルを生成する関数
+
+        Returns:
+            共有モデルインスタンス（使い終わったら release(key) を呼ぶこと）
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            is_loader = entry is None
+            if is_loader:
+                entry = _PoolEntry()
+                self._entries[key] = entry
+            entry.refcount += 1
+
+        if is_loader:
+            try:
+                entry.model = loader()
+            except BaseException as e:
+                entry.error = e
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                entry.ready.set()
+                raise
+            entry.ready.set()
+            self._ensure_reaper()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                raise entry.error
+            print(f"[INFO] 読み込み済みモデルを再利用します: {self._format_key(key)}", flush=True)
+
+        entry.last_used = time.monotonic()
+        return entry.model
+
+    def release(self, key: Hashable):
+        """acquire() で取得したモデルを返却"""
+        evict = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+            entry.last_used = time.monotonic()
+            if entry.refcount == 0 and self.idle_timeout <= 0:
+                del self._entries[key]
+                evict = True
+        if evict:
+            self._on_evicted(key)
+
+    def warm_up(self, key: Hashable, loader: Callable[[], Any]):
+        """
+        モデルを事前に読み込む
+
+        参照は保持しないため、idle_timeout 以内に最初のジョブが acquire() すれば
+        読み込み済みのモデルがそのまま使われる。
+        """
+        self.acquire(key, loader)
+        self.release(key)
+
+    def rekey(self, key: Hashable, new_key: Hashable) -> Any:
+        """
+        acquire(key) で取得したモデルを new_key で登録し直す（読み込み時に設定がフォールバックした場合）
+
+        new_key のモデルが既にあればそちらを使う。key の参照は返却し、他に使われていなければ解放する。
+
+        Returns:
+            new_key のモデル（使い終わったら release(new_key) を呼ぶこと）
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"モデルプールに登録されていません: {self._format_key(key)}")
+        model = self.acquire(new_key, lambda: entry.model)
+        self.release(key)
+        self.evict(key)
+        return model
+
+    def inference_lock(self, key: Hashable) -> threading.RLock:
+        """
+        推論を直列化するためのロックを取得（スレッドセーフでないモデル用）
+
+        Raises:
+            KeyError: key のモデルを取得していない（release 済みなど）場合
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"モデルプールに登録されていません: {self._format_key(key)}")
+        return entry.inference_lock
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """idle_timeout を過ぎた未使用モデルを解放し、解放した数を返す"""
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if (entry.refcount == 0 and entry.ready.is_set()
+                        and now - entry.last_used >= self.idle_timeout):
+                    del self._entries[key]
+                    evicted.append(key)
+        for key in evicted:
+            self._on_evicted(key)
+        return len(evicted)
+
+    def evict(self, key: Hashable) -> bool:
+        """参照されていなければ、アイドル時間を待たずに即座に解放"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount > 0 or not entry.ready.is_set():
+                return False
+            del self._entries[key]
+        self._on_evicted(key)
+        return True
+
+    def clear(self):
+        """全モデルを解放（参照中のものも含む）"""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+        for key in keys:
+            self._on_evicted(key)
+
+    def stats(self) -> Dict[Hashable, Dict]:
+        """キーごとの参照数とアイドル時間"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {'refcount': e.refcount, 'idle_seconds': now - e.last_used, 'loaded': e.ready.is_set()}
+                for key, e in self._entries.items()
+            }
+
+    # --- 内部処理 -------------------------------------------------------------
+
+    def _ensure_reaper(self):
+        """アイドル解放用のデーモンスレッドを起動"""
+        if self.idle_timeout <= 0:
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="model-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1.0, min(60.0, self.idle_timeout / 2))
+        while not self._stop.wait(interval):
+            self.evict_idle()
+
+    @staticmethod
+    def _format_key(key: Hashable) -> str:
+        if isinstance(key, tuple):
+            return "/".join(str(k) for k in key if k not in (None, ""))
+        return str(key)
+
+    def _on_evicted(self, key: Hashable):
+        print(f"[INFO] 未使用モデルを解放しました: {self._format_key(key)}", flush=True)
+        # GPUメモリを即座に返す（torchがなければ何もしない）
+        if 'torch' in sys.modules:
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+
+_default_pool: Optional[ModelPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """プロセス共通のモデルプールを取得"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            timeout = os.environ.get('TRANSCRIBER_MODEL_IDLE_TIMEOUT')
+            try:
+                idle_timeout = float(timeout) if timeout else DEFAULT_IDLE_TIMEOUT
+            except ValueError:
+                idle_timeout = DEFAULT_IDLE_TIMEOUT
+            _default_pool = ModelPool(idle_timeout=idle_timeout)
+        return _default_pool
@@ -78,7 +78,7 @@ class StandfmExtractor:
         stand.fmのエピソードURLから音声情報を取得
 
         Returns:
-            {"url": "...", "title": "...", "ext": "m4a", "channel": "..."} or None
+            {"url": "...", "title": "...", "ext": "m4a", "channel": "...", "channel_id": "..."} or None
         """
         if not self._is_episode_url(page_url):
             print(f"[ERROR] エピソードURLではありません: {page_url}", flush=True)
@@ -126,6 +126,7 @@ class StandfmExtractor:
                 "title": title,
                 "ext": "m4a",
                 "channel": channel_name,
+                "channel_id": channel_id,
             }
 
         if hls_url:
@@ -135,6 +136,7 @@ class StandfmExtractor:
                 "title": title,
                 "ext": "m4a",
                 "channel": channel_name,
+                "channel_id": channel_id,
             }
 
         print("[ERROR] 音声URLが見つかりませんでした", flush=True)
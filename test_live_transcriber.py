@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ライブ文字起こし（agreement 方式）のバッファ上限テスト
+仮説が毎回変わる（音楽・雑音・不安定な幻聴）場合でも、バッファが MAX_BUFFER 秒を超えないことを確認する
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+    try:
+        if hasattr(sys.stdout, 'buffer') and sys.stdout.encoding.lower() != 'utf-8':
+            import io
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+        if hasattr(sys.stderr, 'buffer') and sys.stderr.encoding.lower() != 'utf-8':
+            import io
+            sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+    except (AttributeError, OSError):
+        pass
+
+from live_transcriber import SAMPLE_RATE, STEP_SECONDS, LocalAgreementTranscriber
+
+
+class _UnstableModel:
+    """呼ばれるたびに違う単語を返すモデル（仮説が一度も一致しない）"""
+
+    def __init__(self):
+        self.calls = 0
+        self.max_input_seconds = 0.0
+
+    def transcribe(self, audio, language=None, **options):
+        self.calls += 1
+        duration = len(audio) / SAMPLE_RATE
+        self.max_input_seconds = max(self.max_input_seconds, duration)
+        words = [
+            SimpleNamespace(start=t, end=t + 0.4, word=f" w{self.calls}_{i}", probability=0.5)
+            for i, t in enumerate(np.arange(0.0, duration - 0.5, 0.5))
+        ]
+        segment = SimpleNamespace(
+            start=0.0, end=words[-1].end if words else 0.0,
+            text="".join(w.word for w in words), words=words,
+            avg_logprob=-1.0, no_speech_prob=0.1,
+        )
+        return [segment], None
+
+
+def _segment_dict(seg):
+    return {
+        'start': seg.start, 'end': seg.end, 'text': seg.text,
+        'words': [{'start': w.start, 'end': w.end, 'word': w.word, 'probability': w.probability} for w in seg.words],
+    }
+
+
+def _stub_transcriber(model):
+    return SimpleNamespace(
+        model=model,
+        language='ja',
+        RESUME_PROMPT_CHARS=200,
+        _decode_options=lambda: {'beam_size': 1},
+        _segment_dict=_segment_dict,
+    )
+
+
+def test_buffer_stays_bounded_without_agreement():
+    model = _UnstableModel()
+    live = LocalAgreementTranscriber(_stub_transcriber(model))
+    chunk = np.zeros(int(STEP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+
+    committed = []
+    for _ in range(int(120 / STEP_SECONDS)):
+        committed += live.feed(chunk)
+        assert len(live.buffer) / SAMPLE_RATE <= live.MAX_BUFFER + STEP_SECONDS
+
+    assert live.received_seconds == 120
+    assert model.max_input_seconds <= live.MAX_BUFFER + STEP_SECONDS
+    assert committed, "上限を超えた仮説は強制的に確定される"
+
+
+if __name__ == "__main__":
+    test_buffer_stays_bounded_without_agreement()
+    print("[OK] バッファは上限以下に保たれました")
@@ -12,12 +12,19 @@
 import os
 import sys
 import json
+import hashlib
+import itertools
+import platform
 import ssl
 import time
 import traceback
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable, Any, Hashable, Iterable, Iterator, Tuple
+
+from model_pool import get_model_pool
+from transcript_result import TranscriptResult, TranscriptResultBuilder
+import transcript_writers
 
 # SSL証明書の設定（PyInstaller環境対応）
 try:
@@ -40,12 +47,130 @@ if sys.platform == 'win32':
         pass
 
 
+# アプリ専用キャッシュディレクトリ（モデル・環境プローブ結果など）
+APP_CACHE_DIR = Path.home() / ".cache" / "transcription-tool"
+
+
+def _load_json_cache(name: str) -> Dict:
+    """キャッシュディレクトリからJSONを読み込む（存在しない・壊れている場合は空dict）"""
+    cache_file = APP_CACHE_DIR / name
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json_cache(name: str, data: Dict):
+    """キャッシュディレクトリにJSONを書き込む（一時ファイル経由で置き換え）"""
+    try:
+        APP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file = APP_CACHE_DIR / name
+        tmp_file = cache_file.with_suffix(cache_file.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"[WARNING] キャッシュの保存に失敗: {e}", flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint
+# ---------------------------------------------------------------------------
+class TranscriptionCheckpoint:
+    """
+    長時間音声の文字起こし途中経過を保存するサイドカーファイル
+
+    1行目にヘッダー（音声ファイルのサイズ・mtime、エンジン、モデル、言語）、
+    2行目以降にデコード済みセグメントを1行1JSONで追記する。
+    追記のみなのでプロセスが途中で落ちても、最後の不完全な行以外は読み戻せる。
+    """
+
+    SUFFIX = "_transcript.checkpoint.jsonl"
+    FSYNC_INTERVAL_SEC = 10.0
+
+    def __init__(self, path: Path, header: Dict):
+        self.path = path
+        self.header = dict(header, version=1)
+        self._file = None
+        self._last_sync = 0.0
+
+    def load(self) -> List[Dict]:
+        """ヘッダーが一致すれば保存済みセグメントを返す（一致しない・壊れている場合は空リスト）"""
+        segments: List[Dict] = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header != self.header:
+                    return []
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # 書き込み途中で中断された行
+                    segments.append(json.loads(line))
+        except (OSError, ValueError):
+            return segments
+        return segments
+
+    def open(self, segments: List[Dict]):
+        """チェックポイントを作り直し、既存のセグメントを書き込む"""
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps(self.header, ensure_ascii=False) + '\n')
+        for seg in segments:
+            self._file.write(json.dumps(seg, ensure_ascii=False) + '\n')
+        self._sync(force=True)
+
+    def append(self, seg: Dict):
+        """セグメントを追記（一定間隔でディスクに同期）"""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(seg, ensure_ascii=False) + '\n')
+        self._sync()
+
+    def _sync(self, force: bool = False):
+        self._file.flush()
+        now = time.monotonic()
+        if force or now - self._last_sync >= self.FSYNC_INTERVAL_SEC:
+            try:
+                os.fsync(self._file.fileno())
+            except OSError:
+                pass
+            self._last_sync = now
+
+    def close(self):
+        if self._file is not None:
+            self._sync(force=True)
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """文字起こし完了後にチェックポイントを削除"""
+        self.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Base class
 # ---------------------------------------------------------------------------
 class TranscriberBase(ABC):
     """全エンジン共通のインターフェース"""
 
+    # モデルプールから取得したモデルのキー（close() で返却）
+    _pool_key: Optional[Hashable] = None
+    # 途中のオフセットから文字起こしを再開できるか（チェックポイント対応）
+    SUPPORTS_RESUME = False
+    # 再開時に前回のテキストをプロンプトとして渡す最大文字数
+    RESUME_PROMPT_CHARS = 200
+    SAMPLE_RATE = 16000
+    # ストリーム入力（transcribe_pcm_stream）で1回にデコードする長さと、区切りを探す末尾の範囲（秒）
+    STREAM_WINDOW = 30.0
+    STREAM_CUT_SEARCH = 5.0
+    # 窓の終わりからこれ以内で終わる最後のセグメントは、言いかけの可能性があるので次の窓でデコードし直す（秒）
+    STREAM_EDGE_MARGIN = 1.0
+
     def __init__(self, model_name: str, language: str = "ja"):
         self.model_name = model_name
         self.language = language
@@ -61,6 +186,35 @@ class TranscriberBase(ABC):
     def _load_model(self):
         """モデル/クライアントを初期化"""
 
+    def _acquire_shared(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        プロセス共通のモデルプールからモデルを取得
+
+        同じキー (engine, model, device, compute_type) のモデルが読み込み済みなら再利用する。
+        """
+        model = get_model_pool().acquire(key, loader)
+        self.close()
+        self._pool_key = key
+        return model
+
+    def close(self):
+        """共有モデルの参照を返却（プールはアイドル時間経過後に解放）"""
+        key, self._pool_key = self._pool_key, None
+        if key is not None:
+            get_model_pool().release(key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     @abstractmethod
     def _run_transcription(self, audio_path: str) -> Optional[Dict]:
         """
@@ -76,35 +230,178 @@ class TranscriberBase(ABC):
             失敗時は None
         """
 
+    def _stream_transcription(
+        self,
+        audio_path: str,
+        start_offset: float = 0.0,
+        initial_prompt: Optional[str] = None,
+    ) -> Optional[Tuple[Iterable[Dict], Dict]]:
+        """
+        セグメントをデコードされた順に返すイテレータを開始する。
+
+        既定の実装は _run_transcription の結果をまとめて返す（逐次デコード非対応エンジン用）。
+        逐次デコードできるエンジンはオーバーライドしてジェネレータを返す。
+        SUPPORTS_RESUME のエンジンは start_offset 秒以降だけをデコードし、
+        元の音声の時刻でセグメントを返す。
+
+        Returns:
+            (セグメントのイテレータ, {'duration': 音声長(秒) or None, 'text': 全文 or None})
+            失敗時は None
+        """
+        result = self._run_transcription(audio_path)
+        if result is None:
+            return None
+        return result['segments'], {'duration': None, 'text': result['text']}
+
+    def transcribe_stream(
+        self,
+        audio_file: str,
+        on_segment: Optional[Callable[[Dict], None]] = None,
+    ) -> Iterator[Dict]:
+        """
+        セグメントをデコードされた順に返すジェネレータ（出力ファイルは保存しない）
+
+        結果をメモリに溜めないため、長時間の音声でもメモリ使用量が一定に保たれる。
+
+        Args:
+            audio_file: 音声ファイルパス
+            on_segment: セグメントごとに呼ばれるコールバック
+        """
+        stream = self._stream_transcription(str(audio_file))
+        if stream is None:
+            return
+        segments, _ = stream
+        for seg in segments:
+            if on_segment:
+                on_segment(seg)
+            yield seg
+
     def transcribe(
         self,
         audio_file: str,
         output_dir: Optional[str] = None,
-        save_json: bool = False
-    ) -> Optional[Dict]:
-        """音声ファイルを文字起こしし、出力ファイルを保存"""
+        save_json: bool = False,
+        on_segment: Optional[Callable[[Dict], None]] = None,
+        save_npz: bool = False,
+        formats: Optional[List[str]] = None,
+        write_outputs: bool = True,
+        timeline=None,
+        output_name: Optional[str] = None,
+    ) -> Optional[TranscriptResult]:
+        """
+        音声ファイルを文字起こしし、出力ファイルを保存
+
+        セグメントはデコードされるたびに _transcript_detailed.txt に追記され、
+        進捗は seg.end / 音声長 で報告される。その他の形式は完了後に1回の走査で書き出す。
+
+        Args:
+            on_segment: セグメントごとに呼ばれるコールバック
+            save_npz: 信頼度・単語タイムスタンプを含む結果を .npz でも保存するか
+            formats: 出力形式（transcript_writers.WRITERS のキー、デフォルト: txt, detailed）
+            write_outputs: False の場合はファイルを書き出さない
+                （話者分離の後で transcript_writers.write_transcript() する場合）
+            timeline: audio_file が AudioConverter.trim_to_speech() で発話区間だけに
+                縮めた音声の場合、その対応表（SpeechTimeline）。セグメントの時刻を元の音声の時刻に戻す
+            output_name: 出力ファイル名のベース（デフォルト: audio_file の stem）
+
+        Returns:
+            TranscriptResult（result['text'] / result['segments'] でも参照可）、失敗時はNone
+        """
         try:
             audio_path = Path(audio_file)
             if not audio_path.exists():
                 print(f"[ERROR] エラー: ファイルが見つかりません: {audio_file}", flush=True)
                 return None
 
+            output_path = self._output_path(audio_path, output_dir)
+            base_name = output_name or audio_path.stem
+
             print(f"\n文字起こし中: {audio_file}", flush=True)
             print("(処理には数分かかる場合があります...)", flush=True)
             print(f"[PROGRESS] 文字起こし: 0%", flush=True)
 
-            result = self._run_transcription(str(audio_path))
-            if result is None:
+            # 前回中断した文字起こしのチェックポイントがあれば続きから再開
+            # （発話区間に縮めた音声は毎回作り直されるため対象外）
+            checkpoint = None
+            resumed: List[Dict] = []
+            if self.SUPPORTS_RESUME and timeline is None:
+                checkpoint = TranscriptionCheckpoint(
+                    output_path / f"{base_name}{TranscriptionCheckpoint.SUFFIX}",
+                    self._checkpoint_header(audio_path),
+                )
+                resumed = checkpoint.load()
+            start_offset = resumed[-1]['end'] if resumed else 0.0
+            initial_prompt = None
+            if resumed:
+                initial_prompt = ''.join(seg['text'] for seg in resumed)[-self.RESUME_PROMPT_CHARS:]
+                print(f"[INFO] チェックポイントから再開します: {self._format_timestamp(start_offset)} "
+                      f"({len(resumed)}セグメント処理済み)", flush=True)
+
+            if resumed:
+                stream = self._stream_transcription(str(audio_path), start_offset, initial_prompt)
+            else:
+                stream = self._stream_transcription(str(audio_path))
+            if stream is None:
                 return None
+            segments_iter, info = stream
+            duration = info.get('duration')
+
+            formats = self._resolve_formats(formats, save_json, save_npz) if write_outputs else []
+
+            # タイムスタンプ付きテキストはセグメントごとに追記
+            segments = TranscriptResultBuilder()
+            last_percent = 0
+            if resumed and duration:
+                last_percent = min(99, int(start_offset / duration * 100))
+                print(f"[PROGRESS] 文字起こし: {last_percent}%", flush=True)
+            detailed_file = None
+            if 'detailed' in formats:
+                detailed_file = transcript_writers.output_file(output_path, base_name, 'detailed')
+                formats.remove('detailed')
+            detailed = open(detailed_file, 'w', encoding='utf-8') if detailed_file else None
+            try:
+                if checkpoint:
+                    checkpoint.open(resumed)
+                for seg in resumed:
+                    if detailed:
+                        detailed.write(self._format_detailed_line(seg))
+                    segments.append(seg)
+                for seg in segments_iter:
+                    if duration:
+                        percent = min(99, int(seg['end'] / duration * 100))
+                        if percent > last_percent:
+                            last_percent = percent
+                            print(f"[PROGRESS] 文字起こし: {percent}%", flush=True)
+                    if timeline is not None:
+                        seg = timeline.remap_segment(seg)
+                    if detailed:
+                        detailed.write(self._format_detailed_line(seg))
+                        detailed.flush()
+                    segments.append(seg)
+                    if checkpoint:
+                        checkpoint.append(seg)
+                    if on_segment:
+                        on_segment(seg)
+            finally:
+                if detailed:
+                    detailed.close()
+                if checkpoint:
+                    checkpoint.close()
 
+            if checkpoint:
+                checkpoint.remove()
             print(f"[PROGRESS] 文字起こし: 100%", flush=True)
+            if detailed_file:
+                print(f"[OK] タイムスタンプ付きテキスト保存: {detailed_file}", flush=True)
 
-            # 出力ファイルを保存
-            self._save_outputs(audio_path, result, output_dir, save_json)
+            result = segments.build(full_text=info.get('text'))
+
+            # 残りの出力形式をまとめて保存
+            transcript_writers.write_transcript(result, output_path, base_name, formats)
 
             print(f"\n文字起こし完了!", flush=True)
-            print(f"全体の文字数: {len(result['text'])}文字", flush=True)
-            print(f"セグメント数: {len(result['segments'])}", flush=True)
+            print(f"全体の文字数: {len(result.text)}文字", flush=True)
+            print(f"セグメント数: {len(result.segments)}", flush=True)
 
             return result
 
@@ -113,56 +410,217 @@ class TranscriberBase(ABC):
             traceback.print_exc()
             return None
 
-    # --- 共通ユーティリティ ------------------------------------------------
+    # --- ストリーム入力（標準入力・名前付きパイプ） --------------------------
+
+    def transcribe_pcm_segments(self, chunks: Iterable[Any]) -> Iterator[Dict]:
+        """
+        PCMチャンク列を受け取りながら文字起こしし、セグメントを順に返すジェネレータ
+
+        STREAM_WINDOW 秒溜まるごとに、末尾 STREAM_CUT_SEARCH 秒の中で最も静かな位置で区切って
+        デコードし、デコードした音声は捨てる（窓の端で切れた最後のセグメントは次の窓に回す）。
+        保持する音声は最大でも1窓分なので、終わりのない入力でもメモリ使用量は一定。
+        前の窓のテキストを次の窓のプロンプトにする。
 
-    def _save_outputs(
+        Args:
+            chunks: 16kHz モノラル float32 のPCMチャンク（audio_converter.iter_pcm_stream() など）
+
+        Yields:
+            セグメント（時刻は入力の先頭からの秒数）
+        """
+        import numpy as np
+
+        window = int(self.STREAM_WINDOW * self.SAMPLE_RATE)
+        margin = self.STREAM_EDGE_MARGIN * self.SAMPLE_RATE
+        buffer = np.zeros(0, dtype=np.float32)
+        offset = 0
+        text = ""
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is not None:
+                buffer = np.concatenate([buffer, np.asarray(chunk, dtype=np.float32)])
+            while len(buffer) >= window or (chunk is None and len(buffer)):
+                cut = self._stream_cut(buffer[:window]) if len(buffer) >= window else len(buffer)
+                segments = [
+                    seg for seg in self._transcribe_pcm(buffer[:cut], text[-self.RESUME_PROMPT_CHARS:] or None)
+                    if seg['text'].strip()
+                ]
+                if cut < len(buffer) and len(segments) > 1 and segments[-1]['start'] > 0 \
+                        and segments[-1]['end'] * self.SAMPLE_RATE > cut - margin:
+                    cut = int(segments.pop()['start'] * self.SAMPLE_RATE)
+                shift = offset / self.SAMPLE_RATE
+                for seg in segments:
+                    seg['start'] += shift
+                    seg['end'] += shift
+                    for word in seg.get('words', ()):
+                        word['start'] += shift
+                        word['end'] += shift
+                    text += seg['text']
+                    yield seg
+                offset += cut
+                buffer = buffer[cut:]
+
+    def transcribe_pcm_stream(
         self,
-        audio_path: Path,
-        result: Dict,
-        output_dir: Optional[str],
-        save_json: bool
-    ):
+        chunks: Iterable[Any],
+        output_dir: str = ".",
+        base_name: str = "stream",
+        formats: Optional[List[str]] = None,
+        on_segment: Optional[Callable[[Dict], None]] = None,
+        save_npz: bool = False,
+        write_outputs: bool = True,
+        duration: Optional[float] = None,
+    ) -> Optional[TranscriptResult]:
+        """
+        PCMチャンク列（標準入力・名前付きパイプ・ダウンロード中のHLS）を文字起こしし、出力ファイルを保存
+
+        入力の終わり（EOF）まで読み続ける（Ctrl+C の場合はここまでの結果を保存してから中断する）。セグメントは確定するたびに
+        [SEGMENT] 行とタイムスタンプ付きテキストに書き出し、その他の形式は終了後にまとめて書き出す。
+
+        Args:
+            chunks: 16kHz モノラル float32 のPCMチャンク（audio_converter.iter_pcm_stream() など）
+            output_dir: 出力ディレクトリ
+            base_name: 出力ファイル名のベース
+            formats: 出力形式（transcript_writers.WRITERS のキー、デフォルト: txt, detailed）
+            on_segment: セグメントごとに呼ばれるコールバック
+            save_npz: 信頼度・単語タイムスタンプを含む結果を .npz でも保存するか
+            write_outputs: False の場合はファイルを書き出さない（話者分離の後で書き出す場合）
+            duration: 入力の長さ（秒）。分かっている場合は進捗を [PROGRESS] で報告する
+
+        Returns:
+            TranscriptResult、失敗時はNone
+
+        Raises:
+            KeyboardInterrupt: Ctrl+C で中断した場合（ここまでの結果を保存してから送出する）
+        """
+        try:
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+            formats = self._resolve_formats(formats, save_npz=save_npz) if write_outputs else []
+
+            print(f"\n文字起こし中: {base_name}（ストリーム入力、終わるまで読み続けます）", flush=True)
+            if duration:
+                print(f"[PROGRESS] 文字起こし: 0%", flush=True)
+
+            segments = TranscriptResultBuilder()
+            last_percent = 0
+            interrupted = False
+            detailed_file = None
+            if 'detailed' in formats:
+                detailed_file = transcript_writers.output_file(output_path, base_name, 'detailed')
+                formats.remove('detailed')
+            detailed = open(detailed_file, 'w', encoding='utf-8') if detailed_file else None
+            try:
+                for seg in self.transcribe_pcm_segments(chunks):
+                    line = self._format_detailed_line(seg)
+                    print(f"[SEGMENT] {line}", end="", flush=True)
+                    if duration:
+                        percent = min(99, int(seg['end'] / duration * 100))
+                        if percent > last_percent:
+                            last_percent = percent
+                            print(f"[PROGRESS] 文字起こし: {percent}%", flush=True)
+                    if detailed:
+                        detailed.write(line)
+                        detailed.flush()
+                    segments.append(seg)
+                    if on_segment:
+                        on_segment(seg)
+            except KeyboardInterrupt:
+                interrupted = True
+                print("\n[INFO] 中断しました。ここまでの結果を保存します", flush=True)
+            finally:
+                if detailed:
+                    detailed.close()
+
+            if duration and not interrupted:
+                print(f"[PROGRESS] 文字起こし: 100%", flush=True)
+            if detailed_file:
+                print(f"[OK] タイムスタンプ付きテキスト保存: {detailed_file}", flush=True)
+
+            result = segments.build()
+            transcript_writers.write_transcript(result, output_path, base_name, formats)
+            if interrupted:
+                print(f"[INFO] 中断までの結果（{len(result.segments)}セグメント）を保存しました", flush=True)
+                raise KeyboardInterrupt
+
+            print(f"\n文字起こし完了!", flush=True)
+            print(f"全体の文字数: {len(result.text)}文字", flush=True)
+            print(f"セグメント数: {len(result.segments)}", flush=True)
+            return result
+
+        except Exception as e:
+            print(f"[ERROR] 文字起こしエラー: {e}", flush=True)
+            traceback.print_exc()
+            return None
+
+    def _transcribe_pcm(self, pcm, initial_prompt: Optional[str] = None) -> List[Dict]:
+        """
+        PCMの1窓分を文字起こし（時刻は窓の先頭からの秒数）
+
+        既定の実装は一時WAVファイルに書き出して _run_transcription に渡す（ファイル入力しか
+        受け付けないエンジン用。プロンプトは使わない）。配列を直接デコードできるエンジンはオーバーライドする。
+        """
+        import tempfile
+        import wave
+        import numpy as np
+
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
+            tmp_path = tmp.name
+        try:
+            with wave.open(tmp_path, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.SAMPLE_RATE)
+                wav.writeframes((np.clip(pcm, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+            result = self._run_transcription(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+        return result['segments'] if result else []
+
+    def _stream_cut(self, pcm) -> int:
+        """窓の末尾 STREAM_CUT_SEARCH 秒の中で最も静かな10msフレームの中央（発話の途中で切らないため）"""
+        import numpy as np
+        from audio_converter import FRAME_RATE, frame_energy_db
+
+        search = min(len(pcm), int(self.STREAM_CUT_SEARCH * self.SAMPLE_RATE))
+        energy = frame_energy_db([pcm[len(pcm) - search:]], self.SAMPLE_RATE)
+        if not len(energy):
+            return len(pcm)
+        frame = self.SAMPLE_RATE // FRAME_RATE
+        return len(pcm) - search + int(np.argmin(energy)) * frame + frame // 2
+
+    # --- 共通ユーティリティ ------------------------------------------------
+
+    def _checkpoint_header(self, audio_path: Path) -> Dict:
+        """チェックポイントが同じ音声・同じ設定のものか判定するための情報"""
+        stat = audio_path.stat()
+        return {
+            'audio': str(audio_path.resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'engine': self.__class__.__name__,
+            'model': self.model_name,
+            'language': self.language,
+        }
+
+    @staticmethod
+    def _output_path(audio_path: Path, output_dir: Optional[str]) -> Path:
         if output_dir:
             output_path = Path(output_dir)
             output_path.mkdir(exist_ok=True)
-        else:
-            output_path = audio_path.parent
-
-        base_name = audio_path.stem
-
-        # 1. 全文テキスト
-        txt_file = output_path / f"{base_name}_transcript.txt"
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(result['text'])
-        print(f"[OK] 全文テキスト保存: {txt_file}", flush=True)
-
-        # 2. タイムスタンプ付きテキスト（話者情報対応）
-        detailed_file = output_path / f"{base_name}_transcript_detailed.txt"
-        with open(detailed_file, 'w', encoding='utf-8') as f:
-            for seg in result['segments']:
-                start = self._format_timestamp(seg['start'])
-                end = self._format_timestamp(seg['end'])
-                text = seg['text'].strip()
-                speaker = seg.get('speaker', '')
-                if speaker:
-                    f.write(f"[{start} -> {end}] [{speaker}] {text}\n")
-                else:
-                    f.write(f"[{start} -> {end}] {text}\n")
-        print(f"[OK] タイムスタンプ付きテキスト保存: {detailed_file}", flush=True)
+            return output_path
+        return audio_path.parent
 
-        # 3. JSON（オプション）
+    @staticmethod
+    def _resolve_formats(formats: Optional[List[str]], save_json: bool = False, save_npz: bool = False) -> List[str]:
+        """出力形式のリスト（save_json / save_npz は 'json' / 'npz' の指定と同じ）"""
+        resolved = list(formats) if formats else list(transcript_writers.DEFAULT_FORMATS)
         if save_json:
-            json_file = output_path / f"{base_name}_transcript.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            print(f"[OK] JSON保存: {json_file}", flush=True)
+            resolved.append('json')
+        if save_npz:
+            resolved.append('npz')
+        return list(dict.fromkeys(resolved))
 
-    @staticmethod
-    def _format_timestamp(seconds: float) -> str:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    _format_timestamp = staticmethod(transcript_writers.format_timestamp)
+    _format_detailed_line = staticmethod(transcript_writers.format_detailed_line)
 
     def get_model_info(self) -> Dict:
         return {
@@ -181,78 +639,469 @@ class FasterWhisperTranscriber(TranscriberBase):
     MODELS = [
         "large-v3-turbo", "large-v3", "large-v2",
         "medium", "small", "base", "tiny",
+        "kotoba-whisper-v2.0", "kotoba-whisper-bilingual-v1.0", "kotoba-whisper-v1.0",
     ]
     DEFAULT_MODEL = "large-v3-turbo"
+    # CTranslate2変換済みのKotoba-Whisper（日本語特化）モデル
+    CT2_MODEL_REPOS = {
+        "kotoba-whisper-v2.0": "kotoba-tech/kotoba-whisper-v2.0-faster",
+        "kotoba-whisper-bilingual-v1.0": "kotoba-tech/kotoba-whisper-bilingual-v1.0-faster",
+        "kotoba-whisper-v1.0": "kotoba-tech/kotoba-whisper-v1.0-faster",
+    }
+    # Kotoba-Whisper (蒸留モデル) の推奨デコード設定
+    KOTOBA_TRANSCRIBE_OPTIONS = {
+        'chunk_length': 15,
+        'condition_on_previous_text': False,
+    }
+    # デコード速度プリセット
+    #   fast:     greedyデコード。品質基準を満たさないセグメントだけ fallback の設定で再デコード
+    #   balanced: ビームサーチ + 温度フォールバック（従来の設定）
+    #   accurate: 広いビーム、小さい音声も拾うVAD
+    SPEED_PROFILES = {
+        'fast': {
+            'beam_size': 1,
+            'best_of': 1,
+            'temperature': 0.0,
+            'condition_on_previous_text': False,
+            'vad_parameters': {'min_silence_duration_ms': 500, 'speech_pad_ms': 200},
+            'fallback': {'beam_size': 5, 'best_of': 5, 'temperature': [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]},
+        },
+        'balanced': {
+            'beam_size': 5,
+            'best_of': 5,
+            'temperature': [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            'condition_on_previous_text': True,
+            'vad_parameters': {'min_silence_duration_ms': 2000, 'speech_pad_ms': 400},
+        },
+        'accurate': {
+            'beam_size': 8,
+            'best_of': 5,
+            'patience': 1.5,
+            'temperature': [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            'condition_on_previous_text': True,
+            'vad_parameters': {'threshold': 0.35, 'min_silence_duration_ms': 2000, 'speech_pad_ms': 600},
+        },
+    }
+    DEFAULT_SPEED_PROFILE = "balanced"
+    SUPPORTS_RESUME = True
+    # 低信頼度セグメントの判定基準（faster-whisper の温度フォールバック判定と同じ値）
+    LOW_LOGPROB_THRESHOLD = -1.0
+    HIGH_COMPRESSION_RATIO = 2.4
+    NO_SPEECH_THRESHOLD = 0.6
+    # 再デコード時に前後に含める音声の長さ（秒）
+    REFINE_PADDING_SEC = 0.5
+    CT2_REQUIRED_FILES = ["model.bin", "config.json"]
+    CT2_MANIFEST_FILE = ".verified.json"
+    # benchmark.py tune で計測した最速設定（ホスト・モデル・デバイスごと）
+    PROFILE_CACHE_FILE = "faster_whisper_profile.json"
 
-    def __init__(self, model_name: Optional[str] = None, language: str = "ja"):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        language: str = "ja",
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        speed_profile: Optional[str] = None,
+        word_timestamps: bool = False,
+    ):
+        """
+        Args:
+            compute_type: CTranslate2の計算精度（Noneの場合はチューニング結果/既定値）
+            cpu_threads: CPU推論のスレッド数（Noneの場合はチューニング結果/CTranslate2既定）
+            num_workers: 並列に文字起こしできるワーカー数（Noneの場合はチューニング結果/1）
+            speed_profile: デコード速度プリセット（fast / balanced / accurate、デフォルト: balanced）
+            word_timestamps: 単語ごとのタイムスタンプ・確率も取得するか（処理時間が増える）
+        """
         name = model_name or self.DEFAULT_MODEL
         super().__init__(name, language)
+        speed_profile = speed_profile or self.DEFAULT_SPEED_PROFILE
+        if speed_profile not in self.SPEED_PROFILES:
+            raise ValueError(f"不明な速度プリセット: {speed_profile}  (選択肢: {', '.join(self.SPEED_PROFILES)})")
+        self.speed_profile = speed_profile
+        self.word_timestamps = word_timestamps
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
         print(f"[faster-whisper] モデルを読み込み中... (モデル: {self.model_name})", flush=True)
         self._load_model()
 
-    def _load_model(self):
-        from faster_whisper import WhisperModel
+    @staticmethod
+    def host_key() -> str:
+        """チューニング結果を保存するホスト識別子"""
+        return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu"
 
-        # GPU自動検出
-        device = "cpu"
-        compute_type = "int8"
+    @staticmethod
+    def detect_device():
+        """GPU自動検出し、(device, 既定のcompute_type) を返す"""
         try:
             import torch
             if torch.cuda.is_available():
-                device = "cuda"
-                compute_type = "float16"
                 print(f"[faster-whisper] GPU (CUDA) を検出しました", flush=True)
+                return "cuda", "float16"
         except ImportError:
             pass
+        return "cpu", "int8"
 
-        # Windowsのシンボリックリンク権限問題を回避するため、
-        # HuggingFaceのキャッシュを使わずアプリ専用ディレクトリに直接ダウンロード
-        model_cache_dir = Path.home() / ".cache" / "transcription-tool" / "models"
-        model_cache_dir.mkdir(parents=True, exist_ok=True)
+    @classmethod
+    def load_profile(cls, model_name: str, device: str) -> Dict:
+        """このホスト・モデル・デバイスのチューニング結果を取得"""
+        profile = _load_json_cache(cls.PROFILE_CACHE_FILE)
+        return profile.get(cls.host_key(), {}).get(model_name, {}).get(device, {})
+
+    @classmethod
+    def save_profile(cls, model_name: str, device: str, settings: Dict):
+        """チューニング結果を保存"""
+        profile = _load_json_cache(cls.PROFILE_CACHE_FILE)
+        profile.setdefault(cls.host_key(), {}).setdefault(model_name, {})[device] = settings
+        _save_json_cache(cls.PROFILE_CACHE_FILE, profile)
+
+    def _is_kotoba_model(self) -> bool:
+        return self.model_name in self.CT2_MODEL_REPOS
+
+    def _checkpoint_header(self, audio_path: Path) -> Dict:
+        return dict(super()._checkpoint_header(audio_path), speed_profile=self.speed_profile)
+
+    def get_model_info(self) -> Dict:
+        return dict(super().get_model_info(), speed_profile=self.speed_profile)
+
+    # --- CTranslate2変換済みモデルの取得・検証 -------------------------------
+
+    @classmethod
+    def _verify_ct2_model(cls, model_dir: Path) -> bool:
+        """
+        ダウンロード済みモデルが完全か確認（検証時に記録したファイルサイズと比較）
 
+        更新日時が記録と異なるファイルはSHA-256も比較する（一致すれば更新日時を記録し直す）
+        """
+        manifest_file = model_dir / cls.CT2_MANIFEST_FILE
         try:
-            self.model = WhisperModel(
-                self.model_name,
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        files = manifest.get('files', {})
+        if not all(name in files for name in cls.CT2_REQUIRED_FILES):
+            return False
+        touched = False
+        for name, info in files.items():
+            path = model_dir / name
+            if not path.is_file():
+                return False
+            stat = path.stat()
+            if stat.st_size != info.get('size'):
+                return False
+            if stat.st_mtime_ns != info.get('mtime_ns'):
+                if cls._sha256_file(path) != info.get('sha256'):
+                    print(f"[WARNING] CTranslate2モデルのファイルが変更されています: {name}", flush=True)
+                    return False
+                info['mtime_ns'] = stat.st_mtime_ns
+                touched = True
+        if touched:
+            try:
+                with open(manifest_file, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
+            except OSError:
+                pass
+        return True
+
+    @staticmethod
+    def _sha256_file(path: Path) -> str:
+        import hashlib
+
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    @classmethod
+    def _write_ct2_manifest(cls, model_dir: Path, repo_id: str):
+        """ダウンロード直後のモデルを検証し、ファイルサイズ・更新日時・SHA-256を記録"""
+        missing = [name for name in cls.CT2_REQUIRED_FILES if not (model_dir / name).is_file()]
+        has_tokenizer = (model_dir / "tokenizer.json").is_file() or any(model_dir.glob("vocabulary.*"))
+        if missing or not has_tokenizer:
+            raise RuntimeError(f"CTranslate2モデルのファイルが不足しています: {missing or ['tokenizer.json']}")
+
+        files = {}
+        for path in sorted(model_dir.iterdir()):
+            if not path.is_file() or path.name.startswith('.'):
+                continue
+            stat = path.stat()
+            if stat.st_size == 0:
+                raise RuntimeError(f"CTranslate2モデルのファイルが空です: {path.name}")
+            files[path.name] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': cls._sha256_file(path),
+            }
+
+        with open(model_dir / cls.CT2_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'repo_id': repo_id, 'files': files}, f, ensure_ascii=False, indent=2)
+
+    def _resolve_model_path(self, model_cache_dir: Path) -> str:
+        """
+        WhisperModel に渡すモデル名/パスを決定
+
+        Kotoba系モデルはCTranslate2変換済みリポジトリをアプリのモデルディレクトリに
+        直接ダウンロードし（シンボリックリンクを使わない）、検証してからパスを返す。
+        """
+        repo_id = self.CT2_MODEL_REPOS.get(self.model_name)
+        if not repo_id:
+            return self.model_name
+
+        model_dir = model_cache_dir / repo_id.replace("/", "--")
+        if self._verify_ct2_model(model_dir):
+            return str(model_dir)
+
+        print(f"[faster-whisper] CTranslate2版モデルをダウンロード中: {repo_id}", flush=True)
+        from huggingface_hub import snapshot_download
+
+        snapshot_download(
+            repo_id,
+            local_dir=str(model_dir),
+            allow_patterns=["*.bin", "*.json", "*.txt"],
+        )
+        self._write_ct2_manifest(model_dir, repo_id)
+        print(f"[OK] モデルを検証しました: {model_dir}", flush=True)
+        return str(model_dir)
+
+    def model_cache_dir(self) -> Path:
+        """
+        モデルの保存先
+
+        Windowsのシンボリックリンク権限問題を回避するため、
+        HuggingFaceのキャッシュを使わずアプリ専用ディレクトリに直接ダウンロード
+        """
+        model_cache_dir = APP_CACHE_DIR / "models"
+        model_cache_dir.mkdir(parents=True, exist_ok=True)
+        return model_cache_dir
+
+    def _load_model(self):
+        from faster_whisper import WhisperModel
+
+        device, compute_type = self.detect_device()
+
+        # 明示指定がなければ benchmark.py tune の結果を使用
+        profile = self.load_profile(self.model_name, device)
+        if profile:
+            print(f"[faster-whisper] チューニング済み設定を使用: {profile.get('compute_type')}, "
+                  f"threads={profile.get('cpu_threads')}, workers={profile.get('num_workers')}", flush=True)
+        compute_type = self.compute_type or profile.get('compute_type', compute_type)
+        cpu_threads = self.cpu_threads if self.cpu_threads is not None else profile.get('cpu_threads', 0)
+        num_workers = self.num_workers if self.num_workers is not None else profile.get('num_workers', 1)
+
+        model_cache_dir = self.model_cache_dir()
+        model_path = self._resolve_model_path(model_cache_dir)
+
+        def loader(device: str, compute_type: str) -> Callable[[], Any]:
+            return lambda: WhisperModel(
+                model_path,
                 device=device,
                 compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
                 download_root=str(model_cache_dir),
             )
+
+        def pool_key(device: str, compute_type: str) -> tuple:
+            return ("faster-whisper", model_path, device, f"{compute_type}/t{cpu_threads}/w{num_workers}")
+
+        try:
+            self.model = self._acquire_shared(pool_key(device, compute_type), loader(device, compute_type))
             print(f"[OK] faster-whisper モデル読み込み完了: {self.model_name} (device={device}, compute={compute_type})", flush=True)
         except Exception as e:
             if device == "cuda":
                 print(f"[WARNING] GPU読み込み失敗、CPUにフォールバックします: {e}", flush=True)
-                self.model = WhisperModel(
-                    self.model_name,
-                    device="cpu",
-                    compute_type="int8",
-                    download_root=str(model_cache_dir),
-                )
-                print(f"[OK] faster-whisper モデル読み込み完了: {self.model_name} (device=cpu, compute=int8)", flush=True)
+                device = "cpu"
+                # GPU用のチューニング結果ではなくCPU用の設定で読み込む（loader / pool_key はこの値を参照する）
+                profile = self.load_profile(self.model_name, "cpu")
+                compute_type = self.compute_type or profile.get('compute_type', "int8")
+                cpu_threads = self.cpu_threads if self.cpu_threads is not None else profile.get('cpu_threads', 0)
+                num_workers = self.num_workers if self.num_workers is not None else profile.get('num_workers', 1)
+                self.model = self._acquire_shared(pool_key(device, compute_type), loader(device, compute_type))
+                print(f"[OK] faster-whisper モデル読み込み完了: {self.model_name} (device=cpu, compute={compute_type})", flush=True)
             else:
                 raise
+        self.device = device
+        self.compute_type = compute_type
 
-    def _run_transcription(self, audio_path: str) -> Optional[Dict]:
-        try:
-            segments_iter, info = self.model.transcribe(
-                audio_path,
-                language=self.language,
-                beam_size=5,
-                vad_filter=True,
-            )
+    def _stream_transcription(
+        self,
+        audio_path: str,
+        start_offset: float = 0.0,
+        initial_prompt: Optional[str] = None,
+    ) -> Optional[Tuple[Iterable[Dict], Dict]]:
+        """faster-whisper のセグメントジェネレータをそのまま逐次返す"""
+        options = self._decode_options()
+        if initial_prompt:
+            options['initial_prompt'] = initial_prompt
+
+        segments_iter, duration = self._decode_segments(audio_path, start_offset, options)
+
+        def generate() -> Iterator[Dict]:
+            for seg in segments_iter:
+                if start_offset:
+                    seg['start'] += start_offset
+                    seg['end'] += start_offset
+                    for word in seg.get('words', ()):
+                        word['start'] += start_offset
+                        word['end'] += start_offset
+                yield seg
+
+        return generate(), {'duration': duration + start_offset, 'text': None}
+
+    def _transcribe_pcm(self, pcm, initial_prompt: Optional[str] = None) -> List[Dict]:
+        """配列のまま faster-whisper でデコード（速度プリセットのフォールバック・2パスもそのまま使う）"""
+        options = self._decode_options()
+        if initial_prompt:
+            options['initial_prompt'] = initial_prompt
+        segments_iter, _ = self._decode_segments(pcm, 0.0, options)
+        return list(segments_iter)
+
+    def _decode_options(self) -> Dict:
+        """model.transcribe に渡すデコード設定（速度プリセット + モデル固有の設定）"""
+        options = {k: v for k, v in self.SPEED_PROFILES[self.speed_profile].items() if k != 'fallback'}
+        options['vad_filter'] = True
+        if self.word_timestamps:
+            options['word_timestamps'] = True
+        if self._is_kotoba_model():
+            options.update(self.KOTOBA_TRANSCRIBE_OPTIONS)
+        return options
+
+    def _load_audio(self, audio_path, start_offset: float = 0.0):
+        """音声を16kHzモノラルの配列として読み込む（start_offset 秒より前は切り捨て。配列はそのまま使う）"""
+        audio = audio_path
+        if isinstance(audio_path, str):
+            from faster_whisper import decode_audio
+            audio = decode_audio(audio_path, sampling_rate=self.SAMPLE_RATE)
+        return audio[int(start_offset * self.SAMPLE_RATE):]
+
+    def _decode_segments(
+        self,
+        audio_path: str,
+        start_offset: float,
+        options: Dict,
+    ) -> Tuple[Iterator[Dict], float]:
+        """
+        音声をデコードする
 
-            full_text_parts: List[str] = []
-            segments: List[Dict] = []
+        Returns:
+            (start_offset からの相対時刻のセグメントのイテレータ, デコード対象の長さ（秒）)
+        """
+        fallback = self.SPEED_PROFILES[self.speed_profile].get('fallback')
+        audio = audio_path
+        if start_offset > 0 or fallback:
+            # 再開時は未処理の末尾だけをデコード（faster-whisper は元々全体をメモリに展開する）
+            audio = self._load_audio(audio_path, start_offset)
+        segments_iter, info = self.model.transcribe(audio, language=self.language, **options)
+        if fallback:
+            # greedyで品質基準を満たさなかったセグメントだけビームサーチでやり直す
+            refine_options = dict(options, **fallback)
+            refine_options.pop('initial_prompt', None)
+            return self._refine_segments(audio, segments_iter, self.model, refine_options), info.duration
+        return (self._segment_dict(seg) for seg in segments_iter), info.duration
+
+    @staticmethod
+    def _segment_dict(seg) -> Dict:
+        """faster-whisper のセグメントを dict 形式に変換（信頼度・単語タイムスタンプを保持）"""
+        result = {
+            'start': seg.start,
+            'end': seg.end,
+            'text': seg.text,
+            'avg_logprob': seg.avg_logprob,
+            'no_speech_prob': seg.no_speech_prob,
+        }
+        if seg.words:
+            result['words'] = [
+                {'start': w.start, 'end': w.end, 'word': w.word, 'probability': w.probability}
+                for w in seg.words
+            ]
+        return result
+
+    # --- 低信頼度セグメントの再デコード --------------------------------------
+
+    def _is_low_confidence(self, seg) -> bool:
+        """平均対数尤度・圧縮率から再デコードが必要なセグメントか判定"""
+        if seg.no_speech_prob > self.NO_SPEECH_THRESHOLD and seg.avg_logprob < self.LOW_LOGPROB_THRESHOLD:
+            return False  # 無音・雑音区間は再デコードしても改善しない
+        return seg.avg_logprob < self.LOW_LOGPROB_THRESHOLD or seg.compression_ratio > self.HIGH_COMPRESSION_RATIO
+
+    def _refine_segments(self, audio, segments: Iterable, model, options: Dict) -> Iterator[Dict]:
+        """
+        低信頼度のセグメントだけを model / options で再デコードして差し替える
+
+        連続する低信頼度セグメントはまとめて1回で再デコードする。
+        それ以外のセグメントはそのまま逐次返す。
+
+        Args:
+            audio: 16kHzモノラルの音声配列（segments の時刻の基準）
+            segments: faster-whisper のセグメント（avg_logprob 等を含む）
+            model: 再デコードに使う WhisperModel
+            options: 再デコード時の model.transcribe の設定
+        """
+        pending: List[Any] = []
+        history = ''
+        refined = total = 0
+        # 末尾の None で残った低信頼度セグメントを処理する
+        for seg in itertools.chain(segments, [None]):
+            if seg is not None:
+                total += 1
+                if self._is_low_confidence(seg):
+                    pending.append(seg)
+                    continue
 
+            outputs: List[Dict] = []
+            if pending:
+                outputs = self._redecode(audio, pending, model, options, history)
+                refined += len(pending)
+                pending = []
+            if seg is not None:
+                outputs.append(self._segment_dict(seg))
+
+            for out in outputs:
+                history = (history + out['text'])[-self.RESUME_PROMPT_CHARS:]
+                yield out
+
+        if refined:
+            print(f"[INFO] 低信頼度セグメントを再デコードしました: {refined}/{total}", flush=True)
+
+    def _redecode(self, audio, run: List[Any], model, options: Dict, prompt: str) -> List[Dict]:
+        """連続する低信頼度セグメントの区間を再デコード（失敗時は元のセグメントを返す）"""
+        start, end = run[0].start, run[-1].end
+        clip_start = max(0.0, start - self.REFINE_PADDING_SEC)
+        clip_end = min(len(audio) / self.SAMPLE_RATE, end + self.REFINE_PADDING_SEC)
+        clip = audio[int(clip_start * self.SAMPLE_RATE):int(clip_end * self.SAMPLE_RATE)]
+
+        refine_options = dict(options, vad_filter=False, condition_on_previous_text=False)
+        if prompt:
+            refine_options['initial_prompt'] = prompt
+
+        results: List[Dict] = []
+        try:
+            segments_iter, _ = model.transcribe(clip, language=self.language, **refine_options)
             for seg in segments_iter:
-                full_text_parts.append(seg.text)
-                segments.append({
-                    'start': seg.start,
-                    'end': seg.end,
-                    'text': seg.text,
-                })
+                seg_start, seg_end = clip_start + seg.start, clip_start + seg.end
+                # 前後の余白部分で認識された（隣のセグメントと重複する）発話は除外
+                if start <= (seg_start + seg_end) / 2 <= end:
+                    refined = self._segment_dict(seg)
+                    refined['start'], refined['end'] = max(start, seg_start), min(end, seg_end)
+                    for word in refined.get('words', ()):
+                        word['start'] += clip_start
+                        word['end'] += clip_start
+                    results.append(refined)
+        except Exception as e:
+            print(f"[WARNING] 再デコードに失敗しました ({self._format_timestamp(start)}): {e}", flush=True)
+            results = []
+        return results or [self._segment_dict(seg) for seg in run]
 
+    def _run_transcription(self, audio_path: str) -> Optional[Dict]:
+        try:
+            segments_iter, _ = self._stream_transcription(audio_path)
+            segments = list(segments_iter)
             return {
-                'text': ''.join(full_text_parts),
+                'text': ''.join(seg['text'] for seg in segments),
                 'segments': segments,
             }
         except Exception as e:
@@ -261,6 +1110,70 @@ class FasterWhisperTranscriber(TranscriberBase):
             return None
 
 
+class TwoPassTranscriber(FasterWhisperTranscriber):
+    """
+    下書き → 清書の2パス文字起こし
+
+    小さいモデル（tiny/base）のgreedyデコードで全体を文字起こしし、
+    低信頼度（avg_logprob / compression_ratio）のセグメントだけを
+    大きいモデル（large-v3-turbo）のビームサーチで再デコードして差し替える。
+    """
+
+    DEFAULT_DRAFT_MODEL = "base"
+    DRAFT_OPTIONS = {'beam_size': 1, 'best_of': 1, 'temperature': 0.0}
+    REFINE_OPTIONS = {'beam_size': 5}
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        language: str = "ja",
+        draft_model: Optional[str] = None,
+        speed_profile: Optional[str] = None,
+        word_timestamps: bool = False,
+    ):
+        """
+        Args:
+            model_name: 再デコード（清書）に使うモデル
+            draft_model: 下書きに使う小さいモデル（デフォルト: base）
+            speed_profile: 清書時のデコード速度プリセット
+            word_timestamps: 単語ごとのタイムスタンプ・確率も取得するか
+        """
+        super().__init__(model_name, language, speed_profile=speed_profile, word_timestamps=word_timestamps)
+        self.draft = FasterWhisperTranscriber(
+            draft_model or self.DEFAULT_DRAFT_MODEL, language, word_timestamps=word_timestamps,
+        )
+
+    def close(self):
+        draft = getattr(self, 'draft', None)
+        if draft is not None:
+            draft.close()
+        super().close()
+
+    def _decode_segments(
+        self,
+        audio_path: str,
+        start_offset: float,
+        options: Dict,
+    ) -> Tuple[Iterator[Dict], float]:
+        audio = self._load_audio(audio_path, start_offset)
+
+        draft_options = self.draft._decode_options()
+        draft_options.update(self.DRAFT_OPTIONS)
+        if 'initial_prompt' in options:
+            draft_options['initial_prompt'] = options['initial_prompt']
+        segments_iter, info = self.draft.model.transcribe(audio, language=self.language, **draft_options)
+
+        refine_options = dict(options, **self.REFINE_OPTIONS)
+        refine_options.pop('initial_prompt', None)
+        return self._refine_segments(audio, segments_iter, self.model, refine_options), info.duration
+
+    def _checkpoint_header(self, audio_path: Path) -> Dict:
+        return dict(super()._checkpoint_header(audio_path), draft_model=self.draft.model_name)
+
+    def get_model_info(self) -> Dict:
+        return dict(super().get_model_info(), draft_model=self.draft.model_name)
+
+
 # ---------------------------------------------------------------------------
 # Engine 2: OpenAI API (cloud)
 # ---------------------------------------------------------------------------
@@ -288,7 +1201,12 @@ class OpenAIAPITranscriber(TranscriberBase):
 
     def _load_model(self):
         from openai import OpenAI
-        self.client = OpenAI(api_key=self.api_key)
+        # APIキーそのものはキーに含めない
+        key_id = hashlib.sha256(self.api_key.encode('utf-8')).hexdigest()[:12]
+        self.client = self._acquire_shared(
+            ("openai-api", "client", key_id, ""),
+            lambda: OpenAI(api_key=self.api_key),
+        )
         print(f"[OK] OpenAI API クライアント初期化完了", flush=True)
 
     def _run_transcription(self, audio_path: str) -> Optional[Dict]:
@@ -440,7 +1358,10 @@ class LocalWhisperTranscriber(TranscriberBase):
     def _load_model(self):
         import whisper
         try:
-            self.model = whisper.load_model(self.model_name)
+            self.model = self._acquire_shared(
+                ("local-whisper", self.model_name, "auto", "default"),
+                lambda: whisper.load_model(self.model_name),
+            )
             print(f"[OK] モデル読み込み完了: {self.model_name}", flush=True)
         except Exception as e:
             print(f"[ERROR] モデル読み込みエラー: {e}", flush=True)
@@ -448,11 +1369,13 @@ class LocalWhisperTranscriber(TranscriberBase):
 
     def _run_transcription(self, audio_path: str) -> Optional[Dict]:
         try:
-            result = self.model.transcribe(
-                audio_path,
-                language=self.language,
-                verbose=False,
-            )
+            # openai-whisper のモデルはスレッドセーフでないため推論を直列化
+            with get_model_pool().inference_lock(self._pool_key):
+                result = self.model.transcribe(
+                    audio_path,
+                    language=self.language,
+                    verbose=False,
+                )
             segments = []
             for seg in result.get('segments', []):
                 segments.append({
@@ -479,59 +1402,158 @@ class KotobaWhisperTranscriber(TranscriberBase):
     MODELS = ["kotoba-whisper-v2.0"]
     DEFAULT_MODEL = "kotoba-whisper-v2.0"
     HF_MODEL_ID = "kotoba-tech/kotoba-whisper-v2.0"
+    # benchmark.py kotoba で選ばれた最速設定（デバイスごと）
+    PROFILE_CACHE_FILE = "kotoba_profile.json"
+    DEFAULT_BATCH_SIZE = {"cuda": 16, "mps": 8, "cpu": 4}
 
-    def __init__(self, model_name: Optional[str] = None, language: str = "ja"):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        language: str = "ja",
+        batch_size: Optional[int] = None,
+        attn_implementation: Optional[str] = None,
+        quantize: Optional[bool] = None,
+    ):
+        """
+        Args:
+            batch_size: 30秒チャンクを同時にデコードする数（Noneの場合はプロファイル/既定値）
+            attn_implementation: attention実装 ("sdpa" / "eager"、Noneの場合はプロファイル/既定値)
+            quantize: CPU時に線形層を動的int8量子化するか（Noneの場合はプロファイル/既定値）
+        """
         name = model_name or self.DEFAULT_MODEL
         super().__init__(name, language)
+        self.device, self.torch_dtype = self._detect_device()
+
+        # 明示指定がなければ benchmark.py で保存された設定を使用
+        profile = _load_json_cache(self.PROFILE_CACHE_FILE).get(self.device, {})
+        if batch_size is None:
+            batch_size = profile.get('batch_size', self.DEFAULT_BATCH_SIZE.get(self.device, 4))
+        if attn_implementation is None:
+            attn_implementation = profile.get('attn_implementation', "sdpa")
+        if quantize is None:
+            quantize = profile.get('quantize', False)
+        self.batch_size = int(batch_size)
+        self.attn_implementation = attn_implementation
+        self.quantize = bool(quantize) and self.device == "cpu"
+
         print(f"[kotoba-whisper] Kotoba-Whisper v2.0 を読み込み中... (日本語特化モデル)", flush=True)
         self._load_model()
 
-    def _load_model(self):
+    @staticmethod
+    def _detect_device():
+        """デバイス自動検出: CUDA → MPS (Apple Silicon) → CPU"""
         import torch
-        from transformers import pipeline
 
-        # デバイス自動検出: CUDA → MPS (Apple Silicon) → CPU
-        device = "cpu"
-        torch_dtype = torch.float32
         if torch.cuda.is_available():
-            device = "cuda"
-            torch_dtype = torch.float16
             print(f"[kotoba-whisper] GPU (CUDA) を検出しました", flush=True)
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            device = "mps"
-            torch_dtype = torch.float16
+            return "cuda", torch.float16
+        if hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
             print(f"[kotoba-whisper] Apple Silicon (MPS) を検出しました", flush=True)
+            return "mps", torch.float16
+        return "cpu", torch.float32
 
+    def _build_pipeline(self, device: str, torch_dtype):
+        """transformers pipeline を構築（SDPA非対応環境ではeagerにフォールバック）"""
+        from transformers import pipeline
+
+        kwargs = dict(
+            model=self.HF_MODEL_ID,
+            device=device,
+            torch_dtype=torch_dtype,
+            chunk_length_s=30,
+        )
         try:
-            self.pipe = pipeline(
+            return pipeline(
                 "automatic-speech-recognition",
-                model=self.HF_MODEL_ID,
-                device=device,
-                torch_dtype=torch_dtype,
-                chunk_length_s=30,
+                model_kwargs={"attn_implementation": self.attn_implementation},
+                **kwargs,
             )
-            print(f"[OK] Kotoba-Whisper v2.0 読み込み完了 (device={device})", flush=True)
+        except (ValueError, ImportError) as e:
+            if self.attn_implementation == "eager":
+                raise
+            print(f"[WARNING] attention実装 '{self.attn_implementation}' が使用できません。eagerにフォールバックします: {e}", flush=True)
+            self.attn_implementation = "eager"
+            return pipeline(
+                "automatic-speech-recognition",
+                model_kwargs={"attn_implementation": "eager"},
+                **kwargs,
+            )
+
+    def _quantize_model(self, pipe):
+        """CPU推論用に線形層を動的int8量子化"""
+        import torch
+
+        try:
+            pipe.model = torch.quantization.quantize_dynamic(
+                pipe.model, {torch.nn.Linear}, dtype=torch.qint8,
+            )
+            print("[kotoba-whisper] 線形層を動的int8量子化しました", flush=True)
+        except Exception as e:
+            print(f"[WARNING] 動的量子化に失敗しました（float32で続行）: {e}", flush=True)
+            self.quantize = False
+
+    def _create_pipeline(self, device: str, torch_dtype):
+        pipe = self._build_pipeline(device, torch_dtype)
+        if self.quantize and device == "cpu":
+            self._quantize_model(pipe)
+        # フォールバック後に実際に使われた設定（共有したインスタンスも同じ設定を報告するため）
+        pipe.kotoba_settings = {'attn_implementation': self.attn_implementation, 'quantize': self.quantize}
+        return pipe
+
+    def _pool_key_for(self, device: str, torch_dtype) -> tuple:
+        compute_type = "int8" if self.quantize and device == "cpu" else str(torch_dtype).replace("torch.", "")
+        return ("kotoba-whisper", self.HF_MODEL_ID, device, f"{compute_type}/{self.attn_implementation}")
+
+    def _acquire_pipeline(self, device: str, torch_dtype):
+        """
+        共有の pipeline を取得
+
+        読み込み中に eager / 量子化なしへフォールバックした場合は、実際の設定のキーで登録し直す
+        （要求した設定のキーに別の設定のモデルを残さない）。
+        """
+        key = self._pool_key_for(device, torch_dtype)
+        pipe = self._acquire_shared(key, lambda: self._create_pipeline(device, torch_dtype))
+        settings = getattr(pipe, 'kotoba_settings', {})
+        self.attn_implementation = settings.get('attn_implementation', self.attn_implementation)
+        self.quantize = settings.get('quantize', self.quantize)
+        actual_key = self._pool_key_for(device, torch_dtype)
+        if actual_key != key:
+            pipe = get_model_pool().rekey(key, actual_key)
+            self._pool_key = actual_key
+        return pipe
+
+    def _load_model(self):
+        import torch
+
+        device = self.device
+        try:
+            self.pipe = self._acquire_pipeline(device, self.torch_dtype)
         except Exception as e:
             if device != "cpu":
                 print(f"[WARNING] {device} での読み込みに失敗、CPUにフォールバックします: {e}", flush=True)
-                self.pipe = pipeline(
-                    "automatic-speech-recognition",
-                    model=self.HF_MODEL_ID,
-                    device="cpu",
-                    torch_dtype=torch.float32,
-                    chunk_length_s=30,
-                )
-                print(f"[OK] Kotoba-Whisper v2.0 読み込み完了 (device=cpu)", flush=True)
+                device = "cpu"
+                self.device = "cpu"
+                self.torch_dtype = torch.float32
+                self.pipe = self._acquire_pipeline("cpu", torch.float32)
             else:
                 raise
 
+        print(
+            f"[OK] Kotoba-Whisper v2.0 読み込み完了 (device={device}, batch_size={self.batch_size}, "
+            f"attn={self.attn_implementation}, int8={'on' if self.quantize else 'off'})",
+            flush=True,
+        )
+
     def _run_transcription(self, audio_path: str) -> Optional[Dict]:
         try:
-            result = self.pipe(
-                audio_path,
-                return_timestamps=True,
-                generate_kwargs={"language": "japanese", "task": "transcribe"},
-            )
+            # transformers pipeline はスレッドセーフでないため推論を直列化
+            with get_model_pool().inference_lock(self._pool_key):
+                result = self.pipe(
+                    audio_path,
+                    batch_size=self.batch_size,
+                    return_timestamps=True,
+                    generate_kwargs={"language": "japanese", "task": "transcribe"},
+                )
 
             full_text = result.get("text", "")
             segments: List[Dict] = []
@@ -565,6 +1587,11 @@ class KotobaWhisperTranscriber(TranscriberBase):
             traceback.print_exc()
             return None
 
+    def _transcribe_pcm(self, pcm, initial_prompt: Optional[str] = None) -> List[Dict]:
+        """配列のまま pipeline に渡す（一時ファイルを作らない）"""
+        result = self._run_transcription({'raw': pcm, 'sampling_rate': self.SAMPLE_RATE})
+        return result['segments'] if result else []
+
 
 # ---------------------------------------------------------------------------
 # Engine 5: Kotoba-Whisper External (システムPython経由)
@@ -579,10 +1606,18 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
 
     MODELS = ["kotoba-whisper-v2.0"]
     DEFAULT_MODEL = "kotoba-whisper-v2.0"
+    # システムPythonの探索結果・依存パッケージ確認結果のキャッシュ
+    # （インタプリタのmtimeが変わったら無効化）
+    ENV_CACHE_FILE = "kotoba_env.json"
 
     def __init__(self, model_name: Optional[str] = None, language: str = "ja"):
         name = model_name or self.DEFAULT_MODEL
         super().__init__(name, language)
+        self._env_cache = _load_json_cache(self.ENV_CACHE_FILE)
+        self._load_model()
+
+    def _load_model(self):
+        """実行に使うシステムPythonを決定し、依存パッケージを確認"""
         self.python_cmd = self._find_system_python()
         if not self.python_cmd:
             raise ImportError(
@@ -592,7 +1627,58 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
                 "  Windows: https://www.python.org/downloads/"
             )
         self._ensure_dependencies()
-        print(f"[kotoba-whisper] システムPython経由で実行します: {self.python_cmd}", flush=True)
+        version = self._cached_env(self.python_cmd).get('version', '')
+        version_str = f" (Python {version})" if version else ""
+        print(f"[kotoba-whisper] システムPython経由で実行します: {self.python_cmd}{version_str}", flush=True)
+
+    # --- 環境プローブのキャッシュ ---------------------------------------------
+
+    @staticmethod
+    def _interpreter_fingerprint(path: str) -> Optional[Dict]:
+        """インタプリタの実体パスとmtimeを取得（キャッシュのキー）"""
+        try:
+            real_path = os.path.realpath(path)
+            return {
+                'real_path': real_path,
+                'mtime_ns': os.stat(real_path).st_mtime_ns,
+            }
+        except OSError:
+            return None
+
+    def _cached_env(self, path: str) -> Dict:
+        """インタプリタに対応する有効なキャッシュエントリを返す（無効なら空dict）"""
+        entry = self._env_cache.get('interpreters', {}).get(path)
+        if not entry:
+            return {}
+        current = self._interpreter_fingerprint(path)
+        if (current is None
+                or entry.get('real_path') != current['real_path']
+                or entry.get('mtime_ns') != current['mtime_ns']):
+            return {}
+        return entry
+
+    def _update_env_cache(self, path: str, **fields):
+        """インタプリタのキャッシュエントリを更新して保存"""
+        current = self._interpreter_fingerprint(path)
+        if current is None:
+            return
+        interpreters = self._env_cache.setdefault('interpreters', {})
+        entry = interpreters.get(path, {})
+        if (entry.get('real_path') != current['real_path']
+                or entry.get('mtime_ns') != current['mtime_ns']):
+            # インタプリタが変わっていれば以前の結果は破棄
+            entry = {}
+        entry.update(current)
+        entry.update(fields)
+        interpreters[path] = entry
+        _save_json_cache(self.ENV_CACHE_FILE, self._env_cache)
+
+    def _invalidate_dependency_cache(self):
+        """依存パッケージ確認結果のキャッシュを無効化"""
+        if self.python_cmd and self._cached_env(self.python_cmd).get('deps_ok'):
+            self._update_env_cache(self.python_cmd, deps_ok=False)
+
+    # --- 環境の探索・確認 -----------------------------------------------------
 
     def _find_system_python(self) -> Optional[str]:
         """システムにインストールされたPython 3を探す"""
@@ -603,17 +1689,29 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
         for cmd in candidates:
             path = shutil.which(cmd)
             if path:
+                # キャッシュ済みなら起動せずに判定
+                cached = self._cached_env(path)
+                if cached:
+                    if cached.get('usable'):
+                        return path
+                    continue
+
                 # PyInstallerの内部Pythonではないことを確認
                 try:
                     result = subprocess.run(
-                        [path, "-c", "import sys; print(sys.executable)"],
+                        [path, "-c", "import sys; print(sys.executable); print(sys.version.split()[0])"],
                         capture_output=True, text=True, timeout=10,
                     )
-                    exe = result.stdout.strip()
+                    lines = result.stdout.strip().splitlines()
+                    exe = lines[0] if lines else ""
+                    version = lines[1] if len(lines) > 1 else ""
                     # _MEI（PyInstaller展開先）を含むものはスキップ
                     if "_MEI" in exe or "_internal" in exe:
+                        self._update_env_cache(path, usable=False, executable=exe, version=version)
                         continue
-                    # torchがインポートできるか確認（既にインストール済みなら優先）
+                    if result.returncode != 0 or not version.startswith("3"):
+                        continue
+                    self._update_env_cache(path, usable=True, executable=exe, version=version)
                     return path
                 except Exception:
                     continue
@@ -623,6 +1721,10 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
         """必要なパッケージがインストールされているか確認し、なければインストール"""
         import subprocess
 
+        if self._cached_env(self.python_cmd).get('deps_ok'):
+            print("[kotoba-whisper] 依存パッケージ確認OK (キャッシュ)", flush=True)
+            return
+
         # torch + transformers の確認
         check_script = "import torch; import transformers; print('OK')"
         try:
@@ -632,6 +1734,7 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
             )
             if result.returncode == 0 and "OK" in result.stdout:
                 print("[kotoba-whisper] 依存パッケージ確認OK", flush=True)
+                self._update_env_cache(self.python_cmd, deps_ok=True)
                 return
         except Exception:
             pass
@@ -648,6 +1751,7 @@ class KotobaWhisperExternalTranscriber(TranscriberBase):
                 check=True, timeout=600,
             )
             print("[OK] パッケージのインストール完了", flush=True)
+            self._update_env_cache(self.python_cmd, deps_ok=True)
         except subprocess.CalledProcessError as e:
             raise ImportError(
                 f"kotoba-whisper の依存パッケージのインストールに失敗しました。\n"
@@ -705,7 +1809,7 @@ try:
 
     print(json.dumps({{"text": text, "segments": segments}}, ensure_ascii=False))
 except Exception as e:
-    print(f"ERROR: {{e}}", file=sys.stderr)
+    print(f"ERROR: {{type(e).__name__}}: {{e}}", file=sys.stderr)
     sys.exit(1)
 '''
 
@@ -725,6 +1829,10 @@ except Exception as e:
 
             if result.returncode != 0:
                 print(f"[ERROR] kotoba-whisper 実行エラー (exit code {result.returncode})", flush=True)
+                # パッケージが削除された可能性があるため、次回は再確認する
+                stderr = result.stderr or ""
+                if any(marker in stderr for marker in ("ModuleNotFoundError", "ImportError", "No module named")):
+                    self._invalidate_dependency_cache()
                 return None
 
             # stdoutからJSON結果をパース
@@ -759,11 +1867,17 @@ def create_transcriber(
     model: Optional[str] = None,
     language: str = "ja",
     api_key: Optional[str] = None,
+    draft_model: Optional[str] = None,
+    speed_profile: Optional[str] = None,
+    word_timestamps: bool = False,
 ) -> TranscriberBase:
     """
     エンジン名からトランスクライバーを生成するファクトリ関数。
 
     faster-whisper のインポートに失敗した場合は local-whisper にフォールバック。
+    draft_model を指定すると faster-whisper は2パス（下書き→低信頼度区間のみ清書）で実行する。
+    speed_profile は faster-whisper のデコード速度プリセット（fast / balanced / accurate）。
+    word_timestamps を指定すると faster-whisper は単語ごとのタイムスタンプ・確率も返す。
     """
     if engine == "openai-api":
         try:
@@ -775,7 +1889,15 @@ def create_transcriber(
 
     if engine == "faster-whisper":
         try:
-            return FasterWhisperTranscriber(model_name=model, language=language)
+            if draft_model:
+                return TwoPassTranscriber(
+                    model_name=model, language=language, draft_model=draft_model,
+                    speed_profile=speed_profile, word_timestamps=word_timestamps,
+                )
+            return FasterWhisperTranscriber(
+                model_name=model, language=language,
+                speed_profile=speed_profile, word_timestamps=word_timestamps,
+            )
         except ImportError:
             print("[ERROR] faster-whisper が見つかりません。", flush=True)
             print("[ERROR] インストール: pip install faster-whisper", flush=True)
@@ -791,14 +1913,48 @@ def create_transcriber(
         try:
             return KotobaWhisperTranscriber(model_name=model, language=language)
         except ImportError:
-            # PyInstallerビルドではtorch/transformersが除外されている
-            # システムPythonにフォールバック
-            print("[INFO] kotoba-whisper: バンドル版にtorch未同梱。システムPythonで実行します。", flush=True)
-            return KotobaWhisperExternalTranscriber(model_name=model, language=language)
+            pass
+
+        # PyInstallerビルドではtorch/transformersが除外されている
+        # → CTranslate2変換版を faster-whisper で実行（軽量・高速）
+        ct2_model = model or KotobaWhisperTranscriber.DEFAULT_MODEL
+        if ct2_model in FasterWhisperTranscriber.CT2_MODEL_REPOS:
+            try:
+                import faster_whisper  # noqa: F401
+                print("[INFO] kotoba-whisper: バンドル版にtorch未同梱。CTranslate2版を faster-whisper で実行します。", flush=True)
+                return FasterWhisperTranscriber(
+                    model_name=ct2_model, language=language,
+                    speed_profile=speed_profile, word_timestamps=word_timestamps,
+                )
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"[WARNING] CTranslate2版 kotoba-whisper の読み込みに失敗: {e}", flush=True)
+
+        # システムPythonにフォールバック
+        print("[INFO] kotoba-whisper: バンドル版にtorch未同梱。システムPythonで実行します。", flush=True)
+        return KotobaWhisperExternalTranscriber(model_name=model, language=language)
 
     raise ValueError(f"不明なエンジン: {engine}  (選択肢: faster-whisper, openai-api, kotoba-whisper)")
 
 
+def preload_model(
+    engine: str = "faster-whisper",
+    model: Optional[str] = None,
+    language: str = "ja",
+    api_key: Optional[str] = None,
+):
+    """
+    最初のジョブが来る前にモデルを読み込んでおく（ウォームアップ）
+
+    読み込んだモデルはモデルプールに保持され、アイドル時間
+    （環境変数 TRANSCRIBER_MODEL_IDLE_TIMEOUT、デフォルト600秒）以内に
+    同じ設定で create_transcriber() すれば再読み込みなしで使われる。
+    """
+    transcriber = create_transcriber(engine=engine, model=model, language=language, api_key=api_key)
+    transcriber.close()
+
+
 # ---------------------------------------------------------------------------
 # Backward-compatible wrapper
 # ---------------------------------------------------------------------------
@@ -813,6 +1969,8 @@ class AudioTranscriber:
         language: str = "ja",
         engine: str = "faster-whisper",
         api_key: Optional[str] = None,
+        draft_model: Optional[str] = None,
+        speed_profile: Optional[str] = None,
     ):
         self.engine = engine
         self._transcriber = create_transcriber(
@@ -820,6 +1978,8 @@ class AudioTranscriber:
             model=model_size if model_size else None,
             language=language,
             api_key=api_key,
+            draft_model=draft_model,
+            speed_profile=speed_profile,
         )
 
     def transcribe(
@@ -827,12 +1987,44 @@ class AudioTranscriber:
         audio_file: str,
         output_dir: Optional[str] = None,
         save_json: bool = False,
-    ) -> Optional[Dict]:
-        return self._transcriber.transcribe(audio_file, output_dir, save_json)
+        save_npz: bool = False,
+        formats: Optional[List[str]] = None,
+        write_outputs: bool = True,
+        timeline=None,
+        output_name: Optional[str] = None,
+    ) -> Optional[TranscriptResult]:
+        return self._transcriber.transcribe(
+            audio_file, output_dir, save_json,
+            save_npz=save_npz, formats=formats, write_outputs=write_outputs,
+            timeline=timeline, output_name=output_name,
+        )
+
+    def transcribe_pcm_stream(
+        self,
+        chunks: Iterable[Any],
+        output_dir: Optional[str] = None,
+        base_name: str = "stream",
+        formats: Optional[List[str]] = None,
+        write_outputs: bool = True,
+        duration: Optional[float] = None,
+    ) -> Optional[TranscriptResult]:
+        return self._transcriber.transcribe_pcm_stream(
+            chunks, output_dir or ".", base_name, formats=formats,
+            write_outputs=write_outputs, duration=duration,
+        )
+
+    @property
+    def backend(self) -> TranscriberBase:
+        """文字起こしを行うエンジン本体（FasterWhisperTranscriber など。engine はエンジン名）"""
+        return self._transcriber
 
     def get_model_info(self) -> Dict:
         return self._transcriber.get_model_info()
 
+    def close(self):
+        """共有モデルの参照を返却"""
+        self._transcriber.close()
+
 
 # ---------------------------------------------------------------------------
 # CLI
@@ -842,7 +2034,7 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="音声文字起こしツール")
-    parser.add_argument("audio", help="音声ファイル")
+    parser.add_argument("audio", help="音声ファイル（- で標準入力、名前付きパイプも可）")
     parser.add_argument("-m", "--model", help="モデル名", default=None)
     parser.add_argument("-l", "--language", help="言語コード", default="ja")
     parser.add_argument("-o", "--output", help="出力ディレクトリ", default=None)
@@ -853,6 +2045,36 @@ def main():
         help="文字起こしエンジン (デフォルト: faster-whisper)",
     )
     parser.add_argument("--api-key", help="OpenAI APIキー (openai-api エンジン用)", default=None)
+    parser.add_argument(
+        "--draft-model",
+        default=None,
+        help="2パスモード: 下書きに使う小さいモデル (tiny/base)。低信頼度の区間だけ -m のモデルで再デコード",
+    )
+
+    parser.add_argument(
+        "--speed",
+        choices=list(FasterWhisperTranscriber.SPEED_PROFILES),
+        default=None,
+        help="faster-whisper のデコード速度プリセット (デフォルト: balanced)",
+    )
+    parser.add_argument("--word-timestamps", action="store_true", help="単語ごとのタイムスタンプも取得 (faster-whisper)")
+    parser.add_argument("--save-npz", action="store_true", help="信頼度・単語タイムスタンプを含む結果を .npz で保存")
+    parser.add_argument(
+        "--formats",
+        type=transcript_writers.parse_formats,
+        default=None,
+        help=f"出力形式をカンマ区切りで指定 ({', '.join(transcript_writers.WRITERS)}, all。デフォルト: txt,detailed)",
+    )
+
+    parser.add_argument(
+        "--input-format",
+        choices=["auto", "encoded", "s16le", "f32le"],
+        default="auto",
+        help="標準入力・パイプの形式 (auto: 先頭で判別し不明なら s16le、encoded: WAV/MP3 等を ffmpeg でデコード)",
+    )
+    parser.add_argument("--sample-rate", type=int, default=16000, help="生PCM入力のサンプルレート (デフォルト: 16000)")
+    parser.add_argument("--channels", type=int, default=1, help="生PCM入力のチャンネル数 (デフォルト: 1)")
+    parser.add_argument("--name", default=None, help="ストリーム入力の出力ファイル名 (デフォルト: stdin / パイプ名)")
 
     args = parser.parse_args()
 
@@ -861,8 +2083,29 @@ def main():
         model=args.model,
         language=args.language,
         api_key=args.api_key,
+        draft_model=args.draft_model,
+        speed_profile=args.speed,
+        word_timestamps=args.word_timestamps,
     )
-    result = transcriber.transcribe(args.audio, args.output)
+    from audio_converter import is_stream_source, iter_pcm_stream
+
+    if is_stream_source(args.audio):
+        # 例: ffmpeg -i input -f s16le -ac 1 -ar 16000 - | python transcriber.py -
+        stdin = args.audio == '-'
+        source = sys.stdin.buffer if stdin else open(args.audio, 'rb')
+        try:
+            chunks = iter_pcm_stream(source, args.input_format, args.sample_rate, args.channels)
+            result = transcriber.transcribe_pcm_stream(
+                chunks, args.output or ".", args.name or ("stdin" if stdin else Path(args.audio).stem),
+                formats=args.formats, save_npz=args.save_npz,
+            )
+        except KeyboardInterrupt:
+            return 130  # 中断までの結果は保存済み
+        finally:
+            if not stdin:
+                source.close()
+    else:
+        result = transcriber.transcribe(args.audio, args.output, save_npz=args.save_npz, formats=args.formats)
 
     if result:
         print("\n=== 文字起こし結果（抜粋） ===", flush=True)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こし結果モジュール
+セグメントの時刻・信頼度・話者・単語タイムスタンプをNumPy配列で保持し、
+数時間の文字起こしでもセグメントごとに dict を作らずに済むようにする
+
+- テキストは1本の文字列 + 文字オフセットで保持し、セグメントの文字列はアクセス時に生成
+- 既存の dict 形式 {'text', 'segments': [{'start', 'end', 'text', ...}]} と可逆に相互変換
+- .npz サイドカーファイルに保存・読み込み可能
+"""
+
+import io
+import json
+import os
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Iterator, Union
+
+import numpy as np
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+FORMAT_VERSION = 1
+
+
+class _WordTimings:
+    """単語タイムスタンプ（CSR形式: セグメント i の単語は offsets[i]:offsets[i+1]）"""
+
+    __slots__ = ('offsets', 'starts', 'ends', 'probability', 'text', 'text_offsets')
+
+    def __init__(self, offsets, starts, ends, probability, text: str, text_offsets):
+        self.offsets = offsets
+        self.starts = starts
+        self.ends = ends
+        self.probability = probability
+        self.text = text
+        self.text_offsets = text_offsets
+
+    def words(self, i: int) -> List[Dict]:
+        words = []
+        for w in range(self.offsets[i], self.offsets[i + 1]):
+            word = {
+                'start': float(self.starts[w]),
+                'end': float(self.ends[w]),
+                'word': self.text[self.text_offsets[w]:self.text_offsets[w + 1]],
+            }
+            if not np.isnan(self.probability[w]):
+                word['probability'] = float(self.probability[w])
+            words.append(word)
+        return words
+
+
+class TranscriptResultBuilder:
+    """セグメントを1つずつ追加して TranscriptResult を組み立てる"""
+
+    def __init__(self):
+        self._starts = array('d')
+        self._ends = array('d')
+        self._avg_logprob = array('d')
+        self._no_speech_prob = array('d')
+        self._text = io.StringIO()
+        self._text_offsets = array('q', [0])
+        self._speakers = array('i')
+        self._speaker_index: Dict[str, int] = {}
+        self._word_offsets = array('q', [0])
+        self._word_starts = array('d')
+        self._word_ends = array('d')
+        self._word_probability = array('d')
+        self._word_text = io.StringIO()
+        self._word_text_offsets = array('q', [0])
+
+    def append(self, seg: Dict):
+        """dict 形式のセグメントを追加（avg_logprob / no_speech_prob / speaker / words は任意）"""
+        self._starts.append(seg['start'])
+        self._ends.append(seg['end'])
+        self._avg_logprob.append(seg.get('avg_logprob', np.nan))
+        self._no_speech_prob.append(seg.get('no_speech_prob', np.nan))
+
+        text = seg['text']
+        self._text.write(text)
+        self._text_offsets.append(self._text_offsets[-1] + len(text))
+
+        speaker = seg.get('speaker')
+        if speaker is None:
+            self._speakers.append(-1)
+        else:
+            self._speakers.append(self._speaker_index.setdefault(speaker, len(self._speaker_index)))
+
+        for word in seg.get('words') or ():
+            self._word_starts.append(word['start'])
+            self._word_ends.append(word['end'])
+            self._word_probability.append(word.get('probability', np.nan))
+            self._word_text.write(word['word'])
+            self._word_text_offsets.append(self._word_text_offsets[-1] + len(word['word']))
+        self._word_offsets.append(len(self._word_starts))
+
+    def extend(self, segments: Iterable[Dict]):
+        for seg in segments:
+            self.append(seg)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def build(self, full_text: Optional[str] = None) -> 'TranscriptResult':
+        """
+        Args:
+            full_text: 全文テキスト（セグメントの連結と異なる場合のみ保持される。OpenAI API等）
+        """
+        def to_numpy(values: array, dtype) -> np.ndarray:
+            return np.frombuffer(values, dtype=dtype).copy() if len(values) else np.zeros(0, dtype=dtype)
+
+        words = None
+        if len(self._word_starts):
+            words = _WordTimings(
+                offsets=to_numpy(self._word_offsets, np.int64),
+                starts=to_numpy(self._word_starts, np.float64),
+                ends=to_numpy(self._word_ends, np.float64),
+                probability=to_numpy(self._word_probability, np.float64),
+                text=self._word_text.getvalue(),
+                text_offsets=to_numpy(self._word_text_offsets, np.int64),
+            )
+
+        speakers = to_numpy(self._speakers, np.int32)
+        speaker_labels = list(self._speaker_index)
+        if not speaker_labels:
+            speakers = None
+
+        text = self._text.getvalue()
+        return TranscriptResult(
+            starts=to_numpy(self._starts, np.float64),
+            ends=to_numpy(self._ends, np.float64),
+            text=text,
+            text_offsets=to_numpy(self._text_offsets, np.int64),
+            avg_logprob=to_numpy(self._avg_logprob, np.float64),
+            no_speech_prob=to_numpy(self._no_speech_prob, np.float64),
+            speakers=speakers,
+            speaker_labels=speaker_labels,
+            words=words,
+            full_text=full_text if full_text is not None and full_text != text else None,
+        )
+
+
+class SegmentList(Sequence):
+    """TranscriptResult のセグメントを dict として返す読み取り専用ビュー（アクセス時に生成）"""
+
+    __slots__ = ('_result',)
+
+    def __init__(self, result: 'TranscriptResult'):
+        self._result = result
+
+    def __len__(self) -> int:
+        return len(self._result.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._result.segment(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._result.segment(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self._result.segment(i)
+
+
+class TranscriptResult:
+    """
+    配列ベースの文字起こし結果
+
+    既存コードとの互換のため result['text'] / result['segments'] / result.get(...) でも
+    アクセスでき、result['segments'] = [...] で（話者分離後などの）セグメントを置き換えられる。
+    """
+
+    __slots__ = (
+        'starts', 'ends', 'avg_logprob', 'no_speech_prob',
+        'speakers', 'speaker_labels', 'words',
+        '_text', '_text_offsets', '_full_text',
+    )
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        text: str,
+        text_offsets: np.ndarray,
+        avg_logprob: Optional[np.ndarray] = None,
+        no_speech_prob: Optional[np.ndarray] = None,
+        speakers: Optional[np.ndarray] = None,
+        speaker_labels: Optional[List[str]] = None,
+        words: Optional[_WordTimings] = None,
+        full_text: Optional[str] = None,
+    ):
+        n = len(starts)
+        self.starts = starts
+        self.ends = ends
+        self.avg_logprob = avg_logprob if avg_logprob is not None else np.full(n, np.nan)
+        self.no_speech_prob = no_speech_prob if no_speech_prob is not None else np.full(n, np.nan)
+        self.speakers = speakers
+        self.speaker_labels = speaker_labels or []
+        self.words = words
+        self._text = text
+        self._text_offsets = text_offsets
+        self._full_text = full_text
+
+    # --- 生成 ----------------------------------------------------------------
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict], full_text: Optional[str] = None) -> 'TranscriptResult':
+        builder = TranscriptResultBuilder()
+        builder.extend(segments)
+        return builder.build(full_text)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TranscriptResult':
+        """{'text', 'segments'} 形式から変換"""
+        return cls.from_segments(data.get('segments') or [], data.get('text'))
+
+    # --- アクセス ------------------------------------------------------------
+
+    @property
+    def text(self) -> str:
+        """全文テキスト"""
+        return self._full_text if self._full_text is not None else self._text
+
+    @property
+    def segments(self) -> SegmentList:
+        return SegmentList(self)
+
+    def segment_text(self, i: int) -> str:
+        return self._text[self._text_offsets[i]:self._text_offsets[i + 1]]
+
+    def segment(self, i: int) -> Dict:
+        """i番目のセグメントを dict 形式で返す"""
+        seg = {
+            'start': float(self.starts[i]),
+            'end': float(self.ends[i]),
+            'text': self.segment_text(i),
+        }
+        if not np.isnan(self.avg_logprob[i]):
+            seg['avg_logprob'] = float(self.avg_logprob[i])
+        if not np.isnan(self.no_speech_prob[i]):
+            seg['no_speech_prob'] = float(self.no_speech_prob[i])
+        if self.speakers is not None and self.speakers[i] >= 0:
+            seg['speaker'] = self.speaker_labels[self.speakers[i]]
+        if self.words is not None and self.words.offsets[i] < self.words.offsets[i + 1]:
+            seg['words'] = self.words.words(i)
+        return seg
+
+    @property
+    def confidence(self) -> np.ndarray:
+        """セグメントごとの平均トークン確率（exp(avg_logprob)、不明な場合はNaN）"""
+        return np.exp(self.avg_logprob)
+
+    def to_dict(self) -> Dict:
+        """既存の dict 形式に変換"""
+        return {'text': self.text, 'segments': list(self.segments)}
+
+    # dict 互換アクセス（既存コード用）
+    _KEYS = ('text', 'segments')
+
+    def __getitem__(self, key: str):
+        if key == 'text':
+            return self.text
+        if key == 'segments':
+            return self.segments
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self._KEYS else default
+
+    def __contains__(self, key) -> bool:
+        return key in self._KEYS
+
+    def __setitem__(self, key: str, value):
+        if key != 'segments':
+            raise KeyError(key)
+        replaced = self.from_segments(value)
+        for name in self.__slots__:
+            if name != '_full_text':
+                setattr(self, name, getattr(replaced, name))
+
+    # --- 保存・読み込み ------------------------------------------------------
+
+    def save(self, path: Union[str, Path]):
+        """.npz サイドカーファイルに保存（一時ファイルに書いてから置き換え）"""
+        path = Path(path)
+        meta = {
+            'version': FORMAT_VERSION,
+            'full_text': self._full_text,
+            'speaker_labels': self.speaker_labels,
+        }
+        arrays = {
+            'meta': _encode(json.dumps(meta, ensure_ascii=False)),
+            'starts': self.starts,
+            'ends': self.ends,
+            'avg_logprob': self.avg_logprob,
+            'no_speech_prob': self.no_speech_prob,
+            'text': _encode(self._text),
+            'text_offsets': self._text_offsets,
+        }
+        if self.speakers is not None:
+            arrays['speakers'] = self.speakers
+        if self.words is not None:
+            arrays.update({
+                'word_offsets': self.words.offsets,
+                'word_starts': self.words.starts,
+                'word_ends': self.words.ends,
+                'word_probability': self.words.probability,
+                'word_text': _encode(self.words.text),
+                'word_text_offsets': self.words.text_offsets,
+            })
+
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'TranscriptResult':
+        """save() で保存した .npz を読み込む"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(_decode(data['meta']))
+            if meta.get('version') != FORMAT_VERSION:
+                raise ValueError(f"未対応の文字起こし結果フォーマット: {meta.get('version')}")
+            words = None
+            if 'word_offsets' in data:
+                words = _WordTimings(
+                    offsets=data['word_offsets'],
+                    starts=data['word_starts'],
+                    ends=data['word_ends'],
+                    probability=data['word_probability'],
+                    text=_decode(data['word_text']),
+                    text_offsets=data['word_text_offsets'],
+                )
+            return cls(
+                starts=data['starts'],
+                ends=data['ends'],
+                text=_decode(data['text']),
+                text_offsets=data['text_offsets'],
+                avg_logprob=data['avg_logprob'],
+                no_speech_prob=data['no_speech_prob'],
+                speakers=data['speakers'] if 'speakers' in data else None,
+                speaker_labels=meta.get('speaker_labels'),
+                words=words,
+                full_text=meta.get('full_text'),
+            )
+
+
+def _encode(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+
+
+def _decode(data: np.ndarray) -> str:
+    return data.tobytes().decode('utf-8')
+
+
+def main():
+    """テスト用のメイン関数（.npz の内容を表示）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文字起こし結果 (.npz) の表示・変換")
+    parser.add_argument("npz", help="TranscriptResult.save() で保存した .npz ファイル")
+    parser.add_argument("--json", action="store_true", help="dict 形式のJSONとして出力")
+
+    args = parser.parse_args()
+
+    result = TranscriptResult.load(args.npz)
+    if args.json:
+        print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"セグメント数: {len(result.segments)}")
+    print(f"全体の文字数: {len(result.text)}文字")
+    if result.speaker_labels:
+        print(f"話者: {', '.join(result.speaker_labels)}")
+    confidence = result.confidence
+    if len(confidence) and not np.all(np.isnan(confidence)):
+        print(f"平均信頼度: {np.nanmean(confidence):.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
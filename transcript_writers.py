@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こし結果の書き出しモジュール
+txt / detailed / SRT / WebVTT / JSONL / JSON / npz を、セグメントを1回走査するだけで
+まとめて書き出す
+
+- 各形式は TranscriptWriter のサブクラスとして register_writer() で登録する
+- テキスト形式はバッファ付きで逐次書き込み、結果全体を1つの文字列にしない
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable, Type, TextIO
+
+# Windows環境での文字化け対策
+if sys.platform == 'win32':
+    os.environ['PYTHONIOENCODING'] = 'utf-8'
+
+
+BUFFER_SIZE = 1024 * 1024
+DEFAULT_FORMATS = ('txt', 'detailed')
+
+
+# ---------------------------------------------------------------------------
+# 時刻・行の書式
+# ---------------------------------------------------------------------------
+def format_timestamp(seconds: float) -> str:
+    """HH:MM:SS"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def format_detailed_line(seg: Dict) -> str:
+    """タイムスタンプ付きテキストの1行（話者情報対応）"""
+    start = format_timestamp(seg['start'])
+    end = format_timestamp(seg['end'])
+    text = seg['text'].strip()
+    speaker = seg.get('speaker', '')
+    if speaker:
+        return f"[{start} -> {end}] [{speaker}] {text}\n"
+    return f"[{start} -> {end}] {text}\n"
+
+
+def _format_subtitle_time(seconds: float, separator: str) -> str:
+    """HH:MM:SS,mmm（SRT）/ HH:MM:SS.mmm（WebVTT）"""
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+class TranscriptWriter:
+    """
+    1つの出力形式の書き出し
+
+    begin() → write_segment() × セグメント数 → finish() の順に呼ばれる。
+    """
+
+    suffix = ""
+    label = ""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    def begin(self, result):
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=BUFFER_SIZE)
+
+    def write_segment(self, index: int, seg: Dict):
+        pass
+
+    def finish(self, result):
+        pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+WRITERS: Dict[str, Type[TranscriptWriter]] = {}
+
+
+def register_writer(name: str):
+    """出力形式を登録するデコレータ"""
+    def decorator(cls: Type[TranscriptWriter]) -> Type[TranscriptWriter]:
+        WRITERS[name] = cls
+        return cls
+    return decorator
+
+
+@register_writer('txt')
+class PlainTextWriter(TranscriptWriter):
+    """全文テキスト"""
+
+    suffix = "_transcript.txt"
+    label = "全文テキスト"
+
+    def begin(self, result):
+        super().begin(result)
+        # TranscriptResult は全文を1本の文字列で保持しているのでそのまま書く
+        self._file.write(result['text'])
+
+
+@register_writer('detailed')
+class DetailedTextWriter(TranscriptWriter):
+    """タイムスタンプ付きテキスト"""
+
+    suffix = "_transcript_detailed.txt"
+    label = "タイムスタンプ付きテキスト"
+
+    def write_segment(self, index: int, seg: Dict):
+        self._file.write(format_detailed_line(seg))
+
+
+@register_writer('srt')
+class SrtWriter(TranscriptWriter):
+    """SRT字幕"""
+
+    suffix = ".srt"
+    label = "SRT字幕"
+
+    def write_segment(self, index: int, seg: Dict):
+        text = seg['text'].strip()
+        if seg.get('speaker'):
+            text = f"[{seg['speaker']}] {text}"
+        self._file.write(
+            f"{index + 1}\n"
+            f"{_format_subtitle_time(seg['start'], ',')} --> {_format_subtitle_time(seg['end'], ',')}\n"
+            f"{text}\n\n"
+        )
+
+
+@register_writer('vtt')
+class WebVttWriter(TranscriptWriter):
+    """WebVTT字幕"""
+
+    suffix = ".vtt"
+    label = "WebVTT字幕"
+
+    def begin(self, result):
+        super().begin(result)
+        self._file.write("WEBVTT\n\n")
+
+    def write_segment(self, index: int, seg: Dict):
+        text = seg['text'].strip()
+        if seg.get('speaker'):
+            text = f"<v {seg['speaker']}>{text}"
+        self._file.write(
+            f"{_format_subtitle_time(seg['start'], '.')} --> {_format_subtitle_time(seg['end'], '.')}\n"
+            f"{text}\n\n"
+        )
+
+
+@register_writer('jsonl')
+class JsonLinesWriter(TranscriptWriter):
+    """1行1セグメントのJSON Lines"""
+
+    suffix = "_segments.jsonl"
+    label = "JSONL"
+
+    def write_segment(self, index: int, seg: Dict):
+        self._file.write(json.dumps(seg, ensure_ascii=False))
+        self._file.write('\n')
+
+
+@register_writer('json')
+class JsonWriter(TranscriptWriter):
+    """{'text', 'segments'} 形式のJSON（インデントなしで逐次書き込み）"""
+
+    suffix = "_transcript.json"
+    label = "JSON"
+
+    def begin(self, result):
+        super().begin(result)
+        self._file.write('{"text": ')
+        self._file.write(json.dumps(result['text'], ensure_ascii=False))
+        self._file.write(', "segments": [')
+
+    def write_segment(self, index: int, seg: Dict):
+        if index:
+            self._file.write(',\n')
+        self._file.write(json.dumps(seg, ensure_ascii=False))
+
+    def finish(self, result):
+        self._file.write(']}\n')
+
+
+@register_writer('npz')
+class NpzWriter(TranscriptWriter):
+    """信頼度・単語タイムスタンプを含む配列形式（TranscriptResult.save）"""
+
+    suffix = "_transcript.npz"
+    label = "詳細データ"
+
+    def begin(self, result):
+        pass
+
+    def finish(self, result):
+        from transcript_result import TranscriptResult
+
+        if not isinstance(result, TranscriptResult):
+            result = TranscriptResult.from_dict(result)
+        result.save(self.path)
+
+
+# ---------------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------------
+def parse_formats(value: Optional[str]) -> List[str]:
+    """'txt,srt,vtt' のような指定を検証してリストにする（'all' で全形式）"""
+    if not value:
+        return list(DEFAULT_FORMATS)
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    if 'all' in formats:
+        return list(WRITERS)
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        raise ValueError(f"不明な出力形式: {', '.join(unknown)}  (選択肢: {', '.join(WRITERS)}, all)")
+    return list(dict.fromkeys(formats))
+
+
+def output_file(output_dir: Path, base_name: str, fmt: str) -> Path:
+    """出力形式ごとのファイルパス"""
+    return Path(output_dir) / f"{base_name}{WRITERS[fmt].suffix}"
+
+
+def write_transcript(
+    result,
+    output_dir: Path,
+    base_name: str,
+    formats: Iterable[str] = DEFAULT_FORMATS,
+) -> Dict[str, Path]:
+    """
+    指定された形式をセグメント1回の走査でまとめて書き出す
+
+    Args:
+        result: TranscriptResult または {'text', 'segments'} 形式の辞書
+        output_dir: 出力ディレクトリ
+        base_name: ファイル名のベース（例: 音声ファイル名の stem）
+        formats: 出力形式（WRITERS のキー）
+
+    Returns:
+        {形式: 出力パス}
+    """
+    writers = [WRITERS[fmt](output_file(output_dir, base_name, fmt)) for fmt in formats]
+    if not writers:
+        return {}
+
+    try:
+        for writer in writers:
+            writer.begin(result)
+        for index, seg in enumerate(result['segments']):
+            for writer in writers:
+                writer.write_segment(index, seg)
+        for writer in writers:
+            writer.finish(result)
+    finally:
+        for writer in writers:
+            writer.close()
+
+    for writer in writers:
+        print(f"[OK] {writer.label}保存: {writer.path}", flush=True)
+    return {fmt: writer.path for fmt, writer in zip(formats, writers)}
+
+
+def main():
+    """テスト用のメイン関数（JSON / npz の結果を他の形式に変換）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文字起こし結果の形式変換")
+    parser.add_argument("input", help="_transcript.json または _transcript.npz")
+    parser.add_argument("-f", "--formats", default="srt,vtt", help=f"出力形式（{', '.join(WRITERS)}, all）")
+    parser.add_argument("-o", "--output", default=None, help="出力ディレクトリ（デフォルト: 入力と同じ）")
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if input_path.suffix == '.npz':
+        from transcript_result import TranscriptResult
+        result = TranscriptResult.load(input_path)
+    else:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+
+    base_name = input_path.stem
+    for suffix in (WRITERS['json'].suffix, WRITERS['npz'].suffix):
+        if input_path.name.endswith(suffix):
+            base_name = input_path.name[:-len(suffix)]
+
+    output_dir = Path(args.output) if args.output else input_path.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_transcript(result, output_dir, base_name, parse_formats(args.formats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -244,7 +244,7 @@ class VoicyExtractor:
         VoicyのURLから音声情報を取得
 
         Returns:
-            {"url": "...", "title": "...", "ext": "m4a"} or None
+            {"url": "...", "title": "...", "ext": "m4a", "channel_id": "..."} or None
         """
         params = self._parse_url(page_url)
         if not params:
@@ -260,7 +260,10 @@ class VoicyExtractor:
             print(f"[INFO] チャンネル: {channel_name}", flush=True)
 
         # Seleniumで再生ボタンクリック→音声URLキャプチャ
-        return self.extract_audio_url_via_selenium(page_url)
+        result = self.extract_audio_url_via_selenium(page_url)
+        if result:
+            result['channel_id'] = channel_id
+        return result
 
 
 def main():